@@ -0,0 +1,127 @@
+from datetime import date
+
+# ----------------- Configuration -----------------
+PERIODS = ("day", "week", "month")
+# Additive counters: a week or month is the sum of its days, so a day's rerun
+# only adds the difference to its week and month instead of rescanning them
+COUNTERS = ["tips", "settled", "won", "confidence_n", "confidence_sum", "xg_n", "xg_sum", "goals_sum",
+            "xg_error_sum", "under_settled", "under_won"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS stats (
+    period TEXT NOT NULL,
+    key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    {", ".join(f"{name} REAL NOT NULL DEFAULT 0" for name in COUNTERS)},
+    PRIMARY KEY (period, key, source)
+);
+"""
+
+# One (day, source) slice of the tips table -> its counters. xG is compared with the
+# goals actually scored on settled matches only; Under is True when the under line won.
+DAY_COUNTERS = """
+SELECT COUNT(*),
+       COUNT(won),
+       COALESCE(SUM(won), 0),
+       COUNT(confidence),
+       COALESCE(SUM(confidence), 0),
+       COUNT(CASE WHEN total_goals IS NOT NULL THEN xg END),
+       COALESCE(SUM(CASE WHEN total_goals IS NOT NULL THEN xg END), 0),
+       COALESCE(SUM(CASE WHEN xg IS NOT NULL THEN total_goals END), 0),
+       COALESCE(SUM(CASE WHEN total_goals IS NOT NULL THEN ABS(xg - total_goals) END), 0),
+       COUNT(under),
+       COALESCE(SUM(under), 0)
+FROM tips WHERE day = ? AND source = ?
+"""
+
+def create(conn):
+    """Creates the stats table; a warehouse that predates it is aggregated once from its tips."""
+    conn.executescript(SCHEMA)
+    if conn.execute("SELECT 1 FROM stats LIMIT 1").fetchone() is None and \
+            conn.execute("SELECT 1 FROM tips LIMIT 1").fetchone() is not None:
+        rebuild(conn)
+
+# ----------------- Keys -----------------
+def period_keys(day):
+    """ISO day -> {"day": "2025-10-21", "week": "2025-W43", "month": "2025-10"}."""
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return {"day": day, "week": f"{year}-W{week:02d}", "month": day[:7]}
+
+# ----------------- Maintenance -----------------
+def _stored(conn, period, key, source):
+    row = conn.execute(f"SELECT {', '.join(COUNTERS)} FROM stats WHERE period = ? AND key = ? AND source = ?",
+                       (period, key, source)).fetchone()
+    return row or (0,) * len(COUNTERS)
+
+def update_day(conn, day, source):
+    """
+    Re-aggregates one day of one source (after its tips were replaced) and moves its
+    week and month by the change. Cost is the day's rows, whatever the history size.
+    Runs in the caller's transaction.
+    """
+    keys = period_keys(day)
+    new = conn.execute(DAY_COUNTERS, (day, source)).fetchone()
+    old = _stored(conn, "day", day, source)
+    delta = [n - o for n, o in zip(new, old)]
+    if not any(delta):
+        return False
+    columns = ", ".join(COUNTERS)
+    placeholders = ", ".join("?" * len(COUNTERS))
+    conn.execute(f"INSERT OR REPLACE INTO stats (period, key, source, {columns}) VALUES (?, ?, ?, {placeholders})",
+                 ("day", day, source, *new))
+    increments = ", ".join(f"{name} = {name} + excluded.{name}" for name in COUNTERS)
+    for period in ("week", "month"):
+        conn.execute(f"INSERT INTO stats (period, key, source, {columns}) VALUES (?, ?, ?, {placeholders}) "
+                     f"ON CONFLICT (period, key, source) DO UPDATE SET {increments}",
+                     (period, keys[period], source, *delta))
+    # A day (or a whole week/month) whose rows were all removed
+    for period, key in keys.items():
+        conn.execute("DELETE FROM stats WHERE period = ? AND key = ? AND source = ? AND tips = 0",
+                     (period, key, source))
+    return True
+
+def rebuild(conn):
+    """Recomputes every period from the tips table (after a manual edit of the warehouse)."""
+    with conn:
+        conn.execute("DELETE FROM stats")
+        for day, source in conn.execute("SELECT DISTINCT day, source FROM tips").fetchall():
+            update_day(conn, day, source)
+
+# ----------------- Reads -----------------
+def _ratio(part, whole, scale=1.0):
+    return round(scale * part / whole, 2) if whole else None
+
+def _summary(source, counters):
+    c = dict(zip(COUNTERS, counters))
+    return {
+        "source": source,
+        "tips": int(c["tips"]),
+        "settled": int(c["settled"]),
+        "won": int(c["won"]),
+        "hit_rate": _ratio(c["won"], c["settled"], 100),
+        "mean_confidence": _ratio(c["confidence_sum"], c["confidence_n"]),
+        # Mean xG minus mean goals scored (positive: the model expects too many goals), and mean |error|
+        "xg_bias": _ratio(c["xg_sum"] - c["goals_sum"], c["xg_n"]),
+        "xg_mae": _ratio(c["xg_error_sum"], c["xg_n"]),
+        "under_settled": int(c["under_settled"]),
+        "under_accuracy": _ratio(c["under_won"], c["under_settled"], 100),
+    }
+
+def summary(conn, period, key, source):
+    """Stats of one source for one day / week / month (a primary key lookup), or None."""
+    row = conn.execute(f"SELECT {', '.join(COUNTERS)} FROM stats WHERE period = ? AND key = ? AND source = ?",
+                       (period, key, source)).fetchone()
+    return None if row is None else _summary(source, row)
+
+def summaries(conn, period, key=None, source=None):
+    """Stats for every source (or one) of one period key, or of every key when `key` is None."""
+    sql = f"SELECT key, source, {', '.join(COUNTERS)} FROM stats WHERE period = ?"
+    params = [period]
+    if key is not None:
+        sql += " AND key = ?"
+        params.append(key)
+    if source is not None:
+        sql += " AND source = ?"
+        params.append(source)
+    sql += " ORDER BY key, source"
+    return [{"key": row[0], **_summary(row[1], row[2:])} for row in conn.execute(sql, params)]
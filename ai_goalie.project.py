@@ -1,179 +1,123 @@
 from selenium import webdriver
 import os
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
-from datetime import datetime
-import pickle
+from datetime import datetime, date, timedelta
+import json
+import threading
+import argparse
 import re
 import math
-from time import sleep
 from pathlib import Path
-import undetected_chromedriver as uc
-from openpyxl import load_workbook
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from page_parser import parse_ai_goalie, parse_olbg
+from fetch import fetch_page, report as fetch_report
+from html_corpus import save_page
+from browser import get_driver, browser_session, new_driver
+from pipeline import AI_COLUMNS, TIP_COLUMNS, COMPARISON_COLUMNS, FrameSink, min_confidence, tap, match, drain
+from records import AiTip, Tip, to_frame, from_frame
+from team_resolver import TeamResolver
+from warehouse import ingest_day
+from scoring import score_frame, load_weights
+from catalog import CATALOG, as_date
+from storage import save_frame, load_frame, win_rate_cells, average_confidence_cells
+from metrics import METRICS, PROFILE, profiled
+from waits import StepTimer, wait_for_ready, wait_for_count_settled, wait_for_rerender, first_or_none
 today = datetime.now().strftime("%d")
-options = Options()
-options.add_argument("--start-maximized")
-driver = uc.Chrome(options=options)
-counts = 0
+# The browser is started lazily by get_driver() the first time a scraper needs it
 data = []
 testas = []
+# Set CAPTURE_HTML=1 to store every scraped page in YYYY-MM-DD/corpus/ for offline replay (bench_parsers.py)
+CAPTURE_HTML = os.environ.get("CAPTURE_HTML") == "1"
+# Set PARALLEL_SCRAPE=1 to scrape the three sources at once, each in its own browser
+PARALLEL_SCRAPE = os.environ.get("PARALLEL_SCRAPE") == "1"
+# Seconds each source may take in parallel mode before its browser is killed
+SOURCE_TIMEOUTS = {"ai_goalie": 180, "oddspedia": 240, "olbg": 120}
+# Range backfills: browsers running at once, and the file that remembers finished days
+BACKFILL_WORKERS = int(os.environ.get("BACKFILL_WORKERS", "3"))
+BACKFILL_CHECKPOINT = Path(__file__).parent.resolve() / ".backfill_checkpoint.json"
 # today_folder = datetime.now().strftime("%Y-%m-%d")
 
+# ----------------- Dates -----------------
+def day_folder_name(day):
+    """YYYY-MM-DD folder for a day (always zero-padded, as github.py expects)."""
+    return as_date(day).isoformat()
+
+def day_prefix(day):
+    """Two-digit file prefix, e.g. "04" in 04_fixtures.xlsx."""
+    return f"{as_date(day):%d}"
+
+def ai_goalie_url(day):
+    return f"https://ai-goalie.com/{as_date(day):%d.%m.%Y}.html"
+
 def get_save_path(source_name,day):
-    today_folder = datetime.now().strftime(f"%Y-%m-{day}")
-    os.makedirs(today_folder, exist_ok=True)
+    # The day's existing folder (top level or the YYYY/MM/ archive), else a new YYYY-MM-DD
+    today_folder = CATALOG.folder(day, create=True)
     return os.path.join(today_folder, f"{source_name}_fixtures.xlsx")
 
+def capture_page(driver, source, day, rows, page=None):
+    """
+    Saves the loaded page to the day's corpus folder when CAPTURE_HTML is on.
+    `page` is (url, page_source) for pages fetched over plain HTTP; otherwise the driver's page is used.
+    """
+    if not CAPTURE_HTML:
+        return
+    try:
+        url, page_source = page if page is not None else (driver.current_url, driver.page_source)
+        save_page(CATALOG.folder(day), source, url, page_source,
+                  day=day_folder_name(day), rows=rows)
+    except Exception as e:
+        print(f"Could not capture {source} page: {e}")
+
 
 def ai_goalies_cookies():
+    driver = get_driver()
     try:
             button = driver.find_element(By.XPATH, "/html/body/div[1]/div/div/div/div[2]/div/button[2]")
             button.click()
-            counts += 1
     except Exception:
             pass
-def ai_goalie_get_past(i: int):
-    global counts
+@METRICS.instrument("ai_goalie", day_key=day_folder_name)
+def ai_goalie_get(day, parse_mode="page_source", driver=None, driver_factory=get_driver):
     data = []
     testas = []
+    url = ai_goalie_url(day)
+    stage = METRICS.current()
 
-    driver.get(f"https://ai-goalie.com/{i}.09.2025.html")
-
-    # Load cookies
-    try:
-        cookies = pickle.load(open("cookies.pkl", "rb"))
-        for cookie in cookies:
-            driver.add_cookie(cookie)
-        driver.refresh()
-        sleep(1)
-    except FileNotFoundError:
-        print("No cookies.pkl found")
-        return
+    def load_in_browser(url):
+        # The browser is only started (via driver_factory) when plain HTTP was not enough
+        nonlocal driver
+        driver = driver or driver_factory()
+        driver.get(url)
 
-    # Accept cookies button (only once)
-    if counts == 0:
+        # Accept cookies button (only once)
         try:
-            button = driver.find_element(By.XPATH, "/html/body/div[1]/div/div/div/div[2]/div/button[2]")
-            button.click()
-            counts += 1
+                wait = WebDriverWait(driver, 5)
+                button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div/div/div[2]/div/button[2]")))
+                button.click()
         except Exception:
-            pass
+                pass
+        return driver.page_source
 
-    rows = driver.find_elements(By.CSS_SELECTOR, "tr.match")
+    # Day pages are static HTML: try plain HTTP first, the browser only if tr.match rows are missing
+    page_source, path, doc = fetch_page("ai_goalie", url, load_in_browser,
+                                        http_first=parse_mode == "page_source", day=as_date(day))
 
-    for row in rows:
+    # Parse the whole page source in one go; WebDriver per-cell lookups are the fallback
+    if parse_mode == "page_source":
         try:
-            # Date
-            match_date = row.find_element(By.CSS_SELECTOR, "td.date").text.strip()
-
-            # Fixture
-            home = row.find_element(By.CSS_SELECTOR, ".home-team").text.strip()
-            score = row.find_element(By.CSS_SELECTOR, ".score").text.strip()
-            away = row.find_element(By.CSS_SELECTOR, ".away-team").text.strip()
-            fixture = f"{home} - {away}: {score}"
-
-            # Pick
-            try:
-                pick = row.find_element(By.CSS_SELECTOR, ".home-team u, .away-team u").text.strip()
-            except Exception:
-                pick = ""
-
-            # Win %
-            win_percent = row.find_elements(By.TAG_NAME, "td")[4].text.strip()
-
-            # Result & total goals
-            result = row.find_element(By.CSS_SELECTOR, "td.correct").text.strip()
-            if result != "":
-                parts = score.split(":")
-                total = int(parts[0]) + int(parts[1])
-            else:
-                total = None
-
-            # Expected Goals
-            expected_goals = row.find_element(By.CSS_SELECTOR, "td.gp").text.strip()
-            expected_goals = re.sub(r"[^\d.]", "", expected_goals)
-
-            if expected_goals:
-                expected_goals = float(expected_goals)
-                goals_pick = math.ceil(expected_goals) + 0.5
-                under = None if total is None else goals_pick > total
-            else:
-                goals_pick = None
-                under = None
-
-            # Append data if correct day
-            parts = match_date.split()
-            if parts:
-                try:
-                    day = int(parts[-1])
-                    if day == i:
-                        data.append([
-                            match_date, fixture, expected_goals, pick,
-                            goals_pick, win_percent, result, total, under
-                        ])
-                except ValueError:
-                    continue
+            # The HTTP response was already parsed to look for rows; reuse it
+            data = parse_ai_goalie(doc if doc is not None else page_source, skipped=stage.skipped)
         except Exception as e:
-            print("Skipping row due to error:", e)
-
-    # Filter by Win % >= 60
-    data_clean = []
-    for row in data:
-        try:
-            win_val = float(row[5].replace("%", "").strip())
-            if win_val >= 60:
-                data_clean.append(row)
-        except Exception:
-            continue
-
-    # Save to Excel
-    df = pd.DataFrame(data_clean,
-                      columns=["Date", "Fixture", "XG", "Pick", "Goals_Pick",
-                               "Win %", "Result", "Total", "Under"])
-    save_name = get_save_path(f"{today}_ai",day)
-    df.to_excel(save_name, index=False)
-
-    # Open with openpyxl to add formulas
-    wb = load_workbook(save_name)
-    ws = wb.active
-
-    # Find last non-empty row in column I
-    last_row = 0
-    for r in range(1, ws.max_row + 1):
-        if ws[f"I{r}"].value is not None:
-            last_row = r
-
-    # Add formulas
-    ws[f"K{last_row + 1}"] = "=COUNTIF(I:I,TRUE)"
-    ws[f"K{last_row + 2}"] = "=COUNTIF(I:I,FALSE)"
-    ws[f"K{last_row + 3}"] = f"=K{last_row + 1}+K{last_row + 2}"
-    ws[f"L{last_row + 1}"] = f"=(K{last_row + 1}/K{last_row + 3})*100"
-
-    # Append percentage formula
-    testas.append(ws[f"L{last_row + 1}"].value)
-
-    wb.save(save_name)
-def ai_goalie_get(day):
-    data = []
-    testas = []
-
-    driver.get(f"https://ai-goalie.com/{day}.10.2025.html")
+            print("Page source parsing failed, falling back to WebDriver:", e)
+            data = []
 
-    # Load cookies
-
-    # Accept cookies button (only once)
-    try:
-            wait = WebDriverWait(driver, 5)
-            button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div/div/div[2]/div/button[2]")))
-            button.click()
-            counts += 1
-    except Exception:
-            pass
-
-    rows = driver.find_elements(By.CSS_SELECTOR, "tr.match")
+    if not data and driver is None:
+        load_in_browser(url)
+    rows = [] if data else driver.find_elements(By.CSS_SELECTOR, "tr.match")
 
     for row in rows:
         try:
@@ -227,120 +171,106 @@ def ai_goalie_get(day):
             else:
                 goals_pick = None
                 under = None
-            print(data)
             # Append data if correct day
-            try:
-                data.append([
-                            match_date, fixture, expected_goals, pick,
-                            goals_pick, win_percent, result, total, under
-                        ])
-            except ValueError:
-                continue
+            data.append(AiTip(
+                match_date, fixture, expected_goals, pick,
+                goals_pick, win_percent, result, total, under
+            ))
         except Exception as e:
-            continue
+            stage.skip(e)
             # print("Skipping row due to error:", e)
-    pf = pd.DataFrame(data,
-                      columns=["Date", "Fixture", "XG", "Pick", "Goals_Pick",
-                               "Win %", "Result", "Total", "Under"])
-    save_name = get_save_path(f"{day}_ai.full",day)
-    pf.to_excel(save_name, index=False)
-    print(data)
-    # Filter by Win % >= 60
-    data_clean = []
-    for row in data:
-        try:
-            win_val = float(row[5].replace("%", "").strip())
-            if win_val >= 52:
-                data_clean.append(row)
-        except Exception:
-            continue
-
-    # Save to Excel
-    df = pd.DataFrame(data_clean,
-                      columns=["Date", "Fixture", "XG", "Pick", "Goals_Pick",
-                               "Win %", "Result", "Total", "Under"])
-    save_name = get_save_path(f"{day}",day)
-    df.to_excel(save_name, index=False)
-
-    # Open with openpyxl to add formulas
-    wb = load_workbook(save_name)
-    ws = wb.active
-
-    # Find last non-empty row in column I
-    last_row = 0
-    for r in range(1, ws.max_row + 1):
-        if ws[f"I{r}"].value is not None:
-            last_row = r
-
-    # Add formulas
-    ws[f"K{last_row + 1}"] = "=COUNTIF(I:I,TRUE)"
-    ws[f"K{last_row + 2}"] = "=COUNTIF(I:I,FALSE)"
-    ws[f"K{last_row + 3}"] = f"=K{last_row + 1}+K{last_row + 2}"
-    ws[f"L{last_row + 1}"] = f"=(K{last_row + 1}/K{last_row + 3})*100"
-
-    # Append percentage formula
-    testas.append(ws[f"L{last_row + 1}"].value)
-
-    wb.save(save_name)
-def oddspedia_get(day):
+    capture_page(driver, "ai_goalie", day, len(data), page=(url, page_source) if path == "http" else None)
+    print(f"Found {len(data)} AI Goalie matches")
+
+    # One pass over the rows: everything goes to ai.full, Win % >= 52 goes to the day's sheet
+    full, kept = FrameSink(AI_COLUMNS), FrameSink(AI_COLUMNS)
+    drain(tap(min_confidence(tap(data, full), 52), kept))
+    stage.rows_in = len(data) + sum(stage.skipped.values())
+    stage.skip("Win % < 52", len(full) - len(kept))
+
+    full.save(get_save_path(f"{day_prefix(day)}_ai.full",day))
+    # Data and summary formulas go out in one write
+    cells = win_rate_cells(kept.frame())
+    if kept.save(get_save_path(day_prefix(day),day), cells=cells):
+        # Append percentage formula (the L cell is last)
+        testas.append(list(cells.values())[-1])
+    # The kept picks go straight to the matcher, no need to read the sheet back
+    return kept.records
+@METRICS.instrument("oddspedia", day_key=day_folder_name)
+def oddspedia_get(day, driver=None):
     """
-    Scrapes football betting tips from Oddspedia using the globally defined driver.
+    Scrapes football betting tips from Oddspedia using the given driver (or the shared one).
     Filters for consensus tips with 60% confidence or higher.
     """
     data = []
     testas = []
+    driver = driver or get_driver()
     wait = WebDriverWait(driver, 10)
+    timer = StepTimer("oddspedia")
+    stage = METRICS.current()
+    TIP_ROWS = (By.CSS_SELECTOR, "div.tip-by-consensus")
 
     try:
-        driver.get("https://oddspedia.com/football/tips")
-        sleep(5) # Initial wait for page load
+        with timer.step("page load"):
+            driver.get("https://oddspedia.com/football/tips")
+            wait_for_ready(driver)
 
         # Step 1: Click "By Consensus" tab using the provided XPath
         try:
             # Absolute XPath provided by user
             CONSENSUS_BUTTON_XPATH = "/html/body/div[1]/div[2]/div/div[1]/div[2]/div[2]/div[2]/div/main/div[3]/div[1]/div[2]/ul/li[2]/button"
-            wait = WebDriverWait(driver, 5)
-            consensus_tab = wait.until(
-                EC.element_to_be_clickable((By.XPATH, CONSENSUS_BUTTON_XPATH))
-            )
-            consensus_tab.click()
-            sleep(5)  # Wait for content to reload
+            with timer.step("consensus tab"):
+                consensus_tab = wait.until(
+                    EC.element_to_be_clickable((By.XPATH, CONSENSUS_BUTTON_XPATH))
+                )
+                consensus_tab.click()
+                # Content has reloaded once the consensus tips are rendered and their count settles
+                wait_for_count_settled(driver, *TIP_ROWS, timeout=15)
         except Exception as e:
             print("Failed to click 'By Consensus' button with provided XPath. Skipping sorting by consensus:", e)
 
         # Step 2: Open sort dropdown and select "Tips Amount"
         try:
             # Click the sort dropdown toggle
-            sort_toggle = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, ".tips-sort-options__dropdown .old-dropdown__toggle"))
-            )
-            sort_toggle.click()
-            sleep(5)
+            with timer.step("sort dropdown"):
+                sort_toggle = wait.until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".tips-sort-options__dropdown .old-dropdown__toggle"))
+                )
+                sort_toggle.click()
 
             # Click "Tips Amount" option
-            tips_amount_option = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'old-dropdown__list-item') and contains(., 'Tips Amount')]"))
-            )
-            tips_amount_option.click()
-            sleep(5)  # Allow UI to update
-            odds_option = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//*[@id='breadcrumb-bar']/div/div[2]/ul/li[2]/div/button/span[2]"))
-            )
-            odds_option.click()
-            sleep(1)
-            eu_odds = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//*[@id='breadcrumb-bar']/div/div[2]/ul/li[2]/div/div/div[1]"))
-            )
-            eu_odds.click()
-            
+            with timer.step("sort by tips amount"):
+                tips_amount_option = wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'old-dropdown__list-item') and contains(., 'Tips Amount')]"))
+                )
+                old_first = first_or_none(driver, *TIP_ROWS)
+                tips_amount_option.click()
+                # Wait for the list to re-render, then for the new list to finish rendering
+                wait_for_rerender(driver, old_first, timeout=5)
+                wait_for_count_settled(driver, *TIP_ROWS)
+            with timer.step("odds format"):
+                odds_option = wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//*[@id='breadcrumb-bar']/div/div[2]/ul/li[2]/div/button/span[2]"))
+                )
+                odds_option.click()
+                eu_odds = wait.until(
+                    EC.element_to_be_clickable((By.XPATH, "//*[@id='breadcrumb-bar']/div/div[2]/ul/li[2]/div/div/div[1]"))
+                )
+                old_odd = first_or_none(driver, By.CSS_SELECTOR, "span.odd__value")
+                eu_odds.click()
+                wait_for_rerender(driver, old_odd, timeout=5)
+                wait_for_count_settled(driver, *TIP_ROWS)
+
         except Exception as e:
             print("Failed to sort by 'Tips Amount'. Scraping current list order:", e)
 
        # Step 3: Scrape the matches
-        matches = driver.find_elements(By.CSS_SELECTOR, "div.tip-by-consensus")
+        matches = driver.find_elements(*TIP_ROWS)
+        stage.rows_in = len(matches)
 
         # Define the exclusion keywords
         EXCLUSION_KEYWORDS = ["Yes", "Over", "Under", "-", "+","Draw"]
+        extract_start = perf_counter()
 
         for match in matches:
             try:
@@ -367,6 +297,7 @@ def oddspedia_get(day):
                         break
                 
                 if skip_match:
+                    stage.skip("excluded market")
                     continue  # Skip this match and move to the next one
 
                 # 4. Match Time
@@ -387,213 +318,367 @@ def oddspedia_get(day):
 
 
                 # Filter 2: Only include if confidence >= 60%
-                if int(confidence) >= 60:
-                    data.append([fixture, pick, competition, match_time, win_info, confidence,odds])
+                tip = Tip(fixture, pick, competition, match_time, win_info, confidence, odds)
+                if tip.confidence is not None and tip.confidence >= 60:
+                    data.append(tip)
+                else:
+                    stage.skip("confidence < 60")
 
             except Exception as e:
                 # print(f"Skipping match due to error: {e}")
-                continue
+                stage.skip(e)
+        timer.record("extract rows", perf_counter() - extract_start)
+        capture_page(driver, "oddspedia", day, len(data))
 
         # Step 4: Save to Excel
         if data:
-            df = pd.DataFrame(data, columns=["Fixture", "Pick", "Competition", "Time", "Win Info", "Confidence %","Odds"])
-            save_name = get_save_path(f"{day}_oddspedia",day)
-            df.to_excel(save_name, index=False)
-
-            wb = load_workbook(save_name)
-            ws = wb.active
-            last_row = ws.max_row
-            
-            # Add Average Confidence formula
-            if last_row >= 2:
-                ws[f"H{last_row + 1}"] = f"=AVERAGE(F2:F{last_row})"
-                testas.append(ws[f"H{last_row + 1}"].value) 
-            
-            wb.save(save_name)
+            df = to_frame(data, TIP_COLUMNS)
+            save_name = get_save_path(f"{day_prefix(day)}_oddspedia",day)
+            # Add Average Confidence formula in the same write
+            cells = average_confidence_cells(df)
+            if save_frame(df, save_name, cells=cells):
+                testas.extend(cells.values())
 
     except Exception as e:
         print(f"A major error occurred during Oddspedia scraping: {e}")
-    
-    # The global driver is NOT quit here. It must be quit at the very end of the script.
-def olbg_get(day):
-    data = []
-    testas = []
-    driver.get("https://www.olbg.com/betting-tips/Football/1")
-    sleep(5)  # wait a bit longer for content
+    timer.report()
+    return data
+
+    # The shared driver is NOT quit here. browser_session() closes it at the very end of the script.
 
-    # Find matches (using XPath because CSS fails on min-h-[84px])
-    matches = driver.find_elements(By.XPATH, "//li[contains(@class,'min-h-')]")
-    print(f"Found {len(matches)} matches")
+OLBG_URL = "https://www.olbg.com/betting-tips/Football/1"
 
-    for match in matches:
+@METRICS.instrument("olbg", day_key=day_folder_name)
+def olbg_get(day, driver=None, driver_factory=get_driver):
+    data = []
+    testas = []
+    timer = StepTimer("olbg")
+    stage = METRICS.current()
+
+    def load_in_browser(url):
+        # The browser is only started (via driver_factory) when plain HTTP was not enough
+        nonlocal driver
+        driver = driver or driver_factory()
+        with timer.step("page load"):
+            driver.get(url)
+            wait_for_ready(driver)
+        # Find matches (using XPath because CSS fails on min-h-[84px])
         try:
-            fixture = match.find_element(By.CSS_SELECTOR, "h5[itemprop='name']").text.strip()
-            pick = match.find_element(By.CSS_SELECTOR, "h4").text.strip()
-            competition = match.find_element(By.CSS_SELECTOR, "p.text-sm.truncate").text.strip()
-            match_time = match.find_element(By.TAG_NAME, "time").get_attribute("datetime")
-            win_info = match.find_element(By.CSS_SELECTOR, "b.text-xs.truncate").text.strip()
-            odds = match.find_element(By.CSS_SELECTOR, "span.ui-odds")
-            odds = odds.get_attribute("data-decimal")
+            with timer.step("tips rendered"):
+                wait_for_count_settled(driver, By.XPATH, "//li[contains(@class,'min-h-')]")
+        except Exception as e:
+            print("OLBG tips did not render in time:", e)
+        return driver.page_source
+
+    # Server-rendered tips are parsed straight from the HTTP response; the browser is the fallback
+    fetch_start = perf_counter()
+    page_source, path, doc = fetch_page("olbg", OLBG_URL, load_in_browser)
+    if path == "http":
+        timer.record("http fetch", perf_counter() - fetch_start)
+
+    extract_start = perf_counter()
+    if path == "http":
+        data = parse_olbg(doc, skipped=stage.skipped)
+        stage.rows_in = len(data) + sum(stage.skipped.values())
+        print(f"Found {len(data)} matches")
+    else:
+        matches = driver.find_elements(By.XPATH, "//li[contains(@class,'min-h-')]")
+        stage.rows_in = len(matches)
+        print(f"Found {len(matches)} matches")
+
+        for match in matches:
             try:
-                conf_style = match.find_element(By.CSS_SELECTOR, "div[style*='--confidence']").get_attribute("style")
-                confidence = re.search(r"(\d+)%", conf_style).group(1) if conf_style else ""
-            except:
-                confidence = ""
+                fixture = match.find_element(By.CSS_SELECTOR, "h5[itemprop='name']").text.strip()
+                pick = match.find_element(By.CSS_SELECTOR, "h4").text.strip()
+                competition = match.find_element(By.CSS_SELECTOR, "p.text-sm.truncate").text.strip()
+                match_time = match.find_element(By.TAG_NAME, "time").get_attribute("datetime")
+                win_info = match.find_element(By.CSS_SELECTOR, "b.text-xs.truncate").text.strip()
+                odds = match.find_element(By.CSS_SELECTOR, "span.ui-odds")
+                odds = odds.get_attribute("data-decimal")
+                try:
+                    conf_style = match.find_element(By.CSS_SELECTOR, "div[style*='--confidence']").get_attribute("style")
+                    confidence = re.search(r"(\d+)%", conf_style).group(1) if conf_style else ""
+                except:
+                    confidence = ""
 
-            # try:
-            #     comments = match.find_element(By.CSS_SELECTOR, "span.text-xs.flex").text.strip()
-            # except:
-            #     comments = "0"
+                # try:
+                #     comments = match.find_element(By.CSS_SELECTOR, "span.text-xs.flex").text.strip()
+                # except:
+                #     comments = "0"
 
-            data.append([fixture, pick, competition, match_time, win_info, confidence, odds])
+                data.append(Tip(fixture, pick, competition, match_time, win_info, confidence, odds))
 
-        except Exception as e:
-            print("Skipping match:", e)
+            except Exception as e:
+                stage.skip(e)
+                print("Skipping match:", e)
+    timer.record("extract rows", perf_counter() - extract_start)
+    capture_page(driver, "olbg", day, len(data), page=(OLBG_URL, page_source) if path == "http" else None)
 
     # Only save if data is collected
     if data:
-        df = pd.DataFrame(data, columns=[
-            "Fixture", "Pick", "Competition", "Time", "Win Info", "Confidence %", "Odds"
-        ])
-        save_name = get_save_path(f"{day}_olbg",day)
-        df.to_excel(save_name, index=False)
-
-        wb = load_workbook(save_name)
-        ws = wb.active
-
-        last_row = ws.max_row
-        ws[f"H{last_row+1}"] = f"=AVERAGE(F2:F{last_row})"
-
-        testas.append(ws[f"H{last_row+1}"].value)
-        wb.save(save_name)
+        df = to_frame(data, TIP_COLUMNS)
+        save_name = get_save_path(f"{day_prefix(day)}_olbg",day)
+        cells = average_confidence_cells(df)
+        if save_frame(df, save_name, cells=cells):
+            testas.extend(cells.values())
         print(f"✅ Saved {len(data)} matches to {save_name}")
     else:
         print("⚠️ No matches found!")
-SCRIPT_DIR = Path(__file__).parent.resolve()
-def compare_confidence_sources(ai_goalie_file, olbg_file, oddspedia_file,day):
-    day_folder = datetime.now().strftime(f"%Y-%m-{day}")
-    # --- Helper function for word-based name cleaning and tokenization ---
-    def get_match_tokens(name):
-        """Extracts significant, clean, lowercase words for comparison."""
-        if pd.isna(name):
-            return set()
-        name = str(name).lower()
-        # Remove common, noisy words that often appear in picks/fixtures
-        name = re.sub(r'\b(fc|utd|united|city|ac|cf|sc|tsv|sv|fk|sk|draw|the|and|or|of|a|an)\b', ' ', name)
-        # Remove non-alphanumeric characters, then split into words
-        words = re.sub(r'[^a-z0-9\s]', ' ', name).split()
-        # Filter out very short words that are likely generic
-        return {word for word in words if len(word) > 2}
-    # -----------------------------------------------------------------
-    today_path = SCRIPT_DIR / day_folder
-    # 1. Load DataFrames
+    timer.report()
+    return data
+@METRICS.instrument("compare", day_key=day_folder_name)
+def compare_confidence_sources(ai_goalie_file, olbg_file, oddspedia_file,day, records=None):
+    """
+    Builds the day's combined sheet. `records` is (ai, olbg, oddspedia) as returned by the
+    scrapers of this run; any source missing from it is read from the day's files instead.
+    """
+    today_path = CATALOG.folder(day, create=True)
+    ai_records, olbg_records, oddspedia_records = records or (None, None, None)
+    # 1. Load DataFrames (only for sources this run did not just scrape)
     try:
-        df_ai = pd.read_excel(today_path / ai_goalie_file)
-        df_olbg = pd.read_excel(today_path / olbg_file)
-        df_oddspedia = pd.read_excel(today_path / oddspedia_file)
+        if ai_records is None:
+            ai_records = from_frame(load_frame(today_path / ai_goalie_file), AiTip)
+        if olbg_records is None:
+            olbg_records = from_frame(load_frame(today_path / olbg_file), Tip)
+        if oddspedia_records is None:
+            oddspedia_records = from_frame(load_frame(today_path / oddspedia_file), Tip)
     except FileNotFoundError as e:
-        print(f"Error: One or more required Excel files not found: {e}")
+        print(f"Error: One or more required data files not found: {e}")
+        METRICS.current().status = "missing input"
         return pd.DataFrame()
     except Exception as e:
         print(f"Error loading Excel files: {e}")
+        METRICS.current().status = f"error: {type(e).__name__}"
         return pd.DataFrame()
 
-    # 2. Prepare Match Tokens for all 'Pick' columns
-    df_ai['Match_Tokens'] = df_ai['Pick'].apply(get_match_tokens)
-    df_olbg['Pick_Text'] = df_olbg['Pick'].astype(str).str.lower()
-    df_oddspedia['Pick_Text'] = df_oddspedia['Pick'].astype(str).str.lower()
-    
-    df_ai.dropna(subset=['Match_Tokens'], inplace=True)
-    comparison_data = []
-
-    # 3. Iterate and Compare using Word Match
-    for index, row in df_ai.iterrows():
-        ai_tokens = row['Match_Tokens']
-        ai_original_pick = row['Pick']
-        ai_fixture = row['Fixture']
-        ai_result = row['Result']
-        
-        
-        # Clean AI Goalie confidence
-        ai_confidence_str = str(row['Win %']).replace('%', '').strip()
-        olbg_confidence = None
-        oddspedia_confidence = None
-        result = None
-        odds = None
-        # if df_ai[]
-        # --- Check OLBG ---
-        # Find OLBG rows where the OLBG Pick Text contains any word from the AI Goalie tokens
-        olbg_match = df_olbg[
-            df_olbg['Pick_Text'].apply(lambda x: any(token in x for token in ai_tokens))
-        ]
-        if ai_result:
-            result = ai_result
-        if not olbg_match.empty:
-            # Found a match: take the confidence (first one if multiple exist)
-            olbg_confidence = olbg_match.iloc[0]['Confidence %']
-            odds = olbg_match.iloc[0]['Odds']
-
-        # --- Check Oddspedia ---
-        # Find Oddspedia rows where the Oddspedia Pick Text contains any word from the AI Goalie tokens
-        oddspedia_match = df_oddspedia[
-            df_oddspedia['Pick_Text'].apply(lambda x: any(token in x for token in ai_tokens))
-        ]
-        if not oddspedia_match.empty:
-            oddspedia_confidence = oddspedia_match.iloc[0]['Confidence %']
-            odds = oddspedia_match.iloc[0]['Odds']
-        
-        # 4. Append Result (Only if at least one other source has a matching pick)
-        if olbg_confidence is not None or oddspedia_confidence is not None:
-            comparison_data.append({
-                "Fixture": ai_fixture,
-                "Pick": ai_original_pick,
-                "AI_Confidence": ai_confidence_str,
-                "OLBG_Confidence": olbg_confidence,
-                "Oddspedia_Confidence": oddspedia_confidence,
-                "Odds": odds,
-                "Result": result
-            })
-
-    # 5. Create Final DataFrame and Save
-    df_comparison = pd.DataFrame(comparison_data)
+    # 2. Stream every AI pick through the matcher by resolved fixture (first match wins)
+    resolver = TeamResolver.load()
+    combined = FrameSink(COMPARISON_COLUMNS)
+    drain(tap(match(ai_records, olbg_records, oddspedia_records,
+                    resolver=resolver, year=as_date(day).year), combined))
+    resolver.save()
+
+    # 3. Create Final DataFrame and Save
+    df_comparison = combined.frame()
+    stage = METRICS.current()
+    stage.rows_in = len(ai_records)
+    stage.skip("no OLBG / Oddspedia match", len(ai_records) - len(combined))
     
     if df_comparison.empty:
-        save_name = f"{day}_combined_confidence"
-        save_name = os.path.join(day_folder, f"{save_name}.xlsx")
-        df_comparison.to_excel(save_name, index=False)
+        save_name = f"{day_prefix(day)}_combined_confidence"
+        save_name = os.path.join(today_path, f"{save_name}.xlsx")
+        save_frame(df_comparison, save_name)
         print("Found 0 common picks. No output file created.")
         return df_comparison
 
-    # Clean up and convert confidence columns to numeric
+    # Confidences are already numbers (parsed once in records.py); None -> NaN
     for col in ['AI_Confidence', 'OLBG_Confidence', 'Oddspedia_Confidence']:
-        df_comparison[col] = df_comparison[col].astype(str).str.replace('%', '', regex=False).str.strip()
         df_comparison[col] = pd.to_numeric(df_comparison[col], errors='coerce')
 
+    # Calibrated consensus score and the day's best-value ranking, for all picks at once
+    try:
+        df_comparison = score_frame(df_comparison, load_weights())
+    except Exception as e:
+        print(f"Could not score the picks: {e}")
+
     print(f"Found {len(df_comparison)} common picks.")
     # save_folder = Path("X:/Colab Notebooks")
     # file_name = f"{today}_combined_confidence_xlsx"
     # full_path = save_folder / file_name
    
-    save_name = f"{day}_combined_confidence"
-    save_name = os.path.join(day_folder, f"{save_name}.xlsx")
-    df_comparison.to_excel(save_name, index=False)
-    print(f"Results saved to {day}_combined_confidence.xlsx")
+    save_name = f"{day_prefix(day)}_combined_confidence"
+    save_name = os.path.join(today_path, f"{save_name}.xlsx")
+    save_frame(df_comparison, save_name)
+    print(f"Results saved to {save_name}")
     
     return df_comparison
+def compare_day(day, records=None):
+    """Builds the day's combined sheet and upserts the day into the warehouse."""
+    prefix = day_prefix(day)
+    compare_confidence_sources(f"{prefix}_fixtures.xlsx",f"{prefix}_olbg_fixtures.xlsx",f"{prefix}_oddspedia_fixtures.xlsx",day,
+                               records=records)
+    # Keep the SQLite warehouse in step with the day's files
+    try:
+        ingest_day(CATALOG.folder(day))
+    except Exception as e:
+        print(f"Could not update the warehouse: {e}")
+
 def update_day(day):
-    ai_goalie_get(day)
-    compare_confidence_sources(f"{day}_fixtures.xlsx",f"{day}_olbg_fixtures.xlsx",f"{day}_oddspedia_fixtures.xlsx",day)
-def get_whole_day(day):
-    ai_goalie_get(day)
-    oddspedia_get(day)
-    olbg_get(day)
-    compare_confidence_sources(f"{day}_fixtures.xlsx",f"{day}_olbg_fixtures.xlsx",f"{day}_oddspedia_fixtures.xlsx",day)
-yesterday = int(today) -1
-yesterday = f"{str(yesterday)}"
-
-# today = int(today)+1
-update_day(yesterday)
-get_whole_day(today)
+    # Lazy: the browser only starts if the HTTP fetch was not enough
+    with browser_session(lazy=True):
+        ai_goalie_get(day)
+    compare_day(day)
+def scrape_sources_parallel(day, timeouts=SOURCE_TIMEOUTS, results=None):
+    """
+    Runs every scraper at the same time, each with its own browser.
+    A source that exceeds its timeout has its browser killed and is not waited for.
+    Its thread cannot be stopped, though: a scraper that is past its browser work (or
+    never started one) may still write its DD_*_fixtures sheet after this returns,
+    i.e. after compare_day has read the older file and the warehouse was updated.
+    That late file does not feed this run; the next compare of the day picks it up.
+    Returns {source: "ok" | "timeout" | "error"}; finished scrapers' rows go into `results`.
+    """
+    scrapers = {"ai_goalie": ai_goalie_get, "oddspedia": oddspedia_get, "olbg": olbg_get}
+    drivers = {}
+
+    def start_driver(name):
+        driver = new_driver()
+        drivers[name] = driver
+        return driver
+
+    def run(name):
+        try:
+            if name in ("ai_goalie", "olbg"):
+                # These try plain HTTP first and only start a browser if they need one
+                return scrapers[name](day, driver_factory=lambda: start_driver(name))
+            return scrapers[name](day, driver=start_driver(name))
+        finally:
+            driver = drivers.get(name)
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    status = {}
+    start = perf_counter()
+    pool = ThreadPoolExecutor(max_workers=len(scrapers))
+    futures = {name: pool.submit(run, name) for name in scrapers}
+    for name, future in futures.items():
+        # Timeouts count from the common start, so waiting on one source does not extend another
+        remaining = max(0, timeouts.get(name, 180) - (perf_counter() - start))
+        try:
+            rows = future.result(timeout=remaining)
+            if results is not None:
+                results[name] = rows
+            status[name] = "ok"
+            print(f"✅ {name} finished in {perf_counter() - start:.1f}s")
+        except FuturesTimeout:
+            status[name] = "timeout"
+            print(f"⏱️ {name} timed out after {timeouts.get(name, 180)}s, closing its browser")
+            driver = drivers.get(name)
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+        except Exception as e:
+            status[name] = "error"
+            print(f"❌ {name} failed: {e}")
+    pool.shutdown(wait=False, cancel_futures=True)
+    return status
+def get_whole_day(day, parallel=False):
+    results = {}
+    if parallel:
+        scrape_sources_parallel(day, results=results)
+    else:
+        # Scrapers share one browser, started by the first one that needs it
+        with browser_session(lazy=True):
+            results["ai_goalie"] = ai_goalie_get(day)
+            results["oddspedia"] = oddspedia_get(day)
+            results["olbg"] = olbg_get(day)
+    # Hand the scraped rows straight to the matcher instead of re-reading the sheets
+    # (a source that came back empty falls back to its file from an earlier run)
+    compare_day(day, records=tuple(results.get(name) or None for name in ("ai_goalie", "olbg", "oddspedia")))
+
+# ----------------- Range Backfill -----------------
+def load_checkpoint(path=BACKFILL_CHECKPOINT):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return set(json.load(f).get("done", []))
+    except (FileNotFoundError, ValueError):
+        return set()
+
+def save_checkpoint(done, path=BACKFILL_CHECKPOINT):
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"done": sorted(done)}, f, indent=1)
+    os.replace(tmp, path)
+
+def backfill(start, end, workers=BACKFILL_WORKERS, checkpoint=BACKFILL_CHECKPOINT, force=False):
+    """
+    Re-scrapes AI Goalie for every day from `start` to `end` (inclusive) and rebuilds
+    each day's comparison from whatever OLBG/Oddspedia files that day already has
+    (those sites only show upcoming tips, so they cannot be backfilled).
+    At most `workers` browsers run at once; each finished day is written to the
+    checkpoint right away, so an interrupted backfill resumes where it stopped.
+    Returns {"YYYY-MM-DD": "ok" | "skipped" | "error"}.
+    """
+    start, end = as_date(start), as_date(end)
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    done = set() if force else load_checkpoint(checkpoint)
+    todo = [d for d in days if d.isoformat() not in done]
+    status = {d.isoformat(): "skipped" for d in days if d.isoformat() in done}
+    print(f"📅 Backfill {start} -> {end}: {len(todo)} day(s) to fetch, {len(status)} already done")
+
+    lock = threading.Lock()
+    # The comparison rewrites team_aliases.json and the warehouse; one day at a time
+    write_lock = threading.Lock()
+    local = threading.local()
+    drivers = []
+
+    def worker_driver():
+        # One browser per worker thread, reused for every day that thread handles
+        if getattr(local, "driver", None) is None:
+            local.driver = new_driver()
+            with lock:
+                drivers.append(local.driver)
+        return local.driver
+
+    def run(day):
+        ai_goalie_get(day, driver_factory=worker_driver)
+        with write_lock:
+            compare_day(day)
+            done.add(day.isoformat())
+            save_checkpoint(done, checkpoint)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(run, day): day for day in todo}
+            for future, day in futures.items():
+                try:
+                    future.result()
+                    status[day.isoformat()] = "ok"
+                    print(f"✅ {day} done")
+                except Exception as e:
+                    status[day.isoformat()] = "error"
+                    print(f"❌ {day} failed: {e}")
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    failed = [d for d, s in status.items() if s == "error"]
+    if failed:
+        print(f"⚠️ {len(failed)} day(s) failed and will be retried next run: {', '.join(failed)}")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape today's tips, or backfill a date range.")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"), help="YYYY-MM-DD dates, inclusive")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    parser.add_argument("--force", action="store_true", help="refetch days already in the checkpoint")
+    parser.add_argument("--profile", action="store_true", default=PROFILE,
+                        help="also write a cProfile dump (DD_profile.pstats) to today's folder")
+    args = parser.parse_args()
+
+    run_folder = CATALOG.folder(today)
+    with profiled(run_folder / f"{day_prefix(today)}_profile.pstats", enabled=args.profile):
+        if args.backfill:
+            backfill(*args.backfill, workers=args.workers, force=args.force)
+        else:
+            # Real dates, so the 1st of the month updates the last day of the previous month
+            yesterday = as_date(today) - timedelta(days=1)
+
+            # One browser for both runs; it is only started if a scraper asks for it
+            with browser_session(lazy=True):
+                update_day(yesterday)
+                get_whole_day(today, parallel=PARALLEL_SCRAPE)
+    fetch_report()
+    # Per-stage time, rows, skips, WebDriver calls and memory -> DD_metrics.json in each day folder
+    METRICS.report()
+    METRICS.save(CATALOG.folder, day_folder_name(today))
 
 # day = yesterday
 # compare_confidence_sources(f"{day}_fixtures.xlsx",f"{day}_olbg_fixtures.xlsx",f"{day}_oddspedia_fixtures.xlsx",day)
\ No newline at end of file
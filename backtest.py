@@ -0,0 +1,152 @@
+import sys
+import argparse
+from time import perf_counter
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import warehouse
+
+# ----------------- Configuration -----------------
+# Grids swept by default. The live settings are Win % >= 52 (ai_goalie_get; the old
+# September past-day scraper used 60), Oddspedia >= 60 and the goal line ceil(xG) + 0.5.
+WIN_THRESHOLDS = np.arange(50, 92, 2)
+# 0 means "no Oddspedia filter": picks Oddspedia does not have are kept too
+ODDSPEDIA_THRESHOLDS = np.array([0, 50, 60, 70, 80, 90])
+GOAL_OFFSETS = np.array([-0.5, 0.5, 1.5, 2.5])
+CURRENT = {"min_win": (52, 60), "min_oddspedia": 60, "offset": 0.5}
+
+# Final score at the end of an AI Goalie fixture (see warehouse.FINAL_SCORE)
+FINAL_SCORE = warehouse.FINAL_SCORE
+
+HISTORY_SQL = """
+SELECT a.day, a.fixture, a.pick, a.confidence AS win, a.xg, a.won,
+       b.odds, b.oddspedia_confidence, b.olbg_confidence
+FROM tips a
+LEFT JOIN tips b ON b.source = 'combined' AND b.day = a.day AND b.fixture = a.fixture AND b.pick = a.pick
+WHERE a.source = ?
+"""
+
+# ----------------- Load -----------------
+def load_history(db_path=warehouse.DB_PATH, source="ai_goalie_full"):
+    """
+    Every historical AI Goalie row in one frame, with the odds and other-source
+    confidences of the combined sheet where the pick was matched.
+    """
+    if not Path(db_path).exists():
+        warehouse.ingest(db_path=db_path)
+    conn = warehouse.connect(db_path)
+    df = pd.read_sql_query(HISTORY_SQL, conn, params=(source,))
+    conn.close()
+    score = df["fixture"].str.extract(FINAL_SCORE).astype(float)
+    df["total"] = score[0] + score[1]
+    for column in ("win", "xg", "won", "odds", "oddspedia_confidence", "olbg_confidence", "total"):
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+# ----------------- Sweeps -----------------
+def pick_sweep(df, win_thresholds=WIN_THRESHOLDS, oddspedia_thresholds=ODDSPEDIA_THRESHOLDS):
+    """
+    Hit rate and ROI of the picked side for every (Win %, Oddspedia %) threshold pair.
+    ROI is profit per unit staked at the recorded Odds, over the picks that have odds.
+    """
+    settled = df[df["won"].notna() & df["win"].notna()]
+    win = settled["win"].to_numpy()
+    won = settled["won"].to_numpy()
+    odds = settled["odds"].to_numpy()
+    oddspedia = settled["oddspedia_confidence"].to_numpy()
+    win_thresholds = np.asarray(win_thresholds)
+    oddspedia_thresholds = np.asarray(oddspedia_thresholds)
+
+    by_win = win[None, :] >= win_thresholds[:, None]                                    # (W, n)
+    with np.errstate(invalid="ignore"):
+        by_oddspedia = (oddspedia_thresholds[:, None] == 0) | (oddspedia[None, :] >= oddspedia_thresholds[:, None])  # (O, n)
+    mask = by_win[:, None, :] & by_oddspedia[None, :, :]                                # (W, O, n)
+
+    has_odds = ~np.isnan(odds)
+    profit = np.where(has_odds, np.where(won == 1, odds - 1, -1.0), 0.0)
+    picks = mask.sum(-1)
+    hits = (mask * won).sum(-1)
+    priced = (mask & has_odds).sum(-1)
+    staked_profit = (mask * profit).sum(-1)
+
+    grid_win, grid_oddspedia = np.meshgrid(win_thresholds, oddspedia_thresholds, indexing="ij")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "min_win": grid_win.ravel(),
+            "min_oddspedia": grid_oddspedia.ravel(),
+            "picks": picks.ravel(),
+            "hit_rate": (100 * hits / picks).ravel(),
+            "with_odds": priced.ravel(),
+            "roi": (100 * staked_profit / priced).ravel(),
+        })
+
+def goal_line_sweep(df, win_thresholds=WIN_THRESHOLDS, offsets=GOAL_OFFSETS):
+    """
+    Under/over hit rate of the goal line ceil(xG) + offset for every (Win %, offset) pair,
+    over finished matches. No odds are recorded for goal lines, so there is no ROI here.
+    """
+    settled = df[df["total"].notna() & df["xg"].notna() & df["win"].notna()]
+    win = settled["win"].to_numpy()
+    total = settled["total"].to_numpy()
+    lines = np.ceil(settled["xg"].to_numpy())[None, :] + np.asarray(offsets)[:, None]  # (L, n)
+    under = (total[None, :] < lines).astype(float)                                        # (L, n)
+    by_win = (win[None, :] >= np.asarray(win_thresholds)[:, None]).astype(float)          # (W, n)
+
+    picks = by_win.sum(-1)                                                                # (W,)
+    unders = by_win @ under.T                                                              # (W, L)
+    grid_win, grid_offset = np.meshgrid(win_thresholds, offsets, indexing="ij")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        under_rate = 100 * unders / picks[:, None]
+    return pd.DataFrame({
+        "min_win": grid_win.ravel(),
+        "offset": grid_offset.ravel(),
+        "matches": np.repeat(picks, len(offsets)).astype(int),
+        "under_rate": under_rate.ravel(),
+        "over_rate": (100 - under_rate).ravel(),
+    })
+
+# ----------------- Report -----------------
+def print_table(title, table, sort_by, min_sample, sample_column, top):
+    shown = table[table[sample_column] >= min_sample].sort_values(sort_by, ascending=False).head(top)
+    print(f"\n{title} (>= {min_sample} {sample_column}, top {top} by {sort_by})")
+    print(shown.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest confidence thresholds and goal lines on all history.")
+    parser.add_argument("--db", default=str(warehouse.DB_PATH))
+    parser.add_argument("--source", default="ai_goalie_full", help="warehouse source with the AI Goalie rows")
+    parser.add_argument("--min-sample", type=int, default=30, help="hide settings with fewer picks")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--csv", help="folder to write the full sweep tables to")
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    df = load_history(args.db, args.source)
+    loaded = perf_counter()
+    picks = pick_sweep(df)
+    lines = goal_line_sweep(df)
+    swept = perf_counter()
+    print(f"⏱️ {len(df)} rows from {df['day'].nunique()} days loaded in {loaded - start:.2f}s, "
+          f"{len(picks) + len(lines)} settings swept in {swept - loaded:.3f}s")
+
+    print_table("Picked side", picks, "roi", args.min_sample, "with_odds", args.top)
+    print_table("Picked side", picks, "hit_rate", args.min_sample, "picks", args.top)
+    print_table("Goal line ceil(xG) + offset", lines, "under_rate", args.min_sample, "matches", args.top)
+
+    current = picks[picks["min_win"].isin(CURRENT["min_win"]) & picks["min_oddspedia"].isin([0, CURRENT["min_oddspedia"]])]
+    print("\nCurrent settings")
+    print(current.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+    print(lines[lines["min_win"].isin(CURRENT["min_win"]) & (lines["offset"] == CURRENT["offset"])]
+          .to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+    if args.csv:
+        out = Path(args.csv)
+        out.mkdir(parents=True, exist_ok=True)
+        picks.to_csv(out / "pick_sweep.csv", index=False)
+        lines.to_csv(out / "goal_line_sweep.csv", index=False)
+        print(f"Saved sweep tables to {out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
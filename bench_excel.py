@@ -0,0 +1,72 @@
+import argparse
+import tempfile
+from time import perf_counter
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from storage import write_excel, win_rate_cells, average_confidence_cells
+
+# ----------------- Writers -----------------
+def legacy_write(df, path, cells):
+    """The old cycle: to_excel, reload, scan column I for the last row, add formulas, save again."""
+    df.to_excel(path, index=False)
+    wb = load_workbook(path)
+    ws = wb.active
+    last_row = 0
+    for r in range(1, ws.max_row + 1):
+        if ws[f"I{r}"].value is not None:
+            last_row = r
+    for ref, value in cells.items():
+        ws[ref] = value
+    wb.save(path)
+
+def cells_for(df):
+    """Same summary cells the scrapers add: win rate for AI Goalie sheets, average confidence otherwise."""
+    if "Under" in df.columns:
+        return win_rate_cells(df)
+    if "Confidence %" in df.columns:
+        return average_confidence_cells(df)
+    return {}
+
+def time_file(xlsx_path, repeat=3):
+    """Average (legacy, single-pass) write time in seconds for the table stored in `xlsx_path`."""
+    df = pd.read_excel(xlsx_path)
+    cells = cells_for(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "out.xlsx"
+        start = perf_counter()
+        for _ in range(repeat):
+            legacy_write(df, out, cells)
+        legacy = (perf_counter() - start) / repeat
+        start = perf_counter()
+        for _ in range(repeat):
+            write_excel(df, out, cells)
+        single = (perf_counter() - start) / repeat
+    return legacy, single
+
+# ----------------- CLI -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old write-reload-write Excel cycle with the single-pass writer.")
+    parser.add_argument("files", nargs="+", help=".xlsx files or folders to take tables from")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = []
+    for item in map(Path, args.files):
+        paths.extend(sorted(item.rglob("*.xlsx")) if item.is_dir() else [item])
+
+    total_legacy = total_single = 0.0
+    for path in paths:
+        legacy, single = time_file(path, args.repeat)
+        total_legacy += legacy
+        total_single += single
+        print(f"{str(path):<60} legacy {legacy * 1000:7.1f}ms  single {single * 1000:7.1f}ms  "
+              f"saved {(legacy - single) * 1000:7.1f}ms")
+    if paths:
+        print(f"⏱️ {len(paths)} files: saved {(total_legacy - total_single):.2f}s "
+              f"({total_legacy:.2f}s -> {total_single:.2f}s)")
+
+if __name__ == "__main__":
+    main()
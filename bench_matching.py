@@ -0,0 +1,74 @@
+import argparse
+import random
+import string
+from time import perf_counter
+import pandas as pd
+
+from matching import get_match_tokens, PickIndex, build_comparison
+
+# ----------------- Synthetic Data -----------------
+SUFFIXES = ["FC", "United", "City", "Rovers", "Athletic", "SC", ""]
+
+def random_team(rng):
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()
+             for _ in range(rng.randint(1, 2))]
+    return " ".join(words + [rng.choice(SUFFIXES)]).strip()
+
+def synthetic_frames(n_ai, n_other, teams=4000, seed=7):
+    rng = random.Random(seed)
+    pool = [random_team(rng) for _ in range(teams)]
+    df_ai = pd.DataFrame({
+        "Fixture": [f"{rng.choice(pool)} - {rng.choice(pool)}: 1:0" for _ in range(n_ai)],
+        "Pick": [rng.choice(pool) for _ in range(n_ai)],
+        "Win %": [f"{rng.randint(20, 80)}%" for _ in range(n_ai)],
+        "Result": [rng.choice(["✓", "X", None]) for _ in range(n_ai)],
+    })
+
+    def other():
+        return pd.DataFrame({
+            "Pick": [rng.choice(pool) for _ in range(n_other)],
+            "Confidence %": [rng.randint(40, 100) for _ in range(n_other)],
+            "Odds": [round(rng.uniform(1.1, 5.0), 2) for _ in range(n_other)],
+        })
+    return df_ai, other(), other()
+
+# ----------------- Reference -----------------
+def legacy_first_match(pick_text, tokens):
+    """The original per-row scan: boolean mask over every pick, then iloc[0]."""
+    hits = pick_text[pick_text.apply(lambda x: any(token in x for token in tokens))]
+    return None if hits.empty else pick_text.index.get_loc(hits.index[0])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indexed pick matching against the legacy scan.")
+    parser.add_argument("--ai", type=int, default=10000, help="AI Goalie rows")
+    parser.add_argument("--other", type=int, default=10000, help="OLBG / Oddspedia rows each")
+    parser.add_argument("--legacy-sample", type=int, default=200,
+                        help="AI rows timed with the legacy scan (extrapolated to the full size)")
+    args = parser.parse_args()
+
+    df_ai, df_olbg, df_oddspedia = synthetic_frames(args.ai, args.other)
+    print(f"Synthetic input: {args.ai} AI rows x {args.other} OLBG / Oddspedia rows")
+
+    start = perf_counter()
+    comparison = build_comparison(df_ai, df_olbg, df_oddspedia)
+    indexed = perf_counter() - start
+    print(f"Indexed matching: {indexed:.2f}s for the full input ({len(comparison)} common picks)")
+
+    # Legacy scan on a sample, checking the index returns the same first match
+    sample = df_ai.head(args.legacy_sample)
+    pick_text = df_olbg["Pick"].astype(str).str.lower()
+    index = PickIndex(pick_text)
+    mismatches = 0
+    start = perf_counter()
+    for pick in sample["Pick"]:
+        tokens = get_match_tokens(pick)
+        expected = legacy_first_match(pick_text, tokens)
+        if index.first_match(tokens) != expected:
+            mismatches += 1
+    legacy = (perf_counter() - start) * len(df_ai) / max(len(sample), 1) * 2  # two sources
+    print(f"Legacy scan: ~{legacy:.1f}s extrapolated from {len(sample)} rows ({legacy / max(indexed, 1e-9):.0f}x slower)")
+    print(f"First-match mismatches on sample: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
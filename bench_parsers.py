@@ -0,0 +1,108 @@
+import argparse
+from time import perf_counter
+from collections import defaultdict
+
+from page_parser import SOURCES, load_html
+from html_corpus import iter_corpus, load_page
+
+# ----------------- Replay -----------------
+def replay_page(page_source, source, repeat=1):
+    """
+    Runs one captured page through the row-extraction logic `repeat` times.
+    Returns timings per field, parse/build totals, the row count and failures seen.
+    """
+    row_xpath, fields, build_row = SOURCES[source]
+    field_times = defaultdict(float)
+    failures = defaultdict(int)
+    parse_time = 0.0
+    extract_time = 0.0
+    rows_in = 0
+    rows_out = 0
+
+    for _ in range(repeat):
+        start = perf_counter()
+        doc = load_html(page_source)
+        rows = doc.xpath(row_xpath)
+        parse_time += perf_counter() - start
+
+        rows_in = len(rows)
+        rows_out = 0
+        start = perf_counter()
+        for row in rows:
+            cells = {}
+            for name, extract in fields.items():
+                t0 = perf_counter()
+                try:
+                    cells[name] = extract(row)
+                except Exception:
+                    failures[name] += 1
+                field_times[name] += perf_counter() - t0
+            if len(cells) != len(fields):
+                continue
+            try:
+                if build_row(cells) is not None:
+                    rows_out += 1
+            except Exception:
+                failures["build_row"] += 1
+        extract_time += perf_counter() - start
+
+    return {
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "parse_time": parse_time / repeat,
+        "extract_time": extract_time / repeat,
+        "field_times": {name: t / repeat for name, t in field_times.items()},
+        "failures": {name: n // repeat for name, n in failures.items()},
+    }
+
+# ----------------- Report -----------------
+def print_report(meta, stats):
+    total = stats["parse_time"] + stats["extract_time"]
+    rate = stats["rows_in"] / total if total else 0.0
+    print(f"\n📄 {meta['path']} [{meta['source']}]")
+    print(f"   rows: {stats['rows_in']} found, {stats['rows_out']} kept"
+          + (f" (live scrape kept {meta['rows']})" if meta.get("rows") is not None else ""))
+    print(f"   parse {stats['parse_time'] * 1000:.2f} ms, extract {stats['extract_time'] * 1000:.2f} ms, "
+          f"{rate:,.0f} rows/sec")
+    per_row = max(stats["rows_in"], 1)
+    for name, t in sorted(stats["field_times"].items(), key=lambda kv: -kv[1]):
+        print(f"   {name:<14} {t / per_row * 1e6:8.1f} µs/row")
+    if stats["failures"]:
+        print("   ⚠️ failures: " + ", ".join(f"{k}={v}" for k, v in stats["failures"].items()))
+    if meta.get("rows") is not None and stats["rows_out"] != meta["rows"]:
+        print(f"   ❌ row count changed: {meta['rows']} -> {stats['rows_out']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured pages through the row parsers.")
+    parser.add_argument("root", nargs="?", default=".", help="folder searched for */corpus/*.html")
+    parser.add_argument("--repeat", type=int, default=5, help="replays per page (timings are averaged)")
+    parser.add_argument("--file", action="append", default=[], metavar="SOURCE:PATH",
+                        help="extra page outside the corpus, e.g. oddspedia:misc/html.txt")
+    args = parser.parse_args()
+
+    pages = [load_page(p) for p in iter_corpus(args.root)]
+    for item in args.file:
+        source, path = item.split(":", 1)
+        with open(path, encoding="utf-8") as f:
+            pages.append((f.read(), {"source": source, "path": path, "rows": None}))
+
+    if not pages:
+        # An empty corpus would pass silently; the seed pages live in misc/corpus/
+        print(f"❌ No captured pages found under {args.root}.")
+        return 1
+
+    regressions = 0
+    for page_source, meta in pages:
+        if meta["source"] not in SOURCES:
+            print(f"Skipping {meta['path']}: unknown source '{meta['source']}'")
+            continue
+        stats = replay_page(page_source, meta["source"], args.repeat)
+        print_report(meta, stats)
+        if meta.get("rows") is not None and stats["rows_out"] != meta["rows"]:
+            regressions += 1
+
+    print(f"\nReplayed {len(pages)} page(s), {regressions} row-count regression(s).")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
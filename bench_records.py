@@ -0,0 +1,59 @@
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+from records import AiTip
+
+# ----------------- Synthetic backfill -----------------
+def raw_rows(n, seed=1):
+    """`n` AI Goalie rows as the parser scrapes them: every number still a string."""
+    rng = random.Random(seed)
+    for i in range(n):
+        xg = f"{rng.uniform(0.5, 4.5):.2f}"
+        yield [f"Sat {i % 28 + 1}", f"Home {i} - Away {i}: 19:45", xg, f"Home {i}",
+               str(int(float(xg)) + 1.5), f"{rng.randint(20, 90)}%", None, None, None]
+
+# ----------------- Layouts -----------------
+def list_rows(n):
+    """The old layout (ai_goalie_get before AiTip): one positional list per row, Win % re-parsed by the filter."""
+    rows = list(raw_rows(n))
+    kept = []
+    for row in rows:
+        try:
+            if float(row[5].replace("%", "").strip()) >= 52:
+                kept.append(row)
+        except Exception:
+            continue
+    return rows, kept
+
+def slotted_rows(n):
+    """AiTip records: numbers parsed once at ingest, filters compare floats."""
+    rows = [AiTip(*row) for row in raw_rows(n)]
+    kept = [r for r in rows if r.win is not None and r.win >= 52]
+    return rows, kept
+
+def measure(build, n):
+    """(seconds, peak MiB, kept rows) for building and filtering `n` rows. Timed without tracemalloc."""
+    start = perf_counter()
+    rows, kept = build(n)
+    elapsed = perf_counter() - start
+    del rows, kept
+    tracemalloc.start()
+    rows, kept = build(n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, len(kept)
+
+# ----------------- CLI -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Compare list rows with slotted AiTip records on a synthetic backfill.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for name, build in (("list rows", list_rows), ("AiTip slots", slotted_rows)):
+        elapsed, peak, kept = measure(build, args.rows)
+        print(f"{name:<12} {args.rows} rows: {elapsed:.2f}s, peak {peak:.1f} MiB, {kept} kept (Win % >= 52)")
+
+if __name__ == "__main__":
+    main()
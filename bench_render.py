@@ -0,0 +1,69 @@
+import argparse
+from time import perf_counter
+from pathlib import Path
+
+import pandas as pd
+
+from storage import load_frame
+from render import render_rows
+
+# ----------------- Legacy renderer -----------------
+def legacy_row(row):
+    """The old github.create_html_table_row: f-strings per Series, no escaping."""
+    fixture = row.get('Fixture', 'N/A')
+    pick = row.get('Pick', 'N/A')
+    def format_conf(value):
+        if pd.isna(value) or str(value).strip() == '':
+            return '<td class="px-6 py-4 text-center text-gray-400">N/A</td>'
+        s = str(round(int(value))).strip()
+        return f'<td class="px-6 py-4 text-center font-semibold text-blue-600">{s if s.endswith("%") else s+"%"}</td>'
+    def format_odds(value):
+        if pd.isna(value) or str(value).strip() == '':
+            return '<td class="px-6 py-4 text-center text-gray-400">N/A</td>'
+        return f'<td class="px-6 py-4 text-center font-semibold text-green-600">{value}</td>'
+    return f"""
+    <tr class="bg-white border-b hover:bg-gray-50 transition-colors duration-150">
+        <td class="px-6 py-4 font-medium text-gray-900 whitespace-nowrap">{fixture}</td>
+        <td class="px-6 py-4">{pick}</td>
+        {format_conf(row.get('AI_Confidence'))}
+        {format_conf(row.get('OLBG_Confidence'))}
+        {format_conf(row.get('Oddspedia_Confidence'))}
+        {format_odds(row.get('Odds'))}
+        {format_odds(row.get('Result'))}
+    </tr>
+    """
+
+def legacy_rows(df):
+    return "".join(legacy_row(row) for _, row in df.iterrows())
+
+# ----------------- Timing -----------------
+def per_thousand(render, df, repeat):
+    """Milliseconds to render 1,000 rows of `df`."""
+    start = perf_counter()
+    for _ in range(repeat):
+        render(df)
+    return (perf_counter() - start) / repeat / len(df) * 1000 * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the legacy iterrows renderer against render.render_rows.")
+    parser.add_argument("folders", nargs="*", default=["2025"], help="folders with *_combined_confidence sheets")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows rendered per run (sheets are repeated)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = [load_frame(path) for folder in args.folders
+              for path in sorted(Path(folder).rglob("*_combined_confidence.xlsx"))]
+    frames = [df for df in frames if len(df)]
+    if not frames:
+        print("No combined confidence sheets found.")
+        return
+    sample = pd.concat(frames, ignore_index=True)
+    df = pd.concat([sample] * (args.rows // len(sample) + 1), ignore_index=True).head(args.rows)
+
+    legacy = per_thousand(legacy_rows, df, args.repeat)
+    compiled = per_thousand(render_rows, df, args.repeat)
+    print(f"⏱️ {len(df)} rows from {len(frames)} sheets: legacy {legacy:.1f}ms / 1,000 rows, "
+          f"template {compiled:.1f}ms / 1,000 rows ({legacy / compiled:.1f}x)")
+
+if __name__ == "__main__":
+    main()
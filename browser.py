@@ -0,0 +1,84 @@
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+from selenium.webdriver.chrome.options import Options
+import undetected_chromedriver as uc
+
+from metrics import METRICS
+
+# ----------------- Configuration -----------------
+# BROWSER_HEADLESS=0 shows the window again (handy when a selector breaks)
+HEADLESS = os.environ.get("BROWSER_HEADLESS", "1") != "0"
+# Font files are blocked through CDP; images through Chrome content settings
+BLOCKED_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+_driver = None
+# Open browser_session() blocks; only the outermost one closes the shared browser
+_sessions = 0
+# uc patches the chromedriver binary on start-up; concurrent starts must not race on it
+_start_lock = threading.Lock()
+
+# ----------------- Driver Factory -----------------
+def build_options(headless=HEADLESS, block_assets=True):
+    options = Options()
+    options.add_argument("--start-maximized")
+    options.add_argument("--window-size=1920,1080")
+    if headless:
+        options.add_argument("--headless=new")
+    if block_assets:
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+    return options
+
+def new_driver(headless=HEADLESS, block_assets=True):
+    """Starts an independent browser. The caller owns it and must quit() it."""
+    with _start_lock:
+        driver = uc.Chrome(options=build_options(headless, block_assets))
+    if block_assets:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        except Exception as e:
+            print(f"Could not block font requests: {e}")
+    # Every command this browser sends is counted against the stage that sent it
+    return METRICS.count_webdriver(driver)
+
+# ----------------- Shared Session -----------------
+def get_driver():
+    """Returns the shared browser, starting it on first use only."""
+    global _driver
+    if _driver is None:
+        print("🌐 Starting browser...")
+        _driver = new_driver()
+    return _driver
+
+def close_driver():
+    """Quits the shared browser if one was started. Safe to call more than once."""
+    global _driver
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception as e:
+            print(f"Error while closing browser: {e}")
+        _driver = None
+
+@contextmanager
+def browser_session(lazy=False):
+    """
+    Yields the shared browser. Sessions nest: only the outermost one closes the
+    browser on exit, so inner sessions reuse one Chrome instance.
+    With lazy=True nothing is started up front (yields None); a browser that
+    get_driver() starts inside the session is still closed by the outermost one.
+    """
+    global _sessions
+    _sessions += 1
+    try:
+        yield None if lazy else get_driver()
+    finally:
+        _sessions -= 1
+        if _sessions == 0:
+            close_driver()
+
+atexit.register(close_driver)
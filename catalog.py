@@ -0,0 +1,179 @@
+import os
+import re
+import threading
+from time import monotonic
+from pathlib import Path
+from datetime import date, datetime
+
+from storage import data_path
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+# 2025-10-21, and the unpadded 2025-10-4 some older runs wrote
+DAY_FOLDER = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+# Archived months: 2025/10/2025-10-21
+YEAR_FOLDER = re.compile(r"^\d{4}$")
+MONTH_FOLDER = re.compile(r"^\d{1,2}$")
+# Seconds the list of day folders is trusted before its directories are stat'ed again.
+# Folders created through the catalog show up at once; files inside a folder always do.
+INDEX_TTL = 1.0
+
+# ----------------- Dates -----------------
+def as_date(day):
+    """A real date for `day`: a date, "YYYY-MM-DD" (padded or not), or (legacy) a day number in the current month."""
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, date):
+        return day
+    text = str(day).strip()
+    match = DAY_FOLDER.match(text)
+    if match:
+        return date(*map(int, match.groups()))
+    if "-" in text:
+        return date.fromisoformat(text)
+    return datetime.now().date().replace(day=int(text))
+
+def folder_date(name):
+    """Date of a day folder name, or None for anything else."""
+    match = DAY_FOLDER.match(name)
+    if not match:
+        return None
+    try:
+        return date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+# ----------------- Catalog -----------------
+class Catalog:
+    """
+    Resolves a date to its day folder and the files in it. Day folders live at the top
+    level (YYYY-MM-DD, where new days go) or in the YYYY/MM/ archive. Directory listings
+    are cached and only re-read when the directory's mtime changes, so finding a file is
+    a dict hit plus one stat of its folder, and days without a folder cost nothing.
+    """
+
+    def __init__(self, root=SCRIPT_DIR):
+        self.root = Path(root).resolve()
+        self.lock = threading.Lock()
+        self.listings = {}  # directory -> (mtime_ns, file names)
+        self.index = None   # (checked at, [(directory, mtime)], {date: [folders]})
+
+    def _list(self, directory):
+        """(mtime, file names) of `directory`, re-read only if its mtime moved."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None, frozenset()
+        with self.lock:
+            cached = self.listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached
+        listing = (mtime, frozenset(os.listdir(directory)))
+        with self.lock:
+            self.listings[directory] = listing
+        return listing
+
+    def _scan(self):
+        """{date: [folders]} (top-level folder first) and the (directory, mtime) pairs it was read from."""
+        found = {}
+        mtime, names = self._list(self.root)
+        scanned = [(self.root, mtime)]
+        months = []
+        for name in sorted(names):
+            day = folder_date(name)
+            if day is not None:
+                found.setdefault(day, []).append(self.root / name)
+            elif YEAR_FOLDER.match(name) and (self.root / name).is_dir():
+                mtime, months_found = self._list(self.root / name)
+                scanned.append((self.root / name, mtime))
+                months += [self.root / name / month for month in sorted(months_found) if MONTH_FOLDER.match(month)]
+        for month in months:
+            mtime, names = self._list(month)
+            scanned.append((month, mtime))
+            for name in sorted(names):
+                day = folder_date(name)
+                if day is not None:
+                    found.setdefault(day, []).append(month / name)
+        return found, scanned
+
+    def _day_folders(self):
+        """
+        The day folder index. It is trusted for INDEX_TTL seconds, then checked with one
+        stat per scanned directory and rescanned only if one of them changed.
+        """
+        now = monotonic()
+        with self.lock:
+            index = self.index
+        if index is not None:
+            checked, scanned, found = index
+            if now - checked < INDEX_TTL:
+                return found
+            if all(self._mtime(directory) == mtime for directory, mtime in scanned):
+                with self.lock:
+                    self.index = (now, scanned, found)
+                return found
+        found, scanned = self._scan()
+        with self.lock:
+            self.index = (now, scanned, found)
+        return found
+
+    @staticmethod
+    def _mtime(directory):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def refresh(self):
+        """Drops every cached listing (after moving day folders around by hand)."""
+        with self.lock:
+            self.listings.clear()
+            self.index = None
+
+    # ----- days -----
+    def days(self, year=None, month=None):
+        """Sorted dates that have a folder, optionally within one year / month."""
+        return sorted(day for day in self._day_folders()
+                      if (year is None or day.year == year) and (month is None or day.month == month))
+
+    def folders(self, day):
+        return list(self._day_folders().get(as_date(day), []))
+
+    def folder(self, day, create=False):
+        """The day's folder: the existing one (top level before the archive), else a new top-level YYYY-MM-DD."""
+        day = as_date(day)
+        existing = self._day_folders().get(day)
+        if existing:
+            return existing[0]
+        folder = self.root / day.isoformat()
+        if create:
+            os.makedirs(folder, exist_ok=True)
+            with self.lock:
+                self.index = None
+        return folder
+
+    # ----- artifacts -----
+    def find(self, day, name):
+        """Path of file `name` (e.g. "21_predictions.html") in the day's folders, or None."""
+        for folder in self.folders(day):
+            if name in self._list(folder)[1]:
+                return folder / name
+        return None
+
+    def artifact(self, day, name):
+        """The day's DD_`name` file (e.g. "predictions.html"), or None."""
+        return self.find(day, f"{as_date(day):%d}_{name}")
+
+    def find_frame(self, day, name):
+        """
+        A sheet by its .xlsx name: the columnar copy if present, else the .xlsx
+        (storage.canonical_path without touching the disk). None if neither exists.
+        """
+        return self.find(day, data_path(name).name) or self.find(day, name)
+
+    # ----- URLs -----
+    def url(self, path, start=None):
+        """POSIX path of `path` relative to the catalog root (or to folder `start`), for links on the site."""
+        return Path(os.path.relpath(Path(path).resolve(), Path(start or self.root).resolve())).as_posix()
+
+CATALOG = Catalog()
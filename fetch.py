@@ -0,0 +1,157 @@
+import os
+import threading
+from time import perf_counter
+from collections import Counter, defaultdict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from lxml import etree
+
+from page_parser import SOURCES, load_html
+from response_cache import CACHE, CACHE_ENABLED
+
+# ----------------- Configuration -----------------
+# HTTP_FIRST=0 always uses the browser (old behaviour)
+HTTP_FIRST = os.environ.get("HTTP_FIRST", "1") != "0"
+HTTP_TIMEOUT = 15
+HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# ----------------- HTTP Client -----------------
+def get_session():
+    """One keep-alive session for every request, with a small connection pool per host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET", "HEAD"))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+def http_get(url, source=None, day=None, timeout=HTTP_TIMEOUT, use_cache=CACHE_ENABLED):
+    """
+    GET through the on-disk response cache: fresh entries are served without a request,
+    stale ones are revalidated with a conditional GET (304 reuses the stored body).
+    """
+    validators = {}
+    if use_cache:
+        body, validators = CACHE.lookup(url, source, day)
+        if body is not None:
+            return body
+    response = get_session().get(url, headers=validators, timeout=timeout)
+    if response.status_code == 304:
+        body = CACHE.revalidated(url, day)
+        if body is not None:
+            return body
+        # The stored body disappeared: fetch it again unconditionally
+        response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    if use_cache:
+        CACHE.store(url, response.text, response.headers, day)
+    return response.text
+
+def has_markers(source, page_source):
+    """
+    The parsed page if it already contains the source's tip rows (page_parser.SOURCES
+    row XPath), else None. Raises etree.ParserError on an empty body.
+    """
+    doc = load_html(page_source)
+    return doc if doc.xpath(SOURCES[source][0]) else None
+
+# ----------------- Stats -----------------
+class FetchStats:
+    """Which path each source's pages took, and how long it cost."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages = defaultdict(Counter)     # source -> {"http": n, "browser": n}
+        self.seconds = defaultdict(Counter)   # source -> {"http": s, "browser": s, "http_wasted": s}
+        self.fallbacks = defaultdict(Counter) # source -> {reason: n}
+
+    def record(self, source, path, elapsed, reason=None):
+        with self.lock:
+            self.pages[source][path] += 1
+            self.seconds[source][path] += elapsed
+            if reason is not None:
+                self.fallbacks[source][reason] += 1
+
+    def add_wasted(self, source, elapsed):
+        """HTTP time spent on a response that then needed the browser anyway."""
+        with self.lock:
+            self.seconds[source]["http_wasted"] += elapsed
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                source: {
+                    "pages": dict(self.pages[source]),
+                    "seconds": {k: round(v, 3) for k, v in self.seconds[source].items()},
+                    "fallbacks": dict(self.fallbacks[source]),
+                }
+                for source in self.pages
+            }
+
+    def report(self):
+        for source, stats in self.as_dict().items():
+            parts = []
+            for path in ("http", "browser"):
+                n = stats["pages"].get(path, 0)
+                if n:
+                    parts.append(f"{path} {n} page(s) avg {stats['seconds'][path] / n:.2f}s")
+            reasons = ", ".join(f"{r} x{n}" for r, n in stats["fallbacks"].items())
+            print(f"🌍 {source}: " + "; ".join(parts) + (f" (browser because: {reasons})" if reasons else ""))
+
+STATS = FetchStats()
+
+def report():
+    STATS.report()
+    CACHE.report()
+
+def fetch_stats():
+    """Per-source fetch stats: pages per path, seconds per path and fallback reasons."""
+    return STATS.as_dict()
+
+# ----------------- Strategy -----------------
+def fetch_page(source, url, browser_fetch, http_first=HTTP_FIRST, day=None):
+    """
+    Returns (page_source, "http" | "browser", doc) for `url`. `day` is the date the
+    page is about (its cache key and TTL); pages without one are keyed by today.
+    Tries the pooled HTTP client first and keeps the response if it already holds the
+    source's tip rows (doc is then the parsed page, for the parsers to reuse); otherwise
+    calls browser_fetch(url), which must load the page in a browser and return its
+    page_source (doc is None).
+    """
+    reason = "http disabled"
+    if http_first:
+        start = perf_counter()
+        try:
+            page_source = http_get(url, source, day)
+            doc = has_markers(source, page_source)
+            if doc is not None:
+                STATS.record(source, "http", perf_counter() - start)
+                return page_source, "http", doc
+            reason = "no markers"
+        except requests.RequestException as e:
+            reason = type(e).__name__
+        except (etree.ParserError, ValueError):
+            # Empty or truncated 200 body
+            reason = "unparsable"
+        STATS.add_wasted(source, perf_counter() - start)
+
+    start = perf_counter()
+    page_source = browser_fetch(url)
+    STATS.record(source, "browser", perf_counter() - start, reason)
+    return page_source, "browser", None
@@ -3,7 +3,16 @@ from pathlib import Path
 from datetime import datetime
 import calendar
 import pandas as pd
-import subprocess
+import hashlib
+import json
+from storage import load_frame
+from catalog import CATALOG
+from records import to_number
+from render import predictions_shell, index_page
+from metrics import METRICS, profiled
+from publisher import PUBLISHER
+import aggregates
+import warehouse
 
 # ----------------- Configuration -----------------
 SCRIPT_DIR = Path(__file__).parent.resolve()
@@ -11,17 +20,24 @@ today = datetime.now()
 today_day = today.day
 today_day = int(today_day)
 today_str = today.strftime("%Y-%m-%d")
+# Records what each day's page was built from, so unchanged days are skipped
+MANIFEST_PATH = SCRIPT_DIR / ".build_manifest.json"
+# Month-level list of the published days and per-source stats, as JSON for clients of the
+# site (index.html is static links built from the same entries and does not read it)
+MONTH_INDEX_PATH = SCRIPT_DIR / f"{today.strftime('%Y-%m')}_index.json"
+# Shared by every day page; each page links to it relative to its own folder
+SCRIPT_PATH = SCRIPT_DIR / "predictions.js"
 
-# Helper: get folder path for a given day number
+def month_day(day_num):
+    return today.date().replace(day=day_num)
+
+# Helper: get folder path for a given day number (top-level YYYY-MM-DD or the YYYY/MM/ archive)
 def get_day_folder(day_num):
-    folder_name = today.strftime("%Y-%m") + f"-{day_num:02d}"
-    return SCRIPT_DIR / folder_name
+    return CATALOG.folder(month_day(day_num))
 
 # Helper: get save path for a source/file name
 def get_save_path(day_num, file_name):
-    day_folder = get_day_folder(day_num)
-    os.makedirs(day_folder, exist_ok=True)
-    return day_folder / file_name
+    return CATALOG.folder(month_day(day_num), create=True) / file_name
 
 # ----------------- Month Info -----------------
 def get_month_info():
@@ -29,190 +45,235 @@ def get_month_info():
     _, num_days = calendar.monthrange(today.year, today.month)
     return month_name, num_days
 
-# ----------------- HTML Table Row -----------------
-def create_html_table_row(row):
-    fixture = row.get('Fixture', 'N/A')
-    pick = row.get('Pick', 'N/A')
-    def format_conf(value):
-        if pd.isna(value) or str(value).strip() == '':
-            return '<td class="px-6 py-4 text-center text-gray-400">N/A</td>'
-        value = round(int(value))
-        s = str(value).strip()
-        return f'<td class="px-6 py-4 text-center font-semibold text-blue-600">{s if s.endswith("%") else s+"%"}</td>'
-    def format_odds(value):
-        if pd.isna(value) or str(value).strip() == '':
-            return '<td class="px-6 py-4 text-center text-gray-400">N/A</td>'
-        s = str(value).strip()
-        return f'<td class="px-6 py-4 text-center font-semibold text-green-600">{value}</td>'
-    return f"""
-    <tr class="bg-white border-b hover:bg-gray-50 transition-colors duration-150">
-        <td class="px-6 py-4 font-medium text-gray-900 whitespace-nowrap">{fixture}</td>
-        <td class="px-6 py-4">{pick}</td>
-        {format_conf(row.get('AI_Confidence'))}
-        {format_conf(row.get('OLBG_Confidence'))}
-        {format_conf(row.get('Oddspedia_Confidence'))}
-        {format_odds(row.get('Odds'))}
-        {format_odds(row.get('Result'))}
-    </tr>
+# ----------------- Build Manifest -----------------
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# Pages must also be rebuilt when this generator or the templates change
+GENERATOR_HASH = hashlib.sha256((file_sha256(__file__) + file_sha256(SCRIPT_DIR / "render.py")).encode()).hexdigest()
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("generator") == GENERATOR_HASH:
+            return manifest
+        print("ℹ️  Generator changed since last build, rebuilding all days.")
+    except (FileNotFoundError, ValueError):
+        pass
+    return {"generator": GENERATOR_HASH, "days": {}, "index": []}
+
+def save_manifest(manifest):
+    tmp = MANIFEST_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+def source_fingerprint(path, previous=None):
     """
+    (mtime, size, sha256) of a source file. The hash is only recomputed when
+    mtime/size differ from the previous build, so unchanged days cost one stat().
+    """
+    stat = path.stat()
+    if previous and previous.get("mtime") == stat.st_mtime and previous.get("size") == stat.st_size:
+        return previous
+    return {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": file_sha256(path)}
+
+def day_needs_build(manifest, day_num):
+    """Returns (needs_build, fingerprint) for a day's combined confidence sheet."""
+    day = month_day(day_num)
+    sheet = CATALOG.find_frame(day, f"{day_num:02d}_combined_confidence.xlsx")
+    if sheet is None:
+        return False, None
+    key = get_day_folder(day_num).name
+    previous = manifest["days"].get(key)
+    fingerprint = source_fingerprint(sheet, previous)
+    changed = previous is None or previous.get("sha256") != fingerprint["sha256"]
+    missing = CATALOG.artifact(day, "predictions.html") is None or CATALOG.artifact(day, "predictions.json") is None
+    return changed or missing, fingerprint
 
-# ----------------- Generate Daily HTML -----------------
+# ----------------- Day Data -----------------
+def _text(value):
+    return None if pd.isna(value) or str(value).strip() == "" else str(value)
+
+def _confidence(value):
+    number = to_number(value)
+    return None if number is None else int(number)
+
+# (sheet column, JSON value) in the row order predictions.js reads
+DATA_COLUMNS = [
+    ("Fixture", _text), ("Pick", _text), ("AI_Confidence", _confidence), ("OLBG_Confidence", _confidence),
+    ("Oddspedia_Confidence", _confidence), ("Odds", to_number), ("Result", _text),
+]
+
+def day_data(df):
+    """The combined confidence sheet as compact JSON: one array per row, blanks as null."""
+    columns = [[convert(v) for v in (df[name].tolist() if name in df.columns else [None] * len(df))]
+               for name, convert in DATA_COLUMNS]
+    return {"columns": [name for name, _ in DATA_COLUMNS], "rows": [list(row) for row in zip(*columns)]}
+
+def write_if_changed(path, content):
+    """Writes `content` unless the file already holds it. Returns True if it wrote."""
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_text(content, encoding="utf-8")
+    return True
+
+# ----------------- Generate Daily Page -----------------
+@METRICS.instrument("html", day_key=lambda day_num: month_day(day_num).isoformat(), day_arg="day_num")
 def generate_html_file(day_num):
+    """
+    Writes the day's DD_predictions.json, and its page if the page is missing or
+    outdated. The page holds no rows: predictions.js loads them from the JSON.
+    """
     excel_file = get_save_path(day_num, f"{day_num:02d}_combined_confidence.xlsx")
     html_file = get_save_path(day_num, f"{day_num:02d}_predictions.html")
+    json_file = get_save_path(day_num, f"{day_num:02d}_predictions.json")
 
-    if not excel_file.exists():
+    if CATALOG.find_frame(month_day(day_num), excel_file.name) is None:
         print(f"Skipping {excel_file}: file not found.")
         return
 
     try:
-        df = pd.read_excel(excel_file)
+        df = load_frame(excel_file)
     except Exception as e:
         print(f"Error reading {excel_file}: {e}")
         return
 
-    rows_html = "".join(create_html_table_row(row) for _, row in df.iterrows())
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Predictions for {day_num:02d}</title>
-<script src="https://cdn.tailwindcss.com"></script>
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-</head>
-<body class="bg-gray-100 text-gray-800 flex flex-col">
-<div class="container mx-auto p-4 sm:p-6 lg:p-8 flex-grow">
-<header class="text-center mb-8 bg-white p-6 rounded-xl shadow-md">
-<h1 class="text-3xl sm:text-4xl font-extrabold text-indigo-700">Football Predictions {day_num:02d}</h1>
-</header>
-<div class="bg-white rounded-xl shadow-lg overflow-hidden">
-<div class="overflow-x-auto">
-<table class="w-full text-sm text-left text-gray-600">
-<thead class="text-xs text-gray-700 uppercase bg-indigo-50/70 border-b border-indigo-200">
-<tr>
-<th scope="col" class="px-6 py-3 font-bold text-indigo-800">Fixture</th>
-<th scope="col" class="px-6 py-3 font-bold text-indigo-800">Pick</th>
-<th scope="col" class="px-6 py-3 text-center font-bold text-indigo-800">AI Confidence</th>
-<th scope="col" class="px-6 py-3 text-center font-bold text-indigo-800">OLBG Confidence</th>
-<th scope="col" class="px-6 py-3 text-center font-bold text-indigo-800">Oddspedia Confidence</th>
-<th scope="col" class="px-6 py-3 text-center font-bold text-indigo-800">Odds</th>
-<th scope="col" class="px-6 py-3 text-center font-bold text-indigo-800">Result</th>
-</tr>
-</thead>
-<tbody>
-{rows_html if rows_html else '<tr><td colspan="5" class="text-center p-8 text-gray-500">No data found.</td></tr>'}
-</tbody>
-</table>
-</div>
-</div>
-</div>
-</body>
-</html>
-"""
-    with open(html_file, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print(f"Generated {html_file}")
+    data = day_data(df)
+    stage = METRICS.current()
+    stage.rows_in, stage.rows_out = len(df), len(data["rows"])
+    if write_if_changed(json_file, json.dumps(data, ensure_ascii=False, separators=(",", ":"))):
+        print(f"Generated {json_file}")
+    page = predictions_shell(title=f"Predictions for {day_num:02d}", heading=f"Football Predictions {day_num:02d}",
+                             data=json_file.name, script=CATALOG.url(SCRIPT_PATH, start=html_file.parent))
+    if write_if_changed(html_file, page):
+        print(f"Generated {html_file}")
+    return html_file
+
+# ----------------- Month Index -----------------
+def month_entries():
+    """One entry per published day of the month: its page, its data file and pick counts."""
+    entries = []
+    for day in CATALOG.days(today.year, today.month):
+        if day.day > today_day:
+            continue
+        json_file = CATALOG.artifact(day, "predictions.json")
+        html_file = CATALOG.artifact(day, "predictions.html")
+        if json_file is None or html_file is None:
+            continue
+        with open(json_file, encoding="utf-8") as f:
+            results = [row[-1] for row in json.load(f)["rows"]]
+        entries.append({
+            "day": day.isoformat(),
+            # relative paths for GitHub Pages
+            "page": CATALOG.url(html_file),
+            "data": CATALOG.url(json_file),
+            "picks": len(results),
+            "won": results.count("✓"),
+            "lost": results.count("X"),
+        })
+    return entries
+
+def month_stats(month=None):
+    """Per-source month summary from the warehouse's precomputed stats ([] without a warehouse)."""
+    if not warehouse.DB_PATH.exists():
+        return []
+    conn = warehouse.connect(warehouse.DB_PATH)
+    try:
+        return aggregates.summaries(conn, "month", month or today.strftime("%Y-%m"))
+    finally:
+        conn.close()
+
+def generate_month_index(entries):
+    """Writes the month manifest; returns its path if it changed, else None."""
+    content = json.dumps({"month": today.strftime("%Y-%m"), "days": entries, "stats": month_stats()},
+                         ensure_ascii=False, indent=1)
+    if write_if_changed(MONTH_INDEX_PATH, content):
+        print(f"Generated {MONTH_INDEX_PATH}")
+        return MONTH_INDEX_PATH
+    return None
 
 # ----------------- Generate Index -----------------
-def generate_index_file():
+@METRICS.instrument("index")
+def generate_index_file(entries=None):
     month_name, num_days = get_month_info()
-    button_html = ""
-
-    for day in range(1, today_day + 1):
-        day_folder = get_day_folder(day)
-        html_file = day_folder / f"{day:02d}_predictions.html"
-        if html_file.exists():
-            # relative path for GitHub Pages
-            relative_path = f"{day_folder.name}/{html_file.name}"
-            button_html += f"""
-<a href="{relative_path}" class="w-full py-4 px-6 bg-green-600 hover:bg-green-700 text-white font-bold text-lg rounded-xl shadow-lg transition duration-300 transform hover:scale-[1.03] text-center">
-View {month_name} {day:02d} Predictions
-</a>
-"""
-
-    index_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{month_name} Predictions Dashboard</title>
-<script src="https://cdn.tailwindcss.com"></script>
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-<style>body{{font-family:'Inter',sans-serif;background:#eef2f6;}}</style>
-</head>
-<body class="min-h-screen flex items-center justify-center p-4">
-<div class="w-full max-w-5xl bg-white shadow-2xl rounded-3xl p-8 md:p-12 border border-gray-100">
-<header class="text-center mb-10">
-<h1 class="text-5xl font-extrabold text-gray-900 mb-3">Forecasts for {month_name}</h1>
-<p class="text-xl text-gray-600">Select a day below to view its detailed forecast.</p>
-</header>
-<div class="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
-{button_html if button_html else '<p class="text-center col-span-full text-gray-500 text-xl py-8">No prediction files found.</p>'}
-</div>
-<footer class="mt-12 text-center text-sm text-gray-500 pt-6 border-t border-gray-100">
-Run the script to generate missing day files.
-</footer>
-</div>
-</body>
-</html>
-"""
+    if entries is None:
+        entries = month_entries()
+    links = [(e["page"], f"View {month_name} {e['day'][-2:]} Predictions ({e['picks']} picks)") for e in entries]
+
+    index_content = index_page(month_name, links)
+    METRICS.current().rows_out = len(links)
     index_path = SCRIPT_DIR / "index.html"
     with open(index_path, "w", encoding="utf-8") as f:
         f.write(index_content)
     print(f"Generated {index_path}")
+    return index_path
 
 # ----------------- Git Push -----------------
-# ----------------- Git Push -----------------
-def push_to_github():
-    """Pushes all generated files and folders to GitHub safely (UTF-8 safe for Windows)."""
+@METRICS.instrument("publish")
+def push_to_github(paths=None, wait=False):
+    """
+    Publishes the generated files: only `paths` are staged (never the whole tree).
+    The commit and push run in the background (publisher.py); runs that publish
+    close together share one commit, and a failed push is retried next run.
+    """
     print("\n🚀 Starting Git push process...")
+    paths = list(paths or [])
+    METRICS.current().rows_in = len(paths)
+    PUBLISHER.publish(paths, wait=wait)
 
-    try:
-        # Force UTF-8 for stdout/stderr decoding to avoid cp1252 errors
-        env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
-
-        # Stage all changes
-        subprocess.run(["git", "add", "."], check=True, capture_output=True, text=True, env=env)
-        print("✅ Git: Added all modified and new files.")
-
-        # Check if anything is staged
-        diff_check = subprocess.run(["git", "diff", "--cached", "--exit-code"],
-                                    capture_output=True, text=True, env=env)
-        if diff_check.returncode == 0:
-            print("ℹ️  Git: No new changes to commit.")
-            return
-
-        # Commit changes
-        commit_msg = f"Auto-update predictions and index for {datetime.now().strftime('%Y-%m-%d')}"
-        subprocess.run(["git", "commit", "-m", commit_msg], check=True, capture_output=True, text=True, env=env)
-        print(f"✅ Git: Committed changes with message: '{commit_msg}'")
-
-        # Push to remote
-        subprocess.run(["git", "push", "origin", "main"], check=True, capture_output=True, text=True, env=env)
-        print("🎉 Git: Successfully pushed all updated files and folders to GitHub.")
-
-    except subprocess.CalledProcessError as e:
-        print("❌ Git command failed!")
-        print(f"Command: {e.cmd}")
-        print(f"Return code: {e.returncode}")
-        print(f"Output:\n{e.stdout}")
-        print(f"Error Output:\n{e.stderr}")
-    except FileNotFoundError:
-        print("❌ Git not found. Please ensure Git is installed and added to PATH.")
-    except Exception as e:
-        print(f"❌ Unexpected error during Git push: {e}")
+# ----------------- Build -----------------
+def build_day(manifest, day_num):
+    """
+    Rebuilds one day's JSON/page if its combined sheet changed since the last build.
+    Returns the day's JSON and page if they were rebuilt (to be published), else [].
+    """
+    needs_build, fingerprint = day_needs_build(manifest, day_num)
+    if fingerprint is None:
+        return []
+    html_file = generate_html_file(day_num) if needs_build else None
+    if needs_build and html_file is None:
+        return []  # not recorded, so the next run retries it
+    manifest["days"][get_day_folder(day_num).name] = fingerprint
+    return [html_file.with_suffix(".json"), html_file] if needs_build else []
 
+def build_index():
+    """Month manifest and index.html, only when a day's picks or results changed. Returns changed paths."""
+    entries = month_entries()
+    month_index = generate_month_index(entries)
+    if month_index is None and (SCRIPT_DIR / "index.html").exists():
+        return []
+    return ([month_index] if month_index is not None else []) + [generate_index_file(entries)]
+
+def build_site(manifest=None):
+    """Every changed day of the month, then the index. Returns the paths to publish."""
+    manifest = manifest or load_manifest()
+    changed_paths = []
+    # Generate pages only for days whose combined confidence sheet changed
+    for day in CATALOG.days(today.year, today.month):
+        if day.day > today_day:
+            continue
+        changed_paths += build_day(manifest, day.day)
+    print(f"Rebuilt {len(changed_paths) // 2} day(s).")
+    changed_paths += build_index()
+    save_manifest(manifest)
+    return changed_paths
 
 # ----------------- Main -----------------
 if __name__ == "__main__":
-    month_name, num_days = get_month_info()
-    # Generate HTML for all days from 1st to today
-    for day in range(1, today_day + 1):
-        generate_html_file(day)
-    # Generate index in root folder
-    generate_index_file()
-    # Push index to GitHub
-    push_to_github()
+    run_folder = get_day_folder(today_day)
+    # PROFILE=1 also writes a cProfile dump of the build
+    with profiled(run_folder / f"{today_day:02d}_build_profile.pstats"):
+        # Push only the changed artifacts to GitHub
+        push_to_github(build_site())
+    # Per-stage time, rows and memory -> DD_metrics.json in each day folder
+    METRICS.report()
+    METRICS.save(CATALOG.folder, today_str)
@@ -0,0 +1,51 @@
+import os
+import json
+from pathlib import Path
+from datetime import datetime
+
+# ----------------- Corpus Layout -----------------
+# Captured pages live next to the day's Excel outputs:
+#   YYYY-MM-DD/corpus/<source>_<HHMMSS>.html   raw driver.page_source
+#   YYYY-MM-DD/corpus/<source>_<HHMMSS>.json   {"source", "url", "day", "captured_at", "rows"}
+# `source` is one of the keys of page_parser.SOURCES.
+CORPUS_DIR_NAME = "corpus"
+
+def save_page(day_folder, source, url, page_source, day=None, rows=None):
+    """Stores one captured page plus its metadata. Returns the .html path."""
+    corpus_dir = Path(day_folder) / CORPUS_DIR_NAME
+    os.makedirs(corpus_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%H%M%S")
+    html_path = corpus_dir / f"{source}_{stamp}.html"
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(page_source)
+    meta = {
+        "source": source,
+        "url": url,
+        "day": day,
+        "captured_at": datetime.now().isoformat(timespec="seconds"),
+        # Row count the live scrape produced, used by the benchmark to flag selector regressions
+        "rows": rows,
+    }
+    with open(html_path.with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return html_path
+
+def load_page(html_path):
+    """Returns (page_source, meta) for a captured page. Missing metadata is inferred from the file name."""
+    html_path = Path(html_path)
+    with open(html_path, encoding="utf-8") as f:
+        page_source = f.read()
+    meta_path = html_path.with_suffix(".json")
+    if meta_path.exists():
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    else:
+        meta = {"source": html_path.stem.rsplit("_", 1)[0], "url": None, "day": None,
+                "captured_at": None, "rows": None}
+    meta["path"] = str(html_path)
+    return page_source, meta
+
+def iter_corpus(root="."):
+    """Yields the .html path of every captured page under any */corpus/ folder below root."""
+    for html_path in sorted(Path(root).rglob(f"{CORPUS_DIR_NAME}/*.html")):
+        yield html_path
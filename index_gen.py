@@ -2,7 +2,9 @@ import os
 import datetime
 import calendar
 from datetime import datetime
-import subprocess # NEW: Required to run external commands like 'git'
+from catalog import CATALOG
+from publisher import PUBLISHER
+from render import index_page
 today_folder = datetime.now().strftime("%Y-%m-%d")
 def get_save_path(source_name):
     os.makedirs(today_folder, exist_ok=True)
@@ -90,96 +92,27 @@ def generate_index_file():
     Only creates buttons for day files that already exist.
     """
     month_name, num_days = get_month_info()
-    button_html = ""
+    now = datetime.now()
+    links = []
     
-    # Iterate through every possible day in the current month
-    for day_num in range(1, num_days + 1):
-        day_str = f"{day_num:02d}"
-        filename = f"{day_str}_predictions.html"
-        filename = os.path.join(today_folder, f"{filename}")
-        
+    # Only the days that have a folder (from the catalog's cached directory index)
+    for day in CATALOG.days(now.year, now.month):
         # CHECK 2: Only create a button if the prediction file already exists
-        if os.path.exists(filename):
-            button_html += f"""
-        <a href="{filename}" class="w-full py-4 px-6 bg-green-600 hover:bg-green-700 text-white font-bold text-lg rounded-xl shadow-lg transition duration-300 transform hover:scale-[1.03] focus:outline-none focus:ring-4 focus:ring-green-300 text-center">
-            View {month_name} {day_num} Predictions
-        </a>
-"""
+        page = CATALOG.artifact(day, "predictions.html")
+        if page is not None:
+            links.append((CATALOG.url(page), f"View {month_name} {day.day} Predictions"))
 
-    index_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{month_name} Predictions Dashboard</title>
-    <!-- Load Tailwind CSS -->
-    <script src="https://cdn.tailwindcss.com"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        body {{ font-family: 'Inter', sans-serif; background-color: #eef2f6; }}
-    </style>
-</head>
-<body class="min-h-screen flex items-center justify-center p-4">
-    <!-- Main Card Container -->
-    <div class="w-full max-w-5xl bg-white shadow-2xl rounded-3xl p-8 md:p-12 border border-gray-100">
-        <header class="text-center mb-10">
-            <h1 class="text-5xl font-extrabold text-gray-900 mb-3">Forecasts for {month_name}</h1>
-            <p class="text-xl text-gray-600">Select a day below to view its detailed forecast.</p>
-        </header>
-        
-        <!-- Responsive Button Grid (4 columns for desktop, 2 for tablet, 1 for mobile) -->
-        <div class="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
-            {button_html if button_html else '<p class="text-center col-span-full text-gray-500 text-xl py-8">No prediction files found for this month.</p>'}
-        </div>
-        
-        <footer class="mt-12 text-center text-sm text-gray-500 pt-6 border-t border-gray-100">
-            Run the script to generate missing day files.
-        </footer>
-    </div>
-</body>
-</html>
-"""
+    # Shared with github.py: names are escaped by the template
+    index_content = index_page(month_name, links)
     # Specify UTF-8 encoding to prevent UnicodeEncodeError
     with open("index.html", "w", encoding="utf-8") as f:
         f.write(index_content.strip())
     print("Generated index.html")
 
 def push_to_github():
-    """Automatically adds, commits, and pushes generated files to GitHub."""
+    """Queues index.html for the batched background commit and push (see publisher.py)."""
     print("\nStarting Git push process...")
-    
-    try:
-        # 1. Add all changes (index.html and any new/modified daily files)
-        subprocess.run(["git", "add", "index.html"], check=True, capture_output=True, text=True)
-        print("Git: Staged index.html.")
-        
-        # 2. Commit changes with a date-stamped message
-        today = datetime.now()
-        commit_message = f"Auto-generated index file update {today}"
-        
-        # Check if there's anything to commit before attempting the commit
-        result = subprocess.run(["git", "diff", "--cached", "--exit-code"], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("Git: No changes to commit.")
-            return
-
-        subprocess.run(["git", "commit", "-m", commit_message], check=True, capture_output=True, text=True)
-        print(f"Git: Committed changes: '{commit_message}'")
-        
-        # 3. Push to remote (assuming 'origin' remote and 'main' branch)
-        subprocess.run(["git", "push", "origin", "main"], check=True, capture_output=True, text=True)
-        print("Git: Successfully pushed to GitHub.")
-
-    except subprocess.CalledProcessError as e:
-        print(f"\nERROR: Git command failed.")
-        print(f"Command '{e.cmd}' returned non-zero exit status {e.returncode}.")
-        print("Please ensure you have Git installed, are in a Git repository, and are logged in to push.")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-    except FileNotFoundError:
-        print("\nERROR: Git executable not found. Please ensure Git is installed and in your system's PATH.")
-
+    PUBLISHER.publish(["index.html"])
 
 def main():
     month_name, num_days = get_month_info()
@@ -0,0 +1,212 @@
+import re
+import pandas as pd
+from team_resolver import normalize_team, same_club, likely_same, split_fixture, parse_match_date
+from records import AiTip, Tip, from_frame
+
+# ----------------- Tokens -----------------
+NOISE_WORDS = r'\b(fc|utd|united|city|ac|cf|sc|tsv|sv|fk|sk|draw|the|and|or|of|a|an)\b'
+
+def get_match_tokens(name):
+    """Extracts significant, clean, lowercase words for comparison."""
+    if pd.isna(name):
+        return set()
+    name = str(name).lower()
+    # Remove common, noisy words that often appear in picks/fixtures
+    name = re.sub(NOISE_WORDS, ' ', name)
+    # Remove non-alphanumeric characters, then split into words
+    words = re.sub(r'[^a-z0-9\s]', ' ', name).split()
+    # Filter out very short words that are likely generic
+    return {word for word in words if len(word) > 2}
+
+# ----------------- Inverted Index -----------------
+GRAM = 3
+
+class PickIndex:
+    """
+    Trigram inverted index over one source's lowercase pick texts.
+
+    first_match(tokens) returns the position of the first text that contains any
+    token as a substring -- the same answer as scanning
+    `texts.apply(lambda x: any(token in x for token in tokens))` and taking iloc[0],
+    but each token only verifies the few rows sharing all of its trigrams.
+    """
+
+    def __init__(self, texts):
+        self.texts = [str(t) for t in texts]
+        self.grams = {}
+        for row_id, text in enumerate(self.texts):
+            for i in range(len(text) - GRAM + 1):
+                self.grams.setdefault(text[i:i + GRAM], set()).add(row_id)
+        self._token_cache = {}
+
+    def _first_for_token(self, token):
+        if token in self._token_cache:
+            return self._token_cache[token]
+        if len(token) < GRAM:
+            # Too short to index: fall back to a scan (never hit with get_match_tokens output)
+            candidates = range(len(self.texts))
+        else:
+            postings = []
+            for i in range(len(token) - GRAM + 1):
+                rows = self.grams.get(token[i:i + GRAM])
+                if rows is None:
+                    self._token_cache[token] = None
+                    return None
+                postings.append(rows)
+            postings.sort(key=len)
+            candidates = sorted(set.intersection(*postings))
+        found = next((row_id for row_id in candidates if token in self.texts[row_id]), None)
+        self._token_cache[token] = found
+        return found
+
+    def first_match(self, tokens):
+        best = None
+        for token in tokens:
+            row_id = self._first_for_token(token)
+            if row_id is not None and (best is None or row_id < best):
+                best = row_id
+        return best
+
+# ----------------- Fixture Index -----------------
+def pick_side(pick, home, away):
+    """'home' / 'away' when the pick names one of the fixture's teams, else None ("Draw No Bet: X" counts)."""
+    key = normalize_team(re.sub(r"^[^:]*:\s*", "", str(pick)))
+    if same_club(key, normalize_team(home)):
+        return "home"
+    if same_club(key, normalize_team(away)):
+        return "away"
+    return None
+
+class FixtureIndex:
+    """
+    One source's picks keyed by resolved team ids.
+    A match needs the same fixture, the same picked side and kick-off dates at most
+    a day apart (OLBG times are UTC). If only one team id matches, the other team is
+    accepted when both dates are known (a team plays once per day) or its name passes
+    a looser check. Only a name match teaches the resolver a new alias, and no alias
+    that already points to another team is overwritten.
+    """
+
+    def __init__(self, fixtures, picks, times, resolver, year):
+        self.resolver = resolver
+        self.by_home = {}
+        self.by_away = {}
+        for row_id, (fixture, pick, when) in enumerate(zip(fixtures, picks, times)):
+            teams = split_fixture(fixture)
+            if teams is None:
+                continue
+            side = pick_side(pick, *teams)
+            if side is None:
+                continue
+            entry = {
+                "row_id": row_id, "date": parse_match_date(when, year), "side": side,
+                "home": teams[0], "away": teams[1],
+                "home_id": resolver.resolve(teams[0]), "away_id": resolver.resolve(teams[1]),
+            }
+            self.by_home.setdefault(entry["home_id"], []).append(entry)
+            self.by_away.setdefault(entry["away_id"], []).append(entry)
+
+    def first_match(self, home, away, when, side):
+        home_id, away_id = self.resolver.resolve(home), self.resolver.resolve(away)
+        best = None
+        confirmed = False
+        # (entries sharing the anchored team, the other side's name/id keys)
+        for entries, other, other_name in ((self.by_home.get(home_id, ()), "away", away),
+                                           (self.by_away.get(away_id, ()), "home", home)):
+            for entry in entries:
+                if entry["side"] != side or (best is not None and entry["row_id"] >= best["row_id"]):
+                    continue
+                dated = when is not None and entry["date"] is not None
+                if dated and abs((when - entry["date"]).days) > 1:
+                    continue
+                other_id = away_id if other == "away" else home_id
+                named = entry[f"{other}_id"] == other_id or likely_same(
+                    normalize_team(entry[other]), normalize_team(other_name))
+                if named or dated:
+                    best, confirmed = entry, named
+        if best is None:
+            return None
+        # Both teams agree by name: remember the source's spellings for next time.
+        # A match on one team and the date is used, but teaches no alias.
+        if confirmed:
+            self.resolver.link(best["home"], home_id)
+            self.resolver.link(best["away"], away_id)
+        return best["row_id"]
+
+# ----------------- Comparison -----------------
+def ai_keys(ai_records, resolver=None, year=None):
+    """
+    Normalize stage: yields (record, tokens, fixture key) per AI Goalie record.
+    The fixture key (home, away, date, side) is only built when a resolver is used.
+    """
+    for record in ai_records:
+        ai_key = None
+        if resolver is not None:
+            teams = split_fixture(record.fixture)
+            side = pick_side(record.pick, *teams) if teams else None
+            if side is not None:
+                ai_key = (teams[0], teams[1], parse_match_date(record.date, year), side)
+        yield record, get_match_tokens(record.pick), ai_key
+
+def _index(tips, resolver, year):
+    if resolver is not None:
+        return FixtureIndex([t.fixture for t in tips], [t.pick for t in tips],
+                            [t.time for t in tips], resolver, year)
+    return PickIndex(str(t.pick).lower() for t in tips)
+
+def iter_comparison(ai_records, olbg_tips, oddspedia_tips, resolver=None, year=None):
+    """
+    Match stage: streams one comparison dict per AiTip that OLBG or Oddspedia also
+    picked. The other two sources (lists of Tip) are small and are indexed up front;
+    the AI records are consumed lazily.
+    """
+    olbg_tips, oddspedia_tips = list(olbg_tips), list(oddspedia_tips)
+    olbg_index = _index(olbg_tips, resolver, year)
+    oddspedia_index = _index(oddspedia_tips, resolver, year)
+
+    def lookup(index, ai_tokens, ai_key):
+        if resolver is None:
+            return index.first_match(ai_tokens)
+        return None if ai_key is None else index.first_match(*ai_key)
+
+    for record, ai_tokens, ai_key in ai_keys(ai_records, resolver, year):
+        olbg_confidence = None
+        oddspedia_confidence = None
+        result = None
+        odds = None
+        if record.result:
+            result = record.result
+
+        # --- Check OLBG --- (first OLBG pick for the same fixture/side, or containing any AI token)
+        row_id = lookup(olbg_index, ai_tokens, ai_key)
+        if row_id is not None:
+            olbg_confidence = olbg_tips[row_id].confidence
+            odds = olbg_tips[row_id].odds
+
+        # --- Check Oddspedia ---
+        row_id = lookup(oddspedia_index, ai_tokens, ai_key)
+        if row_id is not None:
+            oddspedia_confidence = oddspedia_tips[row_id].confidence
+            odds = oddspedia_tips[row_id].odds
+
+        # Only keep picks that at least one other source also has
+        if olbg_confidence is not None or oddspedia_confidence is not None:
+            yield {
+                "Fixture": record.fixture,
+                "Pick": record.pick,
+                "AI_Confidence": record.win,
+                "OLBG_Confidence": olbg_confidence,
+                "Oddspedia_Confidence": oddspedia_confidence,
+                "Odds": odds,
+                "Result": result
+            }
+
+def build_comparison(df_ai, df_olbg, df_oddspedia, resolver=None, year=None):
+    """
+    Matches every AI Goalie pick against OLBG and Oddspedia picks.
+    With a TeamResolver, picks match on the resolved fixture + picked side + date;
+    without one, on the legacy pick-text token overlap.
+    Returns the list of comparison dicts used for the combined confidence sheet.
+    """
+    return list(iter_comparison(from_frame(df_ai, AiTip), from_frame(df_olbg, Tip),
+                                from_frame(df_oddspedia, Tip), resolver, year))
@@ -0,0 +1,218 @@
+import os
+import json
+import cProfile
+import threading
+import functools
+import inspect
+import tracemalloc
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from collections import Counter
+
+# ----------------- Configuration -----------------
+# METRICS=0 turns the instrumentation off (decorated functions run untouched)
+METRICS_ENABLED = os.environ.get("METRICS", "1") != "0"
+# METRICS_MEMORY=1 adds the peak memory of each stage, via tracemalloc. Off by default:
+# tracing slows every allocation. It only runs while a stage does.
+TRACE_MEMORY = os.environ.get("METRICS_MEMORY", "0") == "1"
+# PROFILE=1 (or --profile) also writes a cProfile dump of the run next to the metrics
+PROFILE = os.environ.get("PROFILE", "0") == "1"
+
+# ----------------- Stages -----------------
+class Stage:
+    """Counters for one run of one pipeline stage (a scraper, the comparison, a page build...)."""
+
+    def __init__(self, name, day=None):
+        self.name = name
+        self.day = day
+        self.seconds = None
+        self.rows_in = None
+        self.rows_out = None
+        self.skipped = Counter()          # reason -> rows
+        self.webdriver_calls = Counter()  # WebDriver command -> calls
+        self.peak_mb = None
+        self.status = "ok"
+
+    def skip(self, reason, rows=1):
+        """Counts rows dropped for `reason` (a string, or the exception that dropped them)."""
+        if isinstance(reason, BaseException):
+            reason = type(reason).__name__
+        self.skipped[reason] += rows
+
+    def as_dict(self):
+        return {
+            "seconds": None if self.seconds is None else round(self.seconds, 3),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "skipped": dict(self.skipped),
+            "webdriver_calls": sum(self.webdriver_calls.values()),
+            "webdriver_commands": dict(self.webdriver_calls),
+            "peak_mb": self.peak_mb,
+            "status": self.status,
+            "finished": datetime.now().isoformat(timespec="seconds"),
+        }
+
+class RunMetrics:
+    """
+    Collects a Stage per instrumented call. The current stage is per thread, so the
+    parallel scrapers (one thread each) count their own rows and WebDriver calls.
+    Peak memory is process wide: stages that overlap in time report the same peak.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stages = []
+        self.active = 0
+        self.tracing = False  # tracemalloc was started here, so it is stopped here too
+
+    def current(self):
+        """The calling thread's stage; a throwaway one outside any stage, so callers need no checks."""
+        return getattr(self.local, "stage", None) or Stage("untracked")
+
+    @contextmanager
+    def stage(self, name, day=None):
+        stage = Stage(name, day)
+        previous = getattr(self.local, "stage", None)
+        self.local.stage = stage
+        with self.lock:
+            if TRACE_MEMORY:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self.tracing = True
+                elif self.active == 0:
+                    tracemalloc.reset_peak()
+            self.active += 1
+        start = perf_counter()
+        try:
+            yield stage
+        except BaseException as e:
+            stage.status = f"error: {type(e).__name__}"
+            raise
+        finally:
+            stage.seconds = perf_counter() - start
+            with self.lock:
+                self.active -= 1
+                if TRACE_MEMORY and tracemalloc.is_tracing():
+                    stage.peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+                if self.active == 0 and self.tracing:
+                    tracemalloc.stop()
+                    self.tracing = False
+                self.stages.append(stage)
+            self.local.stage = previous
+
+    def instrument(self, name, day_key=None, day_arg="day"):
+        """
+        Decorator: runs the function inside stage `name`. `day_key(value)` turns the
+        function's `day_arg` argument into the day folder name the metrics are saved
+        under. rows_out defaults to len() of the return value.
+        """
+        def decorate(func):
+            if not METRICS_ENABLED:
+                return func
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                day = None
+                if day_key is not None:
+                    bound = signature.bind_partial(*args, **kwargs)
+                    if day_arg in bound.arguments:
+                        day = day_key(bound.arguments[day_arg])
+                with self.stage(name, day) as stage:
+                    result = func(*args, **kwargs)
+                    if stage.rows_out is None:
+                        try:
+                            stage.rows_out = len(result)
+                        except TypeError:
+                            pass
+                    return result
+            return wrapper
+        return decorate
+
+    # ----- WebDriver -----
+    def count_webdriver(self, driver):
+        """
+        Counts every command `driver` sends (page loads, find_element, .text, scripts...)
+        against the calling thread's stage. WebElements go through driver.execute too.
+        """
+        if not METRICS_ENABLED or getattr(driver, "_metrics_counted", False):
+            return driver
+        execute = driver.execute
+
+        def counted(command, params=None):
+            stage = getattr(self.local, "stage", None)
+            if stage is not None:
+                stage.webdriver_calls[command] += 1
+            return execute(command, params)
+
+        driver.execute = counted
+        driver._metrics_counted = True
+        return driver
+
+    # ----- Output -----
+    def save(self, folder_for, default_day):
+        """
+        Merges this run's stages into each day folder's DD_metrics.json (the latest run
+        of a stage replaces the previous one). Stages without a day go to `default_day`.
+        Returns the written paths.
+        """
+        if not METRICS_ENABLED:
+            return []
+        by_day = {}
+        with self.lock:
+            for stage in self.stages:
+                by_day.setdefault(stage.day or default_day, []).append(stage)
+        written = []
+        for day, stages in by_day.items():
+            folder = Path(folder_for(day))
+            folder.mkdir(parents=True, exist_ok=True)
+            path = folder / f"{day[-2:]}_metrics.json"
+            try:
+                with open(path, encoding="utf-8") as f:
+                    report = json.load(f)
+            except (FileNotFoundError, ValueError):
+                report = {"day": day, "stages": {}}
+            for stage in stages:
+                report["stages"][stage.name] = stage.as_dict()
+            report["updated"] = datetime.now().isoformat(timespec="seconds")
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=1, ensure_ascii=False)
+            os.replace(tmp, path)
+            written.append(path)
+        return written
+
+    def report(self):
+        with self.lock:
+            stages = list(self.stages)
+        for stage in stages:
+            skipped = sum(stage.skipped.values())
+            print(f"📊 {stage.name}{f' {stage.day}' if stage.day else ''}: {stage.seconds:.2f}s, "
+                  f"rows {stage.rows_in if stage.rows_in is not None else '-'} -> "
+                  f"{stage.rows_out if stage.rows_out is not None else '-'}"
+                  f"{f', {skipped} skipped' if skipped else ''}"
+                  f"{f', {sum(stage.webdriver_calls.values())} WebDriver calls' if stage.webdriver_calls else ''}"
+                  f"{f', peak {stage.peak_mb} MB' if stage.peak_mb is not None else ''}"
+                  f"{'' if stage.status == 'ok' else f' ({stage.status})'}")
+
+METRICS = RunMetrics()
+
+# ----------------- Profiling -----------------
+@contextmanager
+def profiled(path, enabled=PROFILE):
+    """cProfile dump of the block to `path` (.pstats). Only the calling thread is profiled."""
+    if not enabled:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        print(f"🧪 Profile written to {path} (python -m pstats {path})")
@@ -1,10 +1,10 @@
 import re
 import pandas as pd
 from time import sleep
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from openpyxl import load_workbook
+from browser import browser_session
+from storage import save_frame, average_confidence_cells
 
 data = []
 testas = []
@@ -12,7 +12,10 @@ testas = []
 def olbg_get():
     global data, testas
 
-    driver = webdriver.Chrome()
+    with browser_session() as driver:
+        _olbg_scrape(driver)
+
+def _olbg_scrape(driver):
     driver.get("https://www.olbg.com/betting-tips/Football/1")
     sleep(5)  # wait a bit longer for content
 
@@ -50,18 +53,9 @@ def olbg_get():
             "Fixture", "Pick", "Competition", "Time", "Win Info", "Confidence %", "Comments"
         ])
         save_name = "olbg_fixtures.xlsx"
-        df.to_excel(save_name, index=False)
-
-        wb = load_workbook(save_name)
-        ws = wb.active
-
-        last_row = ws.max_row
-        ws[f"H{last_row+1}"] = f"=AVERAGE(F2:F{last_row})"
-
-        testas.append(ws[f"H{last_row+1}"].value)
-        wb.save(save_name)
+        cells = average_confidence_cells(df)
+        if save_frame(df, save_name, cells=cells):
+            testas.extend(cells.values())
         print(f"✅ Saved {len(data)} matches to {save_name}")
     else:
         print("⚠️ No matches found!")
-
-    driver.quit()
@@ -0,0 +1,222 @@
+import re
+import math
+from lxml import etree, html as lxml_html
+from records import AiTip, Tip
+
+# ----------------- Helpers -----------------
+def has_class(name):
+    """XPath predicate matching an element whose class list contains `name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def load_html(page_source):
+    """
+    Parses a page source once. <br> tags become spaces, like WebDriver's .text joined on whitespace.
+    An already parsed document (e.g. from fetch.fetch_page) is returned as it is.
+    """
+    if isinstance(page_source, etree._Element):
+        return page_source
+    doc = lxml_html.fromstring(page_source)
+    for br in doc.iter("br"):
+        br.tail = " " + (br.tail or "")
+    return doc
+
+def element_text(el):
+    """Whitespace-collapsed text of an element (mirrors WebElement.text.strip())."""
+    if el is None:
+        return ""
+    return " ".join(el.text_content().split())
+
+def first(row, xpath):
+    """First match of an XPath (string or precompiled etree.XPath) or None."""
+    found = xpath(row) if isinstance(xpath, etree.XPath) else row.xpath(xpath)
+    return found[0] if found else None
+
+def text_field(xpath, required=True):
+    """Field extractor returning the text of the first match. Missing required elements raise like find_element."""
+    compiled = etree.XPath(xpath)
+    def extract(row):
+        el = first(row, compiled)
+        if el is None and required:
+            raise LookupError(f"no element for {xpath}")
+        return element_text(el)
+    return extract
+
+def attr_field(xpath, attr, required=True):
+    """Field extractor returning an attribute of the first match."""
+    compiled = etree.XPath(xpath)
+    def extract(row):
+        el = first(row, compiled)
+        if el is None:
+            if required:
+                raise LookupError(f"no element for {xpath}")
+            return None
+        return (el.get(attr) or "").strip()
+    return extract
+
+def extract_cells(row, fields):
+    return {name: extract(row) for name, extract in fields.items()}
+
+# ----------------- AI Goalie -----------------
+AI_GOALIE_ROWS = f"//tr[{has_class('match')}]"
+
+def _nth_td(n):
+    def extract(row):
+        tds = row.xpath("./td")
+        if len(tds) <= n:
+            raise LookupError(f"row has no td[{n}]")
+        return element_text(tds[n])
+    return extract
+
+AI_GOALIE_FIELDS = {
+    "date": text_field(f".//td[{has_class('date')}]"),
+    "home": text_field(f".//*[{has_class('home-team')}]"),
+    "score": text_field(f".//*[{has_class('score')}]"),
+    "away": text_field(f".//*[{has_class('away-team')}]"),
+    "pick": text_field(f".//*[{has_class('home-team')} or {has_class('away-team')}]//u", required=False),
+    "win_percent": _nth_td(4),
+    "result_class": attr_field(f".//td[{has_class('correct')}]//span[{has_class('result-indicator')}]", "class", required=False),
+    "gp": text_field(f".//td[{has_class('gp')}]"),
+}
+
+def ai_goalie_cells(row):
+    """Pulls the raw cell values out of one tr.match element."""
+    return extract_cells(row, AI_GOALIE_FIELDS)
+
+def _goals(expected_goals, total):
+    expected_goals = re.sub(r"[^\d.]", "", expected_goals)
+    if expected_goals:
+        expected_goals = float(expected_goals)
+        goals_pick = math.ceil(expected_goals) + 0.5
+        under = None if total is None else goals_pick > total
+    else:
+        goals_pick = None
+        under = None
+    return expected_goals, goals_pick, under
+
+def ai_goalie_row(cells):
+    """Builds the AiTip used by ai_goalie_get. Raises on rows without a usable score."""
+    home, away, score, pick = cells["home"], cells["away"], cells["score"], cells["pick"]
+    result = ""
+    if cells["result_class"] is not None:
+        if "result-w" in cells["result_class"]:
+            result = "✓"
+        elif "result-l" in cells["result_class"]:
+            result = "X"
+    if pick:
+        if home == pick:
+            home = f"{home} {result}"
+        elif away == pick:
+            away = f"{away} {result}"
+    fixture = f"{home} - {away}: {score}"
+
+    parts = score.split(":")
+    total = int(parts[0]) + int(parts[1])
+
+    expected_goals, goals_pick, under = _goals(cells["gp"], total)
+    return AiTip(cells["date"], fixture, expected_goals, pick,
+                 goals_pick, cells["win_percent"], result, total, under)
+
+def _skip(skipped, reason):
+    """Counts a dropped row under `reason` when the caller passed a Counter (see metrics.Stage.skipped)."""
+    if skipped is not None:
+        skipped[reason if isinstance(reason, str) else type(reason).__name__] += 1
+
+def iter_ai_goalie(page_source, skipped=None):
+    """
+    Single-pass replacement for the per-cell find_element loop.
+    Yields the same AiTip records as the WebDriver path; bad rows are skipped.
+    """
+    doc = load_html(page_source)
+    for row in doc.xpath(AI_GOALIE_ROWS):
+        try:
+            yield ai_goalie_row(ai_goalie_cells(row))
+        except Exception as e:
+            _skip(skipped, e)
+
+def parse_ai_goalie(page_source, skipped=None):
+    return list(iter_ai_goalie(page_source, skipped))
+
+# ----------------- Oddspedia -----------------
+ODDSPEDIA_ROWS = f"//div[{has_class('tip-by-consensus')}]"
+EXCLUSION_KEYWORDS = ["Yes", "Over", "Under", "-", "+", "Draw"]
+
+ODDSPEDIA_FIELDS = {
+    "competition": attr_field(f".//li[{has_class('old-match-breadcrumbs__item')}]//div[{has_class('masked-url')}]", "title"),
+    "home": text_field(f"(.//*[{has_class('match-teams')}]/*[{has_class('match-team')}])[1]//*[{has_class('match-team__name')}]"),
+    "away": text_field(f"(.//*[{has_class('match-teams')}]/*[{has_class('match-team')}])[2]//*[{has_class('match-team__name')}]"),
+    "pick": text_field(f".//*[{has_class('tip-by-consensus__meta')}]"),
+    "odds": text_field(f".//span[{has_class('odd__value')}]"),
+    "time": text_field(f".//*[{has_class('match-date__time')}]", required=False),
+    "win_info": text_field(f".//*[{has_class('tip-by-consensus__bar__meta')}]"),
+    "confidence": text_field(f".//*[{has_class('old-progress-bar__value')}]"),
+}
+
+def oddspedia_row(cells, min_confidence=60):
+    """Builds the Oddspedia Tip, or None if the pick is excluded or under the confidence cut."""
+    pick = cells["pick"].replace("Full Time Result:", "").strip()
+    for keyword in EXCLUSION_KEYWORDS:
+        if keyword in pick:
+            return None
+    fixture = f"{cells['home']} vs {cells['away']}"
+    tip = Tip(fixture, pick, cells["competition"], cells["time"], cells["win_info"], cells["confidence"], cells["odds"])
+    if tip.confidence is None or tip.confidence < min_confidence:
+        return None
+    return tip
+
+def iter_oddspedia(page_source, min_confidence=60, skipped=None):
+    doc = load_html(page_source)
+    for match in doc.xpath(ODDSPEDIA_ROWS):
+        try:
+            built = oddspedia_row(extract_cells(match, ODDSPEDIA_FIELDS), min_confidence)
+            if built is not None:
+                yield built
+            else:
+                _skip(skipped, "excluded market or low confidence")
+        except Exception as e:
+            _skip(skipped, e)
+
+def parse_oddspedia(page_source, min_confidence=60, skipped=None):
+    return list(iter_oddspedia(page_source, min_confidence, skipped))
+
+# ----------------- OLBG -----------------
+OLBG_ROWS = "//li[contains(@class,'min-h-')]"
+
+def _olbg_confidence(row):
+    el = first(row, ".//div[contains(@style, '--confidence')]")
+    conf_style = el.get("style") if el is not None else ""
+    found = re.search(r"(\d+)%", conf_style) if conf_style else None
+    return found.group(1) if found else ""
+
+OLBG_FIELDS = {
+    "fixture": text_field(".//h5[@itemprop='name']"),
+    "pick": text_field(".//h4"),
+    "competition": text_field(f".//p[{has_class('text-sm')} and {has_class('truncate')}]"),
+    "time": attr_field(".//time", "datetime"),
+    "win_info": text_field(f".//b[{has_class('text-xs')} and {has_class('truncate')}]"),
+    "odds": attr_field(f".//span[{has_class('ui-odds')}]", "data-decimal"),
+    "confidence": _olbg_confidence,
+}
+
+def olbg_row(cells):
+    """Builds the OLBG Tip."""
+    return Tip(cells["fixture"], cells["pick"], cells["competition"], cells["time"],
+               cells["win_info"], cells["confidence"], cells["odds"])
+
+def iter_olbg(page_source, skipped=None):
+    doc = load_html(page_source)
+    for match in doc.xpath(OLBG_ROWS):
+        try:
+            yield olbg_row(extract_cells(match, OLBG_FIELDS))
+        except Exception as e:
+            _skip(skipped, e)
+
+def parse_olbg(page_source, skipped=None):
+    return list(iter_olbg(page_source, skipped))
+
+# ----------------- Registry -----------------
+# source name -> (row xpath, field extractors, row builder)
+SOURCES = {
+    "ai_goalie": (AI_GOALIE_ROWS, AI_GOALIE_FIELDS, ai_goalie_row),
+    "oddspedia": (ODDSPEDIA_ROWS, ODDSPEDIA_FIELDS, oddspedia_row),
+    "olbg": (OLBG_ROWS, OLBG_FIELDS, olbg_row),
+}
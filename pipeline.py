@@ -0,0 +1,73 @@
+import pandas as pd
+
+from storage import save_frame
+from matching import iter_comparison
+from records import AI_COLUMNS, TIP_COLUMNS, AiTip, Tip, to_frame, from_frame
+
+# ----------------- Columns -----------------
+COMPARISON_COLUMNS = ["Fixture", "Pick", "AI_Confidence", "OLBG_Confidence", "Oddspedia_Confidence", "Odds", "Result"]
+
+# ----------------- Stages -----------------
+# Every stage takes an iterable of records (AiTip / Tip) and yields records, so a day's
+# rows go through filter, taps and matcher in one pass without intermediate copies.
+# Memory is not bounded by this: the parsers return a day's rows as a list (an empty
+# result switches to the browser fallback) and each FrameSink holds its whole table.
+def min_confidence(records, threshold, field="win"):
+    """Keeps records whose numeric `field` (AiTip.win, Tip.confidence) is at least `threshold`."""
+    for record in records:
+        value = getattr(record, field)
+        if value is not None and value >= threshold:
+            yield record
+
+def tap(records, sink):
+    """Passes records through unchanged, handing each one to `sink` on the way (None = no tap)."""
+    for record in records:
+        if sink is not None:
+            sink.append(record)
+        yield record
+
+def match(ai_records, olbg, oddspedia, resolver=None, year=None):
+    """Match stage: AI records against the OLBG / Oddspedia tips (record lists, or sheets read from disk)."""
+    if isinstance(ai_records, pd.DataFrame):
+        ai_records = from_frame(ai_records, AiTip)
+    if isinstance(olbg, pd.DataFrame):
+        olbg = from_frame(olbg, Tip)
+    if isinstance(oddspedia, pd.DataFrame):
+        oddspedia = from_frame(oddspedia, Tip)
+    return iter_comparison(ai_records, olbg, oddspedia, resolver, year)
+
+def drain(records):
+    """Runs a pipeline to the end for its taps' side effects. Returns the number of records."""
+    count = 0
+    for _ in records:
+        count += 1
+    return count
+
+# ----------------- Sinks -----------------
+class FrameSink:
+    """
+    Collects the records that pass a tap, for one output table. All of them are kept
+    until save(): the sheet and its summary formulas are written in one go, and a
+    day is a few hundred rows. records serves in-memory consumers (the matcher)
+    without reading the files back.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.records = []
+
+    def append(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def frame(self):
+        if self.records and not isinstance(self.records[0], dict):
+            return to_frame(self.records, self.columns)
+        return pd.DataFrame(self.records, columns=self.columns)
+
+    def save(self, path, cells=None):
+        """Writes the table; `cells` may be a dict or a function of the DataFrame (e.g. win_rate_cells)."""
+        df = self.frame()
+        return save_frame(df, path, cells=cells(df) if callable(cells) else cells)
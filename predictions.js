@@ -0,0 +1,131 @@
+// Draws a day's predictions from its DD_predictions.json (written by github.py).
+// Rows are added a page at a time as the list scrolls; click a header to sort,
+// use the controls above the table to filter by confidence, odds and result.
+(function () {
+  "use strict";
+
+  var PAGE_SIZE = 50;
+  // Column order of the JSON rows
+  var FIXTURE = 0, PICK = 1, AI = 2, OLBG = 3, ODDSPEDIA = 4, ODDS = 5, RESULT = 6;
+  var CONFIDENCES = [AI, OLBG, ODDSPEDIA];
+
+  var table = document.getElementById("predictions");
+  var body = table.querySelector("tbody");
+  var more = document.getElementById("more");
+  var status = document.getElementById("status");
+  var controls = document.getElementById("filters");
+  var state = { rows: [], view: [], shown: 0, sort: null, desc: true };
+
+  function td(text, className) {
+    var el = document.createElement("td");
+    el.className = className;
+    el.textContent = text;
+    return el;
+  }
+
+  function renderRow(row) {
+    var tr = document.createElement("tr");
+    tr.className = "bg-white border-b hover:bg-gray-50 transition-colors duration-150";
+    tr.appendChild(td(row[FIXTURE], "px-6 py-4 font-medium text-gray-900 whitespace-nowrap"));
+    tr.appendChild(td(row[PICK], "px-6 py-4"));
+    CONFIDENCES.forEach(function (col) {
+      tr.appendChild(row[col] === null
+        ? td("N/A", "px-6 py-4 text-center text-gray-400")
+        : td(row[col] + "%", "px-6 py-4 text-center font-semibold text-blue-600"));
+    });
+    [ODDS, RESULT].forEach(function (col) {
+      tr.appendChild(row[col] === null
+        ? td("N/A", "px-6 py-4 text-center text-gray-400")
+        : td(row[col], "px-6 py-4 text-center font-semibold text-green-600"));
+    });
+    return tr;
+  }
+
+  function showMore() {
+    var fragment = document.createDocumentFragment();
+    var end = Math.min(state.shown + PAGE_SIZE, state.view.length);
+    for (var i = state.shown; i < end; i++) {
+      fragment.appendChild(renderRow(state.view[i]));
+    }
+    body.appendChild(fragment);
+    state.shown = end;
+    more.hidden = state.shown >= state.view.length;
+    status.textContent = "Showing " + state.shown + " of " + state.view.length +
+      (state.view.length === state.rows.length ? "" : " (" + state.rows.length + " in total)");
+  }
+
+  function number(id) {
+    var value = controls.elements[id].value;
+    return value === "" ? null : Number(value);
+  }
+
+  function keep(row, filters) {
+    for (var i = 0; i < CONFIDENCES.length; i++) {
+      var min = filters.confidence[i];
+      if (min !== null && (row[CONFIDENCES[i]] === null || row[CONFIDENCES[i]] < min)) return false;
+    }
+    if (filters.minOdds !== null && (row[ODDS] === null || row[ODDS] < filters.minOdds)) return false;
+    if (filters.maxOdds !== null && (row[ODDS] === null || row[ODDS] > filters.maxOdds)) return false;
+    if (filters.result === "open") return row[RESULT] === null;
+    return filters.result === "" || row[RESULT] === filters.result;
+  }
+
+  function compare(a, b) {
+    var x = a[state.sort], y = b[state.sort];
+    // Blanks always go last
+    if (x === null || y === null) return x === y ? 0 : (x === null ? 1 : -1);
+    var order = x < y ? -1 : (x > y ? 1 : 0);
+    return state.desc ? -order : order;
+  }
+
+  function refresh() {
+    var filters = {
+      confidence: [number("min-ai"), number("min-olbg"), number("min-oddspedia")],
+      minOdds: number("min-odds"),
+      maxOdds: number("max-odds"),
+      result: controls.elements["result"].value
+    };
+    state.view = state.rows.filter(function (row) { return keep(row, filters); });
+    if (state.sort !== null) state.view.sort(compare);
+    body.textContent = "";
+    state.shown = 0;
+    if (!state.view.length) {
+      var tr = document.createElement("tr");
+      var cell = td(state.rows.length ? "No picks match the filters." : "No data found.", "text-center p-8 text-gray-500");
+      cell.colSpan = 7;
+      tr.appendChild(cell);
+      body.appendChild(tr);
+    }
+    showMore();
+  }
+
+  table.querySelectorAll("th[data-col]").forEach(function (th) {
+    th.addEventListener("click", function () {
+      var col = Number(th.dataset.col);
+      // First click sorts high to low (text columns A to Z), the next one flips it
+      state.desc = state.sort === col ? !state.desc : col >= AI;
+      state.sort = col;
+      refresh();
+    });
+  });
+  controls.addEventListener("input", refresh);
+  more.addEventListener("click", showMore);
+  if ("IntersectionObserver" in window) {
+    new IntersectionObserver(function (entries) {
+      if (entries[0].isIntersecting && !more.hidden) showMore();
+    }).observe(more);
+  }
+
+  fetch(table.dataset.src)
+    .then(function (response) {
+      if (!response.ok) throw new Error(response.status + " " + response.statusText);
+      return response.json();
+    })
+    .then(function (data) {
+      state.rows = data.rows;
+      refresh();
+    })
+    .catch(function (error) {
+      status.textContent = "Could not load " + table.dataset.src + ": " + error.message;
+    });
+})();
@@ -0,0 +1,187 @@
+import os
+import json
+import threading
+import subprocess
+from time import sleep
+from pathlib import Path
+from datetime import datetime
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+PUBLISH_REMOTE = os.environ.get("PUBLISH_REMOTE", "origin")
+PUBLISH_BRANCH = os.environ.get("PUBLISH_BRANCH", "main")
+# Paths waiting to be committed; survives a failed run so the next one publishes them too
+QUEUE_PATH = SCRIPT_DIR / ".publish_queue.json"
+# Seconds the worker waits for more generator runs before committing (they share one commit)
+PUBLISH_DELAY = float(os.environ.get("PUBLISH_DELAY", "2"))
+# Push attempts, and the first backoff (doubled after each failure)
+PUBLISH_RETRIES = int(os.environ.get("PUBLISH_RETRIES", "4"))
+PUBLISH_BACKOFF = float(os.environ.get("PUBLISH_BACKOFF", "5"))
+
+# ----------------- Publisher -----------------
+class Publisher:
+    """
+    Commits an explicit list of generated files and pushes them in a background thread.
+    publish() only queues paths: every call that arrives while the worker waits or
+    works ends up in the same commit, and paths queued by a run that failed are
+    picked up by the next one. The push is retried with exponential backoff,
+    rebasing onto the remote between attempts.
+    """
+
+    def __init__(self, repo=SCRIPT_DIR, remote=PUBLISH_REMOTE, branch=PUBLISH_BRANCH, queue_path=QUEUE_PATH,
+                 delay=PUBLISH_DELAY, retries=PUBLISH_RETRIES, backoff=PUBLISH_BACKOFF):
+        self.repo = Path(repo).resolve()
+        self.remote = remote
+        self.branch = branch
+        self.queue_path = Path(queue_path)
+        self.delay = delay
+        self.retries = retries
+        self.backoff = backoff
+        self.lock = threading.Lock()
+        self.worker = None
+        self.last_error = None
+
+    # ----- queue -----
+    def _load_queue(self):
+        try:
+            with open(self.queue_path, encoding="utf-8") as f:
+                return set(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return set()
+
+    def _save_queue(self, queued):
+        tmp = self.queue_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(sorted(queued), f, indent=1)
+        os.replace(tmp, self.queue_path)
+
+    def _relative(self, path):
+        """Repo-relative POSIX path; relative inputs are taken from the current directory, like git does."""
+        return Path(path).resolve().relative_to(self.repo).as_posix()
+
+    # ----- git -----
+    def git(self, *args, check=True):
+        # UTF-8 output, so Windows consoles do not choke on cp1252
+        env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+        return subprocess.run(["git", *args], cwd=self.repo, check=check, capture_output=True,
+                              text=True, encoding="utf-8", errors="replace", env=env)
+
+    def _ahead(self):
+        """True if HEAD has commits the remote branch does not (or the branch was never pushed)."""
+        result = self.git("rev-list", "--count", f"{self.remote}/{self.branch}..HEAD", check=False)
+        return result.returncode != 0 or int(result.stdout.strip() or 0) > 0
+
+    def _commit(self, paths):
+        """Stages and commits exactly `paths` (new, changed or deleted). Returns True if a commit was made."""
+        existing = [p for p in paths if (self.repo / p).exists()]
+        missing = [p for p in paths if p not in existing]
+        if missing:
+            # A path that is gone and was never committed is nothing to commit; left in,
+            # "git commit -- <paths>" fails on it and the queue would never drain
+            tracked = self.git("ls-files", "-z", "--", *missing).stdout.split("\0")
+            missing = [p for p in missing if any(t == p or t.startswith(p + "/") for t in tracked)]
+            paths = existing + missing
+        if not paths:
+            print("ℹ️  Git: No new changes to commit.")
+            return False
+        if existing:
+            self.git("add", "-A", "--", *existing)
+        if missing:
+            self.git("rm", "-r", "-q", "--cached", "--ignore-unmatch", "--", *missing)
+        if self.git("diff", "--cached", "--quiet", "--", *paths, check=False).returncode == 0:
+            print("ℹ️  Git: No new changes to commit.")
+            return False
+        message = f"Auto-update predictions and index for {datetime.now():%Y-%m-%d}"
+        self.git("commit", "-m", message, "--", *paths)
+        print(f"✅ Git: Committed {len(paths)} path(s): '{message}'")
+        return True
+
+    def _push(self):
+        wait = self.backoff
+        for attempt in range(1, self.retries + 1):
+            result = self.git("push", self.remote, f"HEAD:{self.branch}", check=False)
+            if result.returncode == 0:
+                print("🎉 Git: Successfully pushed the updated files to GitHub.")
+                return True
+            print(f"⚠️ Git push failed (attempt {attempt}/{self.retries}): {result.stderr.strip()}")
+            if attempt == self.retries:
+                break
+            sleep(wait)
+            wait *= 2
+            # Someone else pushed first: replay our commit on top of theirs
+            pulled = self.git("pull", "--rebase", "--autostash", self.remote, self.branch, check=False)
+            if pulled.returncode != 0:
+                # A conflicting rebase must not leave the repo mid-rebase for every later run
+                self.git("rebase", "--abort", check=False)
+                self.last_error = pulled.stderr.strip() or "rebase failed"
+                print(f"❌ Git: Could not rebase onto {self.remote}/{self.branch}; the commit stays local. "
+                      f"{pulled.stderr.strip()}")
+                return False
+        return False
+
+    # ----- worker -----
+    def _work(self):
+        try:
+            while True:
+                sleep(self.delay)
+                with self.lock:
+                    batch = self._load_queue()
+                if batch:
+                    self._commit(sorted(batch))
+                    with self.lock:
+                        # Anything queued while we committed waits for the next loop
+                        self._save_queue(self._load_queue() - batch)
+                    continue
+                if self._ahead() and not self._push():
+                    self.last_error = self.last_error or "push failed"
+                    print("❌ Git: Push failed; the commit stays local and is pushed on the next run.")
+                break
+        except subprocess.CalledProcessError as e:
+            self.last_error = e.stderr
+            print("❌ Git command failed!")
+            print(f"Command: {e.cmd}")
+            print(f"Return code: {e.returncode}")
+            print(f"Output:\n{e.stdout}")
+            print(f"Error Output:\n{e.stderr}")
+        except FileNotFoundError:
+            self.last_error = "git not found"
+            print("❌ Git not found. Please ensure Git is installed and added to PATH.")
+        finally:
+            with self.lock:
+                self.worker = None
+                restart = bool(self._load_queue())
+            if restart and self.last_error is None:
+                self._start()
+
+    def _start(self):
+        with self.lock:
+            if self.worker is None:
+                self.last_error = None
+                # Not a daemon: the interpreter waits for a push in progress before exiting
+                self.worker = threading.Thread(target=self._work, name="publisher")
+                self.worker.start()
+
+    def publish(self, paths, wait=False):
+        """
+        Queues `paths` (files or folders, inside the repo) for the next commit and starts
+        the background worker. Returns at once unless `wait`.
+        """
+        with self.lock:
+            queued = self._load_queue() | {self._relative(p) for p in paths}
+            self._save_queue(queued)
+        print(f"📦 Git: {len(queued)} path(s) queued for publishing.")
+        self._start()
+        if wait:
+            self.wait()
+
+    def wait(self, timeout=None):
+        """Blocks until the worker finished committing and pushing. Returns False on a git error."""
+        # The worker may hand over to a fresh one for paths queued at the last moment
+        while self.worker is not None:
+            worker = self.worker
+            worker.join(timeout)
+            if timeout is not None or worker.is_alive():
+                break
+        return self.last_error is None
+
+PUBLISHER = Publisher()
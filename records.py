@@ -0,0 +1,90 @@
+import math
+import pandas as pd
+
+# ----------------- Columns -----------------
+AI_COLUMNS = ["Date", "Fixture", "XG", "Pick", "Goals_Pick", "Win %", "Result", "Total", "Under"]
+TIP_COLUMNS = ["Fixture", "Pick", "Competition", "Time", "Win Info", "Confidence %", "Odds"]
+
+# ----------------- Parsing -----------------
+def to_number(value):
+    """79, '79%', ' 1.44 ' -> float; blanks, NaN and junk -> None. Called once per value, at ingest."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else float(value)
+    text = str(value).replace("%", "").strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def _cell(value):
+    """Whole numbers go to the sheet as ints (76, not 76.0)."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+# ----------------- Records -----------------
+class AiTip:
+    """One AI Goalie prediction. Numbers are parsed once; `win` is the Win % as a float."""
+    __slots__ = ("date", "fixture", "xg", "pick", "goals_pick", "win", "result", "total", "under")
+
+    def __init__(self, date, fixture, xg, pick, goals_pick, win, result, total, under):
+        self.date = date
+        self.fixture = fixture
+        self.xg = to_number(xg)
+        self.pick = pick
+        self.goals_pick = to_number(goals_pick)
+        self.win = to_number(win)
+        self.result = result
+        self.total = total
+        self.under = under
+
+    @classmethod
+    def from_mapping(cls, row):
+        """From a sheet row read back from disk ({"Date": ..., "Win %": "79%", ...})."""
+        return cls(*(row.get(column) for column in AI_COLUMNS))
+
+    def as_row(self):
+        """The 9 sheet cells; Win % keeps its "79%" form so old and new sheets read the same."""
+        win = "" if self.win is None else f"{_cell(self.win)}%"
+        return [self.date, self.fixture, self.xg, self.pick, self.goals_pick, win,
+                self.result, self.total, self.under]
+
+    def __repr__(self):
+        return f"AiTip({self.fixture!r}, pick={self.pick!r}, win={self.win})"
+
+class Tip:
+    """One OLBG or Oddspedia consensus tip. `confidence` and `odds` are floats from the start."""
+    __slots__ = ("fixture", "pick", "competition", "time", "win_info", "confidence", "odds")
+
+    def __init__(self, fixture, pick, competition, time, win_info, confidence, odds):
+        self.fixture = fixture
+        self.pick = pick
+        self.competition = competition
+        self.time = time
+        self.win_info = win_info
+        self.confidence = to_number(confidence)
+        self.odds = to_number(odds)
+
+    @classmethod
+    def from_mapping(cls, row):
+        return cls(*(row.get(column) for column in TIP_COLUMNS))
+
+    def as_row(self):
+        return [self.fixture, self.pick, self.competition, self.time, self.win_info,
+                _cell(self.confidence), self.odds]
+
+    def __repr__(self):
+        return f"Tip({self.fixture!r}, pick={self.pick!r}, confidence={self.confidence}, odds={self.odds})"
+
+# ----------------- Batches -----------------
+def to_frame(records, columns):
+    """Sheet DataFrame for a batch of AiTip / Tip records."""
+    return pd.DataFrame([record.as_row() for record in records], columns=columns)
+
+def from_frame(df, record_type):
+    """Records for a sheet read back from disk (older days, or sources this run did not scrape)."""
+    return [record_type.from_mapping(row) for row in df.to_dict("records")]
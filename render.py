@@ -0,0 +1,250 @@
+from string import Formatter
+
+from records import to_number
+
+# ----------------- Templates -----------------
+class Markup(str):
+    """HTML that is already safe (a rendered cell or template); inserted without escaping."""
+
+# &, <, > and " (attributes are double quoted), so names like "Nott'm Forest" stay readable
+ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+def escape(value):
+    if isinstance(value, Markup):
+        return value
+    return ("" if value is None else str(value)).translate(ESCAPES)
+
+class Template:
+    """
+    A str.format-style template ({name}, {name:02d}, {{ for a literal brace}})
+    compiled once into a positional format string. render() escapes every value
+    that is not Markup and returns Markup, so templates nest without double escaping.
+    """
+
+    def __init__(self, source):
+        self.fields = []
+        chunks = []
+        for literal, name, spec, _ in Formatter().parse(source):
+            chunks.append(literal.replace("{", "{{").replace("}", "}}"))
+            if name is not None:
+                self.fields.append((name, spec))
+                chunks.append("{}")
+        self.compiled = "".join(chunks)
+
+    def fill(self, *values):
+        """Positional, already-safe values in field order (hot loops skip the keyword lookup)."""
+        return Markup(self.compiled.format(*values))
+
+    def render(self, **values):
+        return Markup(self.compiled.format(*(
+            escape(format(values[name], spec) if spec else values[name]) for name, spec in self.fields)))
+
+# ----------------- Cells -----------------
+NA_CELL = Markup('<td class="px-6 py-4 text-center text-gray-400">N/A</td>')
+FIXTURE_CELL = Template('<td class="px-6 py-4 font-medium text-gray-900 whitespace-nowrap">{value}</td>')
+PICK_CELL = Template('<td class="px-6 py-4">{value}</td>')
+CONFIDENCE_CELL = Template('<td class="px-6 py-4 text-center font-semibold text-blue-600">{value:d}%</td>')
+ODDS_CELL = Template('<td class="px-6 py-4 text-center font-semibold text-green-600">{value}</td>')
+
+def _blank(value):
+    return value is None or (isinstance(value, float) and value != value) or str(value).strip() == ""
+
+def fixture_cell(value):
+    return FIXTURE_CELL.render(value="N/A" if _blank(value) else value)
+
+def pick_cell(value):
+    return PICK_CELL.render(value="N/A" if _blank(value) else value)
+
+def confidence_cell(value):
+    """76, 76.0, "76" or "76%" -> 76%; blanks and junk -> N/A."""
+    number = to_number(value)
+    return NA_CELL if number is None else CONFIDENCE_CELL.render(value=int(number))
+
+def odds_cell(value):
+    """Odds, and the Result mark (✓ / X), shown as they are."""
+    return NA_CELL if _blank(value) else ODDS_CELL.render(value=value)
+
+# (sheet column, header label, cell renderer) for the combined confidence sheet
+PREDICTION_COLUMNS = [
+    ("Fixture", "Fixture", fixture_cell),
+    ("Pick", "Pick", pick_cell),
+    ("AI_Confidence", "AI Confidence", confidence_cell),
+    ("OLBG_Confidence", "OLBG Confidence", confidence_cell),
+    ("Oddspedia_Confidence", "Oddspedia Confidence", confidence_cell),
+    ("Odds", "Odds", odds_cell),
+    ("Result", "Result", odds_cell),
+]
+
+# ----------------- Rows -----------------
+HEADER_CELL = Template('<th scope="col" class="px-6 py-3{align} font-bold text-indigo-800">{label}</th>')
+ROW = Template("""
+    <tr class="bg-white border-b hover:bg-gray-50 transition-colors duration-150">
+        {cells}
+    </tr>""")
+EMPTY_ROW = Template('<tr><td colspan="{span}" class="text-center p-8 text-gray-500">{message}</td></tr>')
+
+def column_values(df, name):
+    """A sheet column as a list; columns older sheets do not have come back as blanks."""
+    return df[name].tolist() if name in df.columns else [None] * len(df)
+
+def render_rows(df, columns=PREDICTION_COLUMNS):
+    """
+    <tr> rows for `df`. Each column is rendered as a whole list by its cell renderer,
+    then the rows are joined from those lists (no per-row Series). Confidences and
+    odds repeat a lot, so each distinct value is rendered once per column.
+    """
+    rendered = []
+    for name, _, cell in columns:
+        seen = {}
+        rendered.append([seen[value] if value in seen else seen.setdefault(value, cell(value))
+                         for value in column_values(df, name)])
+    separator = "\n        "
+    return Markup("".join(ROW.fill(separator.join(cells)) for cells in zip(*rendered)))
+
+def render_header(columns=PREDICTION_COLUMNS):
+    # The two text columns are left aligned, the numbers centred
+    return Markup("\n".join(HEADER_CELL.render(align="" if cell in (fixture_cell, pick_cell) else " text-center",
+                                               label=label) for _, label, cell in columns))
+
+# ----------------- Pages -----------------
+PREDICTIONS_PAGE = Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{title}</title>
+<script src="https://cdn.tailwindcss.com"></script>
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+</head>
+<body class="bg-gray-100 text-gray-800 flex flex-col">
+<div class="container mx-auto p-4 sm:p-6 lg:p-8 flex-grow">
+<header class="text-center mb-8 bg-white p-6 rounded-xl shadow-md">
+<h1 class="text-3xl sm:text-4xl font-extrabold text-indigo-700">{heading}</h1>
+{subtitle}
+</header>
+<div class="bg-white rounded-xl shadow-lg overflow-hidden">
+<div class="overflow-x-auto">
+<table class="w-full text-sm text-left text-gray-600">
+<thead class="text-xs text-gray-700 uppercase bg-indigo-50/70 border-b border-indigo-200">
+<tr>
+{header}
+</tr>
+</thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+</div>
+</div>
+</div>
+</body>
+</html>
+""")
+SUBTITLE = Template('<p class="text-md text-gray-600 mt-2">{text}</p>')
+
+def predictions_page(df, title, heading, subtitle=None, columns=PREDICTION_COLUMNS, empty="No data found."):
+    """A day's predictions page for the combined confidence sheet `df`."""
+    rows = render_rows(df, columns) or EMPTY_ROW.render(span=len(columns), message=empty)
+    return PREDICTIONS_PAGE.render(title=title, heading=heading,
+                                   subtitle=SUBTITLE.render(text=subtitle) if subtitle else Markup(""),
+                                   header=render_header(columns), rows=rows)
+
+# The data-driven page: rows come from the day's JSON file and are drawn by predictions.js
+SORT_HEADER_CELL = Template('<th scope="col" data-col="{col}" class="px-6 py-3{align} font-bold text-indigo-800 cursor-pointer select-none" title="Sort">{label}</th>')
+FILTER_INPUT = Template('<label class="flex flex-col">{label}<input name="{name}" type="number" min="0" step="{step}" class="mt-1 w-24 rounded border-gray-300 border px-2 py-1"></label>')
+PREDICTIONS_SHELL = Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{title}</title>
+<script src="https://cdn.tailwindcss.com"></script>
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+</head>
+<body class="bg-gray-100 text-gray-800 flex flex-col">
+<div class="container mx-auto p-4 sm:p-6 lg:p-8 flex-grow">
+<header class="text-center mb-8 bg-white p-6 rounded-xl shadow-md">
+<h1 class="text-3xl sm:text-4xl font-extrabold text-indigo-700">{heading}</h1>
+</header>
+<form id="filters" class="bg-white rounded-xl shadow-md p-4 mb-4 flex flex-wrap gap-4 text-xs font-semibold text-gray-600" onsubmit="return false">
+{filters}
+<label class="flex flex-col">Result<select name="result" class="mt-1 rounded border-gray-300 border px-2 py-1">
+<option value="">Any</option><option value="✓">Won ✓</option><option value="X">Lost X</option><option value="open">Not settled</option>
+</select></label>
+</form>
+<div class="bg-white rounded-xl shadow-lg overflow-hidden">
+<div class="overflow-x-auto">
+<table id="predictions" data-src="{data}" class="w-full text-sm text-left text-gray-600">
+<thead class="text-xs text-gray-700 uppercase bg-indigo-50/70 border-b border-indigo-200">
+<tr>
+{header}
+</tr>
+</thead>
+<tbody>
+<tr><td colspan="{span}" class="text-center p-8 text-gray-500">Loading…</td></tr>
+</tbody>
+</table>
+</div>
+</div>
+<p id="status" class="text-center text-sm text-gray-500 mt-4"></p>
+<button id="more" type="button" hidden class="block mx-auto mt-2 py-2 px-6 bg-indigo-600 hover:bg-indigo-700 text-white font-bold rounded-xl">Show more</button>
+</div>
+<script src="{script}"></script>
+</body>
+</html>
+""")
+FILTERS = [("min-ai", "Min AI %", 1), ("min-olbg", "Min OLBG %", 1), ("min-oddspedia", "Min Oddspedia %", 1),
+           ("min-odds", "Min odds", 0.01), ("max-odds", "Max odds", 0.01)]
+
+def predictions_shell(title, heading, data, script):
+    """
+    A day's page without rows: predictions.js (`script`) loads them from the day's
+    JSON (`data`), so the markup is the same for every day and rarely rewritten.
+    """
+    header = Markup("\n".join(
+        SORT_HEADER_CELL.render(col=col, align="" if cell in (fixture_cell, pick_cell) else " text-center", label=label)
+        for col, (_, label, cell) in enumerate(PREDICTION_COLUMNS)))
+    filters = Markup("\n".join(FILTER_INPUT.render(name=name, label=label, step=step) for name, label, step in FILTERS))
+    return PREDICTIONS_SHELL.render(title=title, heading=heading, filters=filters, data=data, header=header,
+                                    span=len(PREDICTION_COLUMNS), script=script)
+
+INDEX_PAGE = Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{month_name} Predictions Dashboard</title>
+<script src="https://cdn.tailwindcss.com"></script>
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
+<style>body{{font-family:'Inter',sans-serif;background:#eef2f6;}}</style>
+</head>
+<body class="min-h-screen flex items-center justify-center p-4">
+<div class="w-full max-w-5xl bg-white shadow-2xl rounded-3xl p-8 md:p-12 border border-gray-100">
+<header class="text-center mb-10">
+<h1 class="text-5xl font-extrabold text-gray-900 mb-3">Forecasts for {month_name}</h1>
+<p class="text-xl text-gray-600">Select a day below to view its detailed forecast.</p>
+</header>
+<div class="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
+{buttons}
+</div>
+<footer class="mt-12 text-center text-sm text-gray-500 pt-6 border-t border-gray-100">
+Run the script to generate missing day files.
+</footer>
+</div>
+</body>
+</html>
+""")
+DAY_BUTTON = Template("""
+<a href="{href}" class="w-full py-4 px-6 bg-green-600 hover:bg-green-700 text-white font-bold text-lg rounded-xl shadow-lg transition duration-300 transform hover:scale-[1.03] text-center">
+{label}
+</a>
+""")
+NO_DAYS = Markup('<p class="text-center col-span-full text-gray-500 text-xl py-8">No prediction files found.</p>')
+
+def index_page(month_name, links):
+    """index.html with one button per (href, label) in `links`."""
+    buttons = Markup("".join(DAY_BUTTON.render(href=href, label=label) for href, label in links))
+    return INDEX_PAGE.render(month_name=month_name, buttons=buttons or NO_DAYS)
@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+import threading
+from time import time
+from pathlib import Path
+from datetime import date, timedelta
+from collections import Counter
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+CACHE_DIR = SCRIPT_DIR / ".http_cache"
+# HTTP_CACHE=0 bypasses the cache entirely
+CACHE_ENABLED = os.environ.get("HTTP_CACHE", "1") != "0"
+# Seconds a cached page is served without asking the server again.
+# Pages for days before yesterday that were fetched after that day was over hold
+# final results and never expire.
+CACHE_TTLS = {"ai_goalie": 15 * 60, "olbg": 5 * 60, "oddspedia": 5 * 60}
+DEFAULT_TTL = 5 * 60
+# Least recently used pages are dropped once the bodies exceed this size
+CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# ----------------- Cache -----------------
+def day_key(day):
+    """ISO day a cached page belongs to; pages without a day (OLBG, Oddspedia) are keyed by today."""
+    if isinstance(day, str):
+        return day
+    return (day or date.today()).isoformat()
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by (URL, day).
+    Bodies are stored by content hash, so an unchanged page is kept once however
+    many days point at it. Stale entries are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 reuses the stored body.
+    """
+
+    def __init__(self, root=CACHE_DIR, ttls=CACHE_TTLS, max_bytes=CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.bodies = self.root / "bodies"
+        self.index_path = self.root / "index.json"
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.counts = Counter()   # hit / revalidated / miss / evicted
+        self.bytes_saved = 0
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def key(url, day):
+        return hashlib.sha256(f"{url}|{day}".encode("utf-8")).hexdigest()
+
+    def ttl(self, source, day, fetched_at=None):
+        """
+        None (never expires) for a page of a day before yesterday that was fetched after
+        that day, else the source's TTL. A page fetched while its day was still being
+        played may hold partial results, whatever its age.
+        """
+        if day is not None and fetched_at is not None:
+            covered = date.fromisoformat(day)
+            if covered < date.today() - timedelta(days=1) and date.fromtimestamp(fetched_at) > covered:
+                return None
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def _read_body(self, entry):
+        try:
+            return (self.bodies / entry["body"]).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    # ----- lookups -----
+    def lookup(self, url, source=None, day=None):
+        """
+        (body, validators) for a cached page. body is set only if the entry is still
+        fresh; validators are the conditional-request headers for a stale entry.
+        """
+        day = day_key(day)
+        with self.lock:
+            entry = self.index.get(self.key(url, day))
+            if entry is None:
+                return None, {}
+            ttl = self.ttl(source, day, entry["fetched_at"])
+            if ttl is None or time() - entry["fetched_at"] < ttl:
+                body = self._read_body(entry)
+                if body is not None:
+                    entry["used_at"] = time()
+                    self.counts["hit"] += 1
+                    self.bytes_saved += entry["size"]
+                    return body, {}
+            validators = {}
+            if entry.get("etag"):
+                validators["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                validators["If-Modified-Since"] = entry["last_modified"]
+            return None, validators
+
+    def revalidated(self, url, day=None):
+        """The server answered 304: refresh the entry and return the stored body."""
+        day = day_key(day)
+        with self.lock:
+            entry = self.index.get(self.key(url, day))
+            body = self._read_body(entry) if entry else None
+            if body is None:
+                return None
+            entry["fetched_at"] = entry["used_at"] = time()
+            self.counts["revalidated"] += 1
+            self.bytes_saved += entry["size"]
+            self._save_index()
+            return body
+
+    def store(self, url, body, headers, day=None):
+        day = day_key(day)
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            self.bodies.mkdir(parents=True, exist_ok=True)
+            path = self.bodies / digest
+            if not path.exists():
+                path.write_bytes(data)
+            self.index[self.key(url, day)] = {
+                "url": url, "day": day, "body": digest, "size": len(data),
+                "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"),
+                "fetched_at": time(), "used_at": time(),
+            }
+            self.counts["miss"] += 1
+            self._evict()
+            self._save_index()
+
+    # ----- eviction -----
+    def _evict(self):
+        """Drops least recently used entries until the unique bodies fit in max_bytes."""
+        sizes = {e["body"]: e["size"] for e in self.index.values()}
+        total = sum(sizes.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["used_at"]):
+            if total <= self.max_bytes:
+                break
+            del self.index[key]
+            self.counts["evicted"] += 1
+            if all(e["body"] != entry["body"] for e in self.index.values()):
+                total -= entry["size"]
+                try:
+                    (self.bodies / entry["body"]).unlink()
+                except FileNotFoundError:
+                    pass
+
+    def report(self):
+        served = self.counts["hit"] + self.counts["revalidated"]
+        requests_made = served + self.counts["miss"]
+        if not requests_made:
+            return
+        print(f"🗃️ HTTP cache: {self.counts['hit']} hit(s), {self.counts['revalidated']} revalidated (304), "
+              f"{self.counts['miss']} miss(es), {self.counts['evicted']} evicted; "
+              f"{100 * served / requests_made:.0f}% served from cache, {self.bytes_saved / 1024:.0f} KB not re-downloaded")
+
+CACHE = ResponseCache()
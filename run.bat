@@ -1,9 +1,7 @@
 @echo off
 git config --global credential.helper manager
-echo Running ai_goalie.project.py...
-python C:\aigoalie\ai_goalie.project.py
-
-python C:\aigoalie\github.py
+echo Running the daily pipeline (scrape, compare, render, publish)...
+python C:\aigoalie\runner.py
 
 echo All scripts finished.
 pause
\ No newline at end of file
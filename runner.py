@@ -0,0 +1,230 @@
+import sys
+import asyncio
+import argparse
+import threading
+import importlib.util
+from time import perf_counter
+from pathlib import Path
+from datetime import date, timedelta
+
+import github
+from browser import new_driver
+from catalog import CATALOG
+from fetch import report as fetch_report
+from metrics import METRICS, PROFILE, profiled
+from publisher import PUBLISHER
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+
+def load_scraper():
+    """ai_goalie.project.py (the dot in its name keeps it from a plain import)."""
+    spec = importlib.util.spec_from_file_location("ai_goalie_project", SCRIPT_DIR / "ai_goalie.project.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# ----------------- DAG -----------------
+class Node:
+    """One pipeline step: func(results) runs in a worker thread once every node in `after` is done."""
+
+    def __init__(self, name, func, after=(), timeout=None, on_timeout=None):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+        self.status = "pending"
+        self.started = None
+        self.finished = None
+
+class Dag:
+    """
+    Runs nodes as soon as their dependencies finish, so independent work overlaps.
+    Dependencies only order the work: a failed or timed out node hands None to the
+    nodes after it, which fall back the way the scripts always have (e.g. compare
+    reads a source's sheet from disk when its scraper returned nothing).
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.results = {}
+
+    def add(self, name, func, after=(), timeout=None, on_timeout=None):
+        missing = [dep for dep in after if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"{name} depends on unknown node(s): {', '.join(missing)}")
+        self.nodes[name] = Node(name, func, after, timeout, on_timeout)
+
+    async def _run(self, node, tasks, start):
+        for dep in node.after:
+            await tasks[dep]
+        node.started = perf_counter() - start
+        try:
+            work = asyncio.to_thread(node.func, self.results)
+            self.results[node.name] = await asyncio.wait_for(work, node.timeout)
+            node.status = "ok"
+        except asyncio.TimeoutError:
+            # The thread cannot be cancelled; closing its browser makes it fail fast
+            node.status = "timeout"
+            self.results[node.name] = None
+            print(f"⏱️ {node.name} timed out after {node.timeout}s")
+            if node.on_timeout is not None:
+                node.on_timeout()
+        except Exception as e:
+            node.status = "error"
+            self.results[node.name] = None
+            print(f"❌ {node.name} failed: {e}")
+        node.finished = perf_counter() - start
+
+    async def run(self):
+        start = perf_counter()
+        tasks = {}
+        # Nodes were added after their dependencies, so insertion order is a topological order
+        for name, node in self.nodes.items():
+            tasks[name] = asyncio.create_task(self._run(node, tasks, start))
+        await asyncio.gather(*tasks.values())
+        return self.results
+
+    def report(self):
+        """Per-node start/end offsets from the run start, so overlapping stages are visible."""
+        print("\n⏱️ Pipeline")
+        for node in self.nodes.values():
+            if node.started is None:
+                print(f"   {node.name:<20} not run")
+                continue
+            print(f"   {node.name:<20} {node.started:7.1f}s -> {node.finished:7.1f}s  "
+                  f"({node.finished - node.started:6.1f}s) {node.status}")
+
+    def describe(self):
+        for node in self.nodes.values():
+            after = ", ".join(node.after) or "-"
+            print(f"   {node.name:<20} after {after}")
+
+# ----------------- Pipeline -----------------
+def build_pipeline(scraper, day, yesterday=True, publish=True):
+    """
+    The daily run as a DAG:
+      yesterday: ai_goalie -> compare -> render      (results of finished matches)
+      today:     ai_goalie, oddspedia, olbg -> compare -> render
+      site:      both renders -> other changed days + index -> publish
+    Yesterday's compare and page run while today's scrapers are still loading pages.
+    """
+    dag = Dag()
+    manifest = github.load_manifest()
+    # build_day updates the manifest; the two render nodes may finish together
+    manifest_lock = threading.Lock()
+    # Both compares rewrite team_aliases.json, upsert the warehouse and may refit the
+    # score weights; run one at a time (like backfill's write_lock)
+    compare_lock = threading.Lock()
+    drivers = {}
+    drivers_lock = threading.Lock()
+
+    def driver_for(name):
+        # Each scraper node gets its own browser, started only if it needs one
+        def start():
+            driver = new_driver()
+            with drivers_lock:
+                drivers[name] = driver
+            return driver
+        return start
+
+    def close_driver(name):
+        with drivers_lock:
+            driver = drivers.pop(name, None)
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def scrape(name, func, day, browser_only=False):
+        def run(results):
+            try:
+                if browser_only:
+                    return func(day, driver=driver_for(name)())
+                return func(day, driver_factory=driver_for(name))
+            finally:
+                close_driver(name)
+        timeout = scraper.SOURCE_TIMEOUTS.get(name.split(":")[0])
+        dag.add(name, run, timeout=timeout, on_timeout=lambda: close_driver(name))
+
+    def render(day):
+        def run(results):
+            if (day.year, day.month) != (github.today.year, github.today.month):
+                print(f"ℹ️ {day} is not in this month's site, page not rebuilt")
+                return []
+            with manifest_lock:
+                return github.build_day(manifest, day.day)
+        return run
+
+    renders = []
+    if yesterday:
+        previous = day - timedelta(days=1)
+        scrape("ai_goalie:yesterday", scraper.ai_goalie_get, previous)
+        def compare_yesterday(results):
+            with compare_lock:
+                return scraper.compare_day(previous)
+
+        dag.add("compare:yesterday", compare_yesterday, after=["ai_goalie:yesterday"])
+        dag.add("render:yesterday", render(previous), after=["compare:yesterday"])
+        renders.append("render:yesterday")
+
+    scrape("ai_goalie", scraper.ai_goalie_get, day)
+    scrape("oddspedia", scraper.oddspedia_get, day, browser_only=True)
+    scrape("olbg", scraper.olbg_get, day)
+
+    def compare_today(results):
+        # Rows go straight to the matcher; a source that failed falls back to its file
+        records = tuple(results.get(name) or None for name in ("ai_goalie", "olbg", "oddspedia"))
+        with compare_lock:
+            return scraper.compare_day(day, records=records)
+
+    dag.add("compare", compare_today, after=["ai_goalie", "oddspedia", "olbg"])
+    dag.add("render", render(day), after=["compare"])
+    renders.append("render")
+
+    def site(results):
+        # Pages of other days that changed since the last build (cheap when none did), then the index
+        changed = [path for name in renders for path in results.get(name) or []]
+        with manifest_lock:
+            changed += [p for p in github.build_site(manifest) if p not in changed]
+        return changed
+
+    dag.add("site", site, after=renders)
+    if publish:
+        dag.add("publish", lambda results: github.push_to_github(results.get("site") or []), after=["site"])
+    return dag
+
+# ----------------- CLI -----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape, compare, render and publish a day in one run.")
+    parser.add_argument("--day", type=date.fromisoformat, default=date.today(), help="YYYY-MM-DD (default today)")
+    parser.add_argument("--no-yesterday", action="store_true", help="skip refreshing the previous day's results")
+    parser.add_argument("--no-publish", action="store_true", help="build the pages but do not git push")
+    parser.add_argument("--dry-run", action="store_true", help="print the stages and their dependencies only")
+    parser.add_argument("--profile", action="store_true", default=PROFILE,
+                        help="also write a cProfile dump (main thread only) to the day's folder")
+    args = parser.parse_args(argv)
+
+    scraper = load_scraper()
+    dag = build_pipeline(scraper, args.day, yesterday=not args.no_yesterday, publish=not args.no_publish)
+    if args.dry_run:
+        dag.describe()
+        return 0
+
+    run_folder = CATALOG.folder(args.day)
+    start = perf_counter()
+    with profiled(run_folder / f"{scraper.day_prefix(args.day)}_run_profile.pstats", enabled=args.profile):
+        asyncio.run(dag.run())
+    fetch_report()
+    dag.report()
+    print(f"   {'total':<20} {perf_counter() - start:7.1f}s")
+    METRICS.report()
+    METRICS.save(CATALOG.folder, scraper.day_folder_name(args.day))
+    # The commit and push run in the background; the exit code should cover them too
+    published = PUBLISHER.wait()
+    return 0 if published and all(node.status == "ok" for node in dag.nodes.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
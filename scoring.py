@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+import backtest
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+# Fitted weights; refitted from the warehouse when missing or older than SCORE_REFIT_DAYS
+WEIGHTS_PATH = SCRIPT_DIR / "score_weights.json"
+SCORE_REFIT_DAYS = int(os.environ.get("SCORE_REFIT_DAYS", "7"))
+# L2 penalty on every weight but the intercept: the other sources and the odds are only
+# known for a few hundred settled picks, so their weights are kept from running away
+RIDGE = float(os.environ.get("SCORE_RIDGE", "1.0"))
+# Share of the most recent days held out when reporting how well the fit generalises
+HOLDOUT = 0.2
+
+# Model inputs, each on the log-odds scale. A source that did not pick the match adds
+# nothing but its has_* flag, so a pick is not punished for missing from OLBG.
+FEATURES = ["intercept", "ai", "olbg", "has_olbg", "oddspedia", "has_oddspedia", "implied", "has_odds"]
+# Added to the combined confidence sheet
+SCORE_COLUMNS = ["Score", "Value", "Value_Rank"]
+
+# ----------------- Features -----------------
+def _logit(percent):
+    p = np.clip(np.asarray(percent, dtype=float) / 100, 0.01, 0.99)
+    return np.log(p / (1 - p))
+
+def features(ai, olbg, oddspedia, odds):
+    """(n, len(FEATURES)) design matrix from confidences in % and decimal odds (NaN when missing)."""
+    ai, olbg, oddspedia, odds = (np.asarray(v, dtype=float) for v in (ai, olbg, oddspedia, odds))
+    has_olbg = ~np.isnan(olbg)
+    has_oddspedia = ~np.isnan(oddspedia)
+    has_odds = ~np.isnan(odds) & (odds > 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        implied = np.where(has_odds, 100 / odds, 50.0)
+    return np.column_stack([
+        np.ones(len(ai)),
+        np.where(np.isnan(ai), 0.0, _logit(ai)),
+        np.where(has_olbg, _logit(olbg), 0.0), has_olbg,
+        np.where(has_oddspedia, _logit(oddspedia), 0.0), has_oddspedia,
+        np.where(has_odds, _logit(implied), 0.0), has_odds,
+    ])
+
+def frame_features(df, ai="AI_Confidence", olbg="OLBG_Confidence", oddspedia="Oddspedia_Confidence", odds="Odds"):
+    get = lambda name: pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float) \
+        if name in df.columns else np.full(len(df), np.nan)
+    return features(get(ai), get(olbg), get(oddspedia), get(odds))
+
+# ----------------- Fit -----------------
+def _sigmoid(z):
+    return 1 / (1 + np.exp(-z))
+
+def fit(X, y, ridge=RIDGE, iterations=50, tolerance=1e-8):
+    """Ridge logistic regression by Newton's method; a few matrix solves over the whole history."""
+    penalty = np.full(X.shape[1], ridge)
+    penalty[0] = 0.0
+    w = np.zeros(X.shape[1])
+    for _ in range(iterations):
+        p = _sigmoid(X @ w)
+        gradient = X.T @ (p - y) + penalty * w
+        hessian = (X * (p * (1 - p))[:, None]).T @ X + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < tolerance:
+            break
+    return w
+
+def log_loss(p, y):
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+def brier(p, y):
+    return float(np.mean((p - y) ** 2))
+
+def training_set(history):
+    """Settled picks of backtest.load_history() as (days, X, y)."""
+    settled = history[history["won"].notna() & history["win"].notna()]
+    X = frame_features(settled, ai="win", olbg="olbg_confidence", oddspedia="oddspedia_confidence", odds="odds")
+    return settled["day"].to_numpy(), X, settled["won"].to_numpy(dtype=float)
+
+def fit_history(history, ridge=RIDGE, holdout=HOLDOUT):
+    """
+    Weights fitted on every settled pick, plus out-of-sample checks from a fit on the
+    older days scored on the most recent `holdout` share of days.
+    """
+    days, X, y = training_set(history)
+    weights = fit(X, y, ridge)
+    report = {"picks": int(len(y)), "days": int(len(np.unique(days)))}
+    # ISO days sort as strings
+    ordered = np.unique(days)
+    recent = days >= ordered[int(len(ordered) * (1 - holdout))] if len(ordered) else np.zeros(0, bool)
+    if recent.any() and (~recent).any():
+        p = _sigmoid(X[recent] @ fit(X[~recent], y[~recent], ridge))
+        raw = _sigmoid(X[recent, 1])  # AI confidence as is
+        report.update(holdout_picks=int(recent.sum()),
+                      log_loss=round(log_loss(p, y[recent]), 4), ai_log_loss=round(log_loss(raw, y[recent]), 4),
+                      brier=round(brier(p, y[recent]), 4), ai_brier=round(brier(raw, y[recent]), 4))
+    return weights, report
+
+def calibration_table(p, y, bins=10):
+    """Predicted vs observed hit rate per score decile."""
+    edges = np.quantile(p, np.linspace(0, 1, bins + 1))
+    bucket = np.clip(np.searchsorted(edges, p, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(bucket, minlength=bins)
+    with np.errstate(invalid="ignore"):
+        return pd.DataFrame({
+            "picks": counts,
+            "predicted": 100 * np.bincount(bucket, p, bins) / counts,
+            "observed": 100 * np.bincount(bucket, y, bins) / counts,
+        })[counts > 0]
+
+# ----------------- Weights -----------------
+def save_weights(weights, report, path=WEIGHTS_PATH):
+    content = {"features": FEATURES, "weights": [round(float(w), 6) for w in weights],
+               "fitted": datetime.now().isoformat(timespec="seconds"), "report": report}
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(content, f, indent=1)
+    os.replace(tmp, path)
+
+def load_weights(path=WEIGHTS_PATH, refit_days=SCORE_REFIT_DAYS):
+    """
+    The fitted weights, refitted first when they are missing, stale or were fitted on
+    other features. None if there is nothing to fit on (no warehouse yet).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        age = datetime.now() - datetime.fromisoformat(saved["fitted"])
+        if saved["features"] == FEATURES and age.days < refit_days:
+            return np.array(saved["weights"])
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    if not backtest.warehouse.DB_PATH.exists():
+        return None
+    weights, report = fit_history(backtest.load_history())
+    if report["picks"] == 0:
+        return None
+    save_weights(weights, report, path)
+    print(f"🎯 Score weights refitted on {report['picks']} settled picks -> {path}")
+    return weights
+
+# ----------------- Score -----------------
+def score_frame(df, weights):
+    """
+    Adds to the combined sheet, for the whole day in one pass:
+      Score       calibrated chance the pick wins, %
+      Value       expected profit per unit staked at the sheet's Odds, % (blank without odds)
+      Value_Rank  1 = best value of the day
+    """
+    df = df.copy()
+    if weights is None or df.empty:
+        for column in SCORE_COLUMNS:
+            df[column] = pd.Series([None] * len(df), index=df.index, dtype="object")
+        return df
+    p = _sigmoid(frame_features(df) @ weights)
+    odds = pd.to_numeric(df["Odds"], errors="coerce").to_numpy(dtype=float) if "Odds" in df.columns \
+        else np.full(len(df), np.nan)
+    value = np.where(odds > 1, p * odds - 1, np.nan)
+    df["Score"] = np.round(100 * p, 1)
+    df["Value"] = np.round(100 * value, 1)
+    df["Value_Rank"] = pd.Series(value, index=df.index).rank(ascending=False, method="first").astype("Int64")
+    return df
+
+# ----------------- CLI -----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the consensus score weights on all history.")
+    parser.add_argument("--db", default=str(backtest.warehouse.DB_PATH))
+    parser.add_argument("--source", default="ai_goalie_full", help="warehouse source with the AI Goalie rows")
+    parser.add_argument("--ridge", type=float, default=RIDGE)
+    parser.add_argument("--out", default=str(WEIGHTS_PATH))
+    args = parser.parse_args(argv)
+
+    start = perf_counter()
+    history = backtest.load_history(args.db, args.source)
+    loaded = perf_counter()
+    weights, report = fit_history(history, args.ridge)
+    fitted = perf_counter()
+    print(f"⏱️ {len(history)} rows loaded in {loaded - start:.2f}s, fitted in {fitted - loaded:.3f}s "
+          f"({report['picks']} settled picks, {report['days']} days)")
+    if report["picks"] == 0:
+        print("⚠️ No settled picks to fit on.")
+        return 1
+
+    print("\nWeights")
+    for name, weight in zip(FEATURES, weights):
+        print(f"   {name:<14} {weight:+.3f}")
+    if "log_loss" in report:
+        print(f"\nHeld-out {report['holdout_picks']} picks: log loss {report['log_loss']} "
+              f"(AI confidence alone {report['ai_log_loss']}), Brier {report['brier']} ({report['ai_brier']})")
+    _, X, y = training_set(history)
+    print("\nCalibration (all settled picks)")
+    print(calibration_table(_sigmoid(X @ weights), y).to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+
+    save_weights(weights, report, args.out)
+    print(f"\nSaved weights to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
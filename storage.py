@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+import pandas as pd
+
+# ----------------- Configuration -----------------
+# Canonical on-disk format for intermediate tables: "parquet" or "feather"
+STORAGE_FORMAT = os.environ.get("STORAGE_FORMAT", "parquet")
+# WRITE_EXCEL=0 skips the .xlsx copies (they are only for people opening the files by hand)
+WRITE_EXCEL = os.environ.get("WRITE_EXCEL", "1") != "0"
+
+# ----------------- Paths -----------------
+def data_path(path):
+    """The canonical columnar file that sits next to an .xlsx path."""
+    return Path(path).with_suffix(f".{STORAGE_FORMAT}")
+
+def canonical_path(path):
+    """The file readers should use: the columnar copy if present, else the legacy .xlsx."""
+    columnar = data_path(path)
+    return columnar if columnar.exists() else Path(path)
+
+def frame_exists(path):
+    return data_path(path).exists() or Path(path).exists()
+
+# ----------------- Write -----------------
+def _arrow_safe(df):
+    """Arrow needs one type per column; scraped columns mix numbers and strings (e.g. XG "" vs 2.1)."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            types = {type(v) for v in df[col] if v is not None and not (isinstance(v, float) and pd.isna(v))}
+            if len(types) > 1:
+                df[col] = df[col].map(lambda v: v if v is None or (isinstance(v, float) and pd.isna(v)) else str(v))
+    return df
+
+def write_excel(df, path, cells=None):
+    """
+    Writes `df` plus any extra cells ({"K12": "=COUNTIF(I:I,TRUE)"}) in a single pass.
+    Replaces the old to_excel -> load_workbook -> scan -> save cycle.
+    """
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False)
+        if cells:
+            ws = next(iter(writer.sheets.values()))
+            for ref, value in cells.items():
+                ws[ref] = value
+
+def save_frame(df, path, excel=WRITE_EXCEL, cells=None):
+    """
+    Writes `df` in the canonical columnar format next to `path` (an .xlsx path),
+    plus the .xlsx itself (with the summary `cells`) when `excel` is on.
+    Returns True if the .xlsx was written.
+    If pyarrow is missing the .xlsx is always written so nothing is lost.
+    """
+    path = Path(path)
+    target = data_path(path)
+    try:
+        safe = _arrow_safe(df)
+        if STORAGE_FORMAT == "feather":
+            safe.reset_index(drop=True).to_feather(target)
+        else:
+            safe.to_parquet(target, index=False)
+    except ImportError as e:
+        print(f"⚠️ {STORAGE_FORMAT} support not installed ({e}); writing Excel only.")
+        excel = True
+    if excel:
+        write_excel(df, path, cells)
+    return excel
+
+# ----------------- Summary Cells -----------------
+def _is_blank(value):
+    return value is None or value == "" or (isinstance(value, float) and pd.isna(value))
+
+def last_filled_row(df, column):
+    """Sheet row (header = row 1) of the last non-empty value in `column`; 1 when only the header is filled."""
+    filled = [i for i, value in enumerate(df[column]) if not _is_blank(value)]
+    return filled[-1] + 2 if filled else 1
+
+def win_rate_cells(df, column="Under"):
+    """COUNTIF won/lost/total and win % under the AI Goalie sheet (column I)."""
+    last_row = last_filled_row(df, column)
+    return {
+        f"K{last_row + 1}": "=COUNTIF(I:I,TRUE)",
+        f"K{last_row + 2}": "=COUNTIF(I:I,FALSE)",
+        f"K{last_row + 3}": f"=K{last_row + 1}+K{last_row + 2}",
+        f"L{last_row + 1}": f"=(K{last_row + 1}/K{last_row + 3})*100",
+    }
+
+def average_confidence_cells(df):
+    """Average of the Confidence % column (F) in H, right below the data."""
+    last_row = len(df) + 1
+    if last_row < 2:
+        return {}
+    return {f"H{last_row + 1}": f"=AVERAGE(F2:F{last_row})"}
+
+# ----------------- Read -----------------
+def load_frame(path):
+    """Reads a table by its .xlsx path, preferring the columnar copy. Raises FileNotFoundError like read_excel."""
+    path = Path(path)
+    columnar = data_path(path)
+    if columnar.exists():
+        if STORAGE_FORMAT == "feather":
+            return pd.read_feather(columnar)
+        return pd.read_parquet(columnar)
+    if not path.exists():
+        raise FileNotFoundError(f"No such file: '{path}' (or {columnar.name})")
+    return pd.read_excel(path)
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import difflib
+import unicodedata
+from pathlib import Path
+from datetime import date, datetime
+import pandas as pd
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+ALIAS_CACHE = SCRIPT_DIR / "team_aliases.json"
+# difflib ratio needed to treat two normalized names as the same club
+FUZZY_CUTOFF = 0.86
+# Club-form words that differ between sources ("RC Lens" / "Lens", "1.FC Magdeburg" / "Magdeburg").
+# "city" and "united" are NOT here: they tell Manchester City and Manchester United apart.
+CLUB_WORDS = {"fc", "afc", "cf", "sc", "ac", "as", "ss", "us", "rc", "cd", "ud", "sd", "ca", "fk", "sk",
+              "sv", "tsv", "bk", "if", "ff", "nk", "hnk", "pfc", "club", "de", "the"}
+# Extra words that mean a different team even when the rest of the name matches
+VARIANT_WORDS = {"ii", "b", "u19", "u20", "u21", "u23", "reserves", "women", "w", "youth", "castilla"}
+# The only extra words a longer name may add and still be the same club ("Lazio" / "SS Lazio Calcio").
+# Anything else is a place or a nickname: "Manchester" is not Manchester City, "Inter" is not Inter Miami.
+SUFFIX_WORDS = CLUB_WORDS | {"calcio", "football", "futbol", "futebol", "clube", "sport", "sports",
+                             "sportif", "balompie"}
+
+# ----------------- Normalization -----------------
+def normalize_team(name):
+    """Lowercase, accent-free, punctuation-free team key without club-form words or founding years."""
+    if name is None or pd.isna(name):
+        return ""
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    # AI Goalie appends the result mark to the picked team
+    name = re.sub(r"\s[✓x]$", "", name.strip())
+    words = re.sub(r"[^a-z0-9\s]", " ", name).split()
+    # Drop club-form words and numbers ("1902", "1."), but keep two-digit ones like Schalke "04"
+    words = [w for w in words if w not in CLUB_WORDS and (not w.isdigit() or len(w) == 2)]
+    return " ".join(words)
+
+def same_club(a, b):
+    """Fuzzy equality of two normalized keys."""
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    if difflib.SequenceMatcher(None, a, b).ratio() >= FUZZY_CUTOFF:
+        return True
+    # "lazio" vs "lazio calcio": one name is the other plus generic club words only
+    short, long = sorted((a.split(), b.split()), key=len)
+    extra = set(long) - set(short)
+    return set(short) <= set(long) and len(" ".join(short)) >= 5 and extra <= SUFFIX_WORDS
+
+# Words too common to confirm a match on their own
+GENERIC_WORDS = {"city", "united", "real", "sporting", "athletic", "atletico", "town", "rovers",
+                 "county", "wanderers", "albion", "saint", "santa", "san", "dynamo", "dinamo", "olympic"}
+
+def likely_same(a, b):
+    """
+    Looser check used only when the other team of the fixture already matched
+    ("nottm forest" / "nottingham forest").
+    """
+    if same_club(a, b):
+        return True
+    if a and b and difflib.SequenceMatcher(None, a, b).ratio() >= 0.7:
+        return True
+    shared = set(a.split()) & set(b.split())
+    return any(len(w) >= 4 and w not in GENERIC_WORDS for w in shared)
+
+# ----------------- Fixtures -----------------
+FIXTURE_SPLIT = re.compile(r"\s+(?:-|v|vs|vs\.)\s+", re.IGNORECASE)
+
+def split_fixture(fixture):
+    """
+    Splits a fixture from any source into (home, away), or None.
+    AI Goalie: "Home - Away: 1:0", OLBG: "Home v Away", Oddspedia: "Home vs Away".
+    """
+    if fixture is None or pd.isna(fixture):
+        return None
+    text = re.sub(r":\s*[\d\-]+:[\d\-]+'?\s*$", "", str(fixture).strip())
+    parts = FIXTURE_SPLIT.split(text, maxsplit=1)
+    if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+MONTHS = {m: i for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                       "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+
+def parse_match_date(value, year):
+    """
+    Best-effort date from any source's date/time column, or None.
+    "Sat Nov 22" (AI Goalie), "22nd Nov 17:30" (Oddspedia), "2025-11-22T15:00:00.000Z" (OLBG).
+    """
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.date()
+    text = str(value).strip()
+    iso = re.match(r"(\d{4})-(\d{2})-(\d{2})", text)
+    if iso:
+        return date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+    day_match = re.search(r"\b(\d{1,2})(?:st|nd|rd|th)?\b", text)
+    month = next((MONTHS[t[:3].lower()] for t in re.findall(r"[A-Za-z]{3,}", text)
+                  if t[:3].lower() in MONTHS), None)
+    if not day_match or month is None:
+        return None
+    try:
+        return date(year, month, int(day_match.group(1)))
+    except ValueError:
+        return None
+
+# ----------------- Resolver -----------------
+class TeamResolver:
+    """
+    Maps team names from every source to canonical team ids.
+    Resolved aliases are kept in team_aliases.json so repeat lookups are a dict hit;
+    only unseen spellings pay for a fuzzy comparison.
+    """
+
+    def __init__(self, aliases=None, teams=None, path=ALIAS_CACHE):
+        self.aliases = aliases or {}   # normalized alias -> team id
+        self.teams = teams or {}       # team id -> display name (first spelling seen)
+        self.path = Path(path)
+        self.dirty = False
+        # word -> aliases containing it, so a miss only fuzzy-compares against related names
+        self._by_word = {}
+        for alias in self.aliases:
+            self._index(alias)
+
+    def _index(self, alias):
+        for word in alias.split():
+            self._by_word.setdefault(word, set()).add(alias)
+
+    @classmethod
+    def load(cls, path=ALIAS_CACHE):
+        path = Path(path)
+        if path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                return cls(data.get("aliases"), data.get("teams"), path)
+            except Exception as e:
+                print(f"Could not read alias cache {path}: {e}")
+        return cls(path=path)
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"aliases": self.aliases, "teams": self.teams}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def resolve(self, name):
+        """Canonical id for a team name (registers a new team if nothing is close enough)."""
+        key = normalize_team(name)
+        if not key:
+            return None
+        team_id = self.aliases.get(key)
+        if team_id is not None:
+            return team_id
+        candidates = set()
+        for word in key.split():
+            candidates |= self._by_word.get(word, set())
+        for alias in difflib.get_close_matches(key, candidates, n=3, cutoff=0.0):
+            if same_club(key, alias):
+                team_id = self.aliases[alias]
+                break
+        if team_id is not None and len(key.split()) == 1:
+            # A bare one-word name ("Sporting", "Newcastle") is too thin to be remembered
+            # as an alias; the next lookup compares it again
+            return team_id
+        if team_id is None:
+            team_id = key
+            while team_id in self.teams:
+                team_id += "_"
+            self.teams[team_id] = str(name).strip()
+        self.aliases[key] = team_id
+        self._index(key)
+        self.dirty = True
+        return team_id
+
+    def link(self, name, team_id):
+        """
+        Records `name` as an alias of an existing team (confirmed by fixture context).
+        An alias that already points to another team is kept as it is.
+        """
+        key = normalize_team(name)
+        if key and key not in self.aliases:
+            self.aliases[key] = team_id
+            self._index(key)
+            self.dirty = True
+
+    def resolve_fixture(self, fixture):
+        """(home_id, away_id) for a fixture string, or None if it cannot be split."""
+        teams = split_fixture(fixture)
+        if teams is None:
+            return None
+        home, away = (self.resolve(t) for t in teams)
+        if home is None or away is None:
+            return None
+        return home, away
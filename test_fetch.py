@@ -0,0 +1,27 @@
+import pytest
+
+import fetch
+from page_parser import parse_ai_goalie
+
+ROWS = "<html><body><table><tr class='match'><td>Home - Away</td></tr></table></body></html>"
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = fetch.FetchStats()
+    monkeypatch.setattr(fetch, "STATS", stats)
+    return stats
+
+@pytest.mark.parametrize("body", ["", "   ", "<html"])
+def test_empty_or_truncated_body_falls_back_to_the_browser(monkeypatch, stats, body):
+    monkeypatch.setattr(fetch, "http_get", lambda url, source, day: body)
+    page_source, path, doc = fetch.fetch_page("ai_goalie", "http://tips.invalid/", lambda url: ROWS)
+    assert (page_source, path, doc) == (ROWS, "browser", None)
+    assert dict(stats.fallbacks["ai_goalie"]) == {"unparsable": 1}
+
+def test_http_page_is_parsed_once_and_reused(monkeypatch, stats):
+    monkeypatch.setattr(fetch, "http_get", lambda url, source, day: ROWS)
+    page_source, path, doc = fetch.fetch_page("ai_goalie", "http://tips.invalid/", lambda url: pytest.fail("browser used"))
+    assert (page_source, path) == (ROWS, "http")
+    assert doc is not None and doc.xpath("//tr[@class='match']")
+    # The parsers accept the parsed document as well as the source
+    assert parse_ai_goalie(doc) == parse_ai_goalie(ROWS)
@@ -0,0 +1,117 @@
+import shutil
+import subprocess
+
+import pytest
+
+from publisher import Publisher
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+@pytest.fixture
+def repo(tmp_path):
+    """A clone with one commit, pushing to a local bare repo."""
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    git(tmp_path, "clone", "-q", str(remote), str(work))
+    git(work, "config", "user.email", "test@example.com")
+    git(work, "config", "user.name", "test")
+    git(work, "checkout", "-q", "-b", "main")
+    (work / "index.html").write_text("old", encoding="utf-8")
+    git(work, "add", "index.html")
+    git(work, "commit", "-q", "-m", "init")
+    git(work, "push", "-q", "origin", "main")
+    return work, remote
+
+def publisher(work, tmp_path):
+    return Publisher(repo=work, remote="origin", branch="main", queue_path=tmp_path / "queue.json",
+                     delay=0, retries=1, backoff=0)
+
+def test_untracked_missing_path_does_not_block_the_queue(repo, tmp_path):
+    work, remote = repo
+    pub = publisher(work, tmp_path)
+    # Queued, then removed before the worker ran: git never heard of it
+    ghost = work / "2025-10-21" / "21_predictions.json"
+    ghost.parent.mkdir()
+    ghost.write_text("{}", encoding="utf-8")
+    (work / "index.html").write_text("new", encoding="utf-8")
+    pub.publish([ghost, work / "index.html"])
+    ghost.unlink()
+    assert pub.wait()
+    assert pub._load_queue() == set()
+    assert git(remote, "show", "main:index.html") == "new"
+
+    # The next publish goes through as well
+    (work / "index.html").write_text("newer", encoding="utf-8")
+    pub.publish([work / "index.html"], wait=True)
+    assert pub.last_error is None
+    assert git(remote, "show", "main:index.html") == "newer"
+
+def test_tracked_deleted_path_is_committed(repo, tmp_path):
+    work, remote = repo
+    pub = publisher(work, tmp_path)
+    (work / "index.html").unlink()
+    pub.publish([work / "index.html"], wait=True)
+    assert pub.last_error is None
+    assert git(remote, "ls-tree", "--name-only", "main") == ""
+
+def commits(remote):
+    return git(remote, "log", "--format=%s", "main").splitlines()
+
+def other_clone(tmp_path, remote, name="other"):
+    """A second checkout of the site, as another machine publishing to the same remote."""
+    other = tmp_path / name
+    git(tmp_path, "clone", "-q", "-b", "main", str(remote), str(other))
+    git(other, "config", "user.email", "other@example.com")
+    git(other, "config", "user.name", "other")
+    return other
+
+def test_publish_calls_share_one_commit(repo, tmp_path):
+    work, remote = repo
+    pub = publisher(work, tmp_path)
+    pub.delay = 0.5
+    for day in ("20", "21", "22"):
+        page = work / f"{day}_predictions.html"
+        page.write_text(day, encoding="utf-8")
+        pub.publish([page])
+    assert pub.wait()
+    assert len(commits(remote)) == 2  # init + one commit for all three pages
+    assert git(remote, "ls-tree", "--name-only", "main").split() == [
+        "20_predictions.html", "21_predictions.html", "22_predictions.html", "index.html"]
+
+def test_rejected_push_is_rebased_and_retried(repo, tmp_path):
+    work, remote = repo
+    other = other_clone(tmp_path, remote)
+    (other / "other.html").write_text("theirs", encoding="utf-8")
+    git(other, "add", "other.html")
+    git(other, "commit", "-q", "-m", "theirs")
+    git(other, "push", "-q", "origin", "main")
+
+    pub = publisher(work, tmp_path)
+    pub.retries = 2
+    (work / "index.html").write_text("ours", encoding="utf-8")
+    pub.publish([work / "index.html"], wait=True)
+    assert pub.last_error is None
+    assert len(commits(remote)) == 3
+    assert git(remote, "show", "main:index.html") == "ours"
+    assert git(remote, "show", "main:other.html") == "theirs"
+
+def test_conflicting_rebase_is_aborted(repo, tmp_path):
+    work, remote = repo
+    other = other_clone(tmp_path, remote)
+    (other / "index.html").write_text("theirs", encoding="utf-8")
+    git(other, "commit", "-q", "-am", "theirs")
+    git(other, "push", "-q", "origin", "main")
+
+    pub = publisher(work, tmp_path)
+    pub.retries = 2
+    (work / "index.html").write_text("ours", encoding="utf-8")
+    pub.publish([work / "index.html"])
+    assert not pub.wait()
+    # Not left mid-rebase: the local commit is intact and the next run can try again
+    assert not (work / ".git" / "rebase-merge").exists() and not (work / ".git" / "rebase-apply").exists()
+    assert git(work, "status", "--porcelain") == ""
+    assert git(work, "show", "HEAD:index.html") == "ours"
@@ -0,0 +1,83 @@
+import threading
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetch
+from response_cache import ResponseCache
+
+PAGE = "<html><body><table><tr><td>Home - Away</td></tr></table></body></html>"
+ETAG = '"v1"'
+
+class Handler(BaseHTTPRequestHandler):
+    """Stand-in for a tips site: one page with an ETag, 304 when the client already has it."""
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        data = PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/tips"
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(root=tmp_path, ttls={"ai_goalie": 60})
+    monkeypatch.setattr(fetch, "CACHE", cache)
+    return cache
+
+def test_fresh_entry_is_served_without_a_request(server, cache):
+    assert fetch.http_get(server, "ai_goalie", date.today()) == PAGE
+    assert fetch.http_get(server, "ai_goalie", date.today()) == PAGE
+    assert Handler.requests == [None]
+    assert cache.counts == {"miss": 1, "hit": 1}
+
+def test_expired_entry_is_revalidated_with_its_etag(server, cache):
+    cache.ttls = {"ai_goalie": 0}
+    assert fetch.http_get(server, "ai_goalie", date.today()) == PAGE
+    assert fetch.http_get(server, "ai_goalie", date.today()) == PAGE
+    # The second request was conditional and the stored body was reused
+    assert Handler.requests == [None, ETAG]
+    assert cache.counts == {"miss": 1, "revalidated": 1}
+
+def _fetched_on(cache, moment):
+    for entry in cache.index.values():
+        entry["fetched_at"] = moment.timestamp()
+
+def test_old_day_fetched_during_that_day_expires(server, cache):
+    day = date.today() - timedelta(days=5)
+    fetch.http_get(server, "ai_goalie", day)
+    # Fetched in the evening of that day, while its matches were still being played
+    _fetched_on(cache, datetime.combine(day, datetime.min.time()) + timedelta(hours=20))
+    fetch.http_get(server, "ai_goalie", day)
+    assert Handler.requests == [None, ETAG]
+
+def test_old_day_fetched_afterwards_never_expires(server, cache):
+    day = date.today() - timedelta(days=5)
+    fetch.http_get(server, "ai_goalie", day)
+    _fetched_on(cache, datetime.combine(day + timedelta(days=1), datetime.min.time()) + timedelta(hours=9))
+    fetch.http_get(server, "ai_goalie", day)
+    assert Handler.requests == [None]
+    assert cache.counts["hit"] == 1
@@ -0,0 +1,49 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import warehouse
+
+def sheet(path, fixtures):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"Fixture": fixtures, "Pick": ["Home"] * len(fixtures), "Win %": [60] * len(fixtures),
+                  "Goals_Pick": [2.5] * len(fixtures)}).to_parquet(path, index=False)
+
+def day_rows(db, day, source="ai_goalie"):
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT fixture FROM tips WHERE day = ? AND source = ? ORDER BY fixture",
+                        (day, source)).fetchall()
+    conn.close()
+    return [fixture for fixture, in rows]
+
+def test_file_of_another_day_does_not_replace_the_folders_picks(tmp_path):
+    folder = tmp_path / "2025" / "10" / "2025-10-15"
+    sheet(folder / "15_fixtures.parquet", [f"Home{i} - Away{i}: 2:1" for i in range(8)])
+    # A stray copy of the 14th, written after the 15th's own sheet
+    sheet(folder / "14_fixtures.parquet", [f"Other{i} - Team{i}: 0:0" for i in range(25)])
+    db = tmp_path / "warehouse.sqlite"
+    warehouse.ingest([tmp_path], db)
+
+    assert day_rows(db, "2025-10-15") == sorted(f"Home{i} - Away{i}: 2:1" for i in range(8))
+    assert day_rows(db, "2025-10-14") == []
+
+@pytest.mark.parametrize("fixture, total", [
+    ("Home - Away: 2:1", 3),
+    ("Home - Away ✓: 1:10", 11),
+    ("Home - Away: 23:00", None),   # kick-off time
+    ("Home - Away: 09:30", None),
+    ("Home - Away: -:-'", None),
+    ("Home - Away: 0:0'", None),    # live
+])
+def test_final_total(fixture, total):
+    assert warehouse.final_total(fixture) == total
+
+def test_unplayed_rows_have_no_total_or_under(tmp_path):
+    sheet(tmp_path / "2025-10-21" / "21_fixtures.parquet", ["A - B: 23:00", "C - D: 1:10", "E - F: 1:0"])
+    db = tmp_path / "warehouse.sqlite"
+    warehouse.ingest([tmp_path], db)
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT fixture, total_goals, under FROM tips ORDER BY fixture").fetchall()
+    conn.close()
+    assert rows == [("A - B: 23:00", None, None), ("C - D: 1:10", 11, 0), ("E - F: 1:0", 1, 1)]
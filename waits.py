@@ -0,0 +1,94 @@
+from time import perf_counter, sleep
+from contextlib import contextmanager
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+# ----------------- DOM Conditions -----------------
+def wait_for_ready(driver, timeout=15):
+    """Waits until document.readyState is 'complete'."""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+def wait_for_count_settled(driver, by, selector, timeout=15, settle=0.75, poll=0.25):
+    """
+    Waits until at least one element matches and the match count has not changed
+    for `settle` seconds (i.e. the list finished rendering). Returns the final count.
+    Raises TimeoutException if nothing matched in time.
+    """
+    deadline = perf_counter() + timeout
+    last_count = -1
+    stable_since = perf_counter()
+    while True:
+        count = len(driver.find_elements(by, selector))
+        now = perf_counter()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif count > 0 and now - stable_since >= settle:
+            return count
+        if now >= deadline:
+            if count > 0:
+                return count
+            raise TimeoutException(f"no elements for {selector} after {timeout}s")
+        sleep(poll)
+
+def wait_for_rerender(driver, element, timeout=10):
+    """
+    Waits for `element` to be detached or for its text to change, i.e. the list
+    it belongs to was re-rendered. Returns False (without raising) on timeout.
+    """
+    if element is None:
+        return False
+    try:
+        before = element.text
+    except StaleElementReferenceException:
+        return True
+
+    def changed(_):
+        try:
+            return element.text != before
+        except StaleElementReferenceException:
+            return True
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(changed)
+        return True
+    except TimeoutException:
+        return False
+
+def first_or_none(driver, by, selector):
+    found = driver.find_elements(by, selector)
+    return found[0] if found else None
+
+# ----------------- Step Telemetry -----------------
+class StepTimer:
+    """Records how long each named scraping step really took."""
+
+    def __init__(self, source):
+        self.source = source
+        self.steps = []
+
+    @contextmanager
+    def step(self, name):
+        start = perf_counter()
+        ok = True
+        try:
+            yield
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.steps.append((name, perf_counter() - start, ok))
+
+    def record(self, name, elapsed, ok=True):
+        """Adds a step that was timed by the caller (for blocks too long to wrap in step())."""
+        self.steps.append((name, elapsed, ok))
+
+    def total(self):
+        return sum(elapsed for _, elapsed, _ in self.steps)
+
+    def report(self):
+        print(f"⏱️ {self.source} steps ({self.total():.2f}s total):")
+        for name, elapsed, ok in sorted(self.steps, key=lambda s: -s[1]):
+            print(f"   {name:<22} {elapsed:6.2f}s{'' if ok else '  (failed)'}")
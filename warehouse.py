@@ -0,0 +1,372 @@
+import re
+import sys
+import sqlite3
+import argparse
+from time import perf_counter
+from pathlib import Path
+from datetime import date
+from collections import Counter
+import pandas as pd
+
+import aggregates
+from catalog import DAY_FOLDER, folder_date
+from storage import data_path, load_frame
+from team_resolver import split_fixture, parse_match_date
+
+# ----------------- Configuration -----------------
+SCRIPT_DIR = Path(__file__).parent.resolve()
+DB_PATH = SCRIPT_DIR / "warehouse.sqlite"
+# misc/ files only carry a day number ("04_fixtures.xlsx", "23-09_fixtures.xlsx"); they are all from this year
+ARCHIVE_YEAR = 2025
+# File name (without the day prefix) -> source stored in the warehouse. Anything else
+# ("_fixtures_before", "_combined_confidence_check", ...) is a scratch copy and skipped.
+FILE_SOURCES = {
+    "fixtures": "ai_goalie",
+    "ai_fixtures": "ai_goalie",
+    "ai.full_fixtures": "ai_goalie_full",
+    "olbg_fixtures": "olbg",
+    "oddspedia_fixtures": "oddspedia",
+    "combined_confidence": "combined",
+}
+FILE_NAME = re.compile(r"^(\d{1,2})(?:-(\d{1,2}))?_(.+)\.(?:xlsx|parquet|feather)$")
+# Final score at the end of an AI Goalie fixture ("Home - Away: 2:1", "1:10"). Kick-off
+# times, always HH:MM ("23:00", "09:30"), "-:-" and live scores ("0:0'") are not final and
+# do not match; the source puts them in the same column, so Total / Under of those rows
+# are not results. (A 10:10 final cannot be told from a kick-off and is left out.)
+FINAL_SCORE = r":\s*(?!\d\d:\d\d\s*$)(\d{1,2}):(\d{1,2})\s*$"
+# Bumped when stored rows need a one-off fix (PRAGMA user_version)
+SCHEMA_VERSION = 2
+# Result marks used by the scrapers over time
+WON_MARKS = {"✓", "Y"}
+LOST_MARKS = {"X", "❌"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tips (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fixture TEXT NOT NULL,
+    home TEXT,
+    away TEXT,
+    pick TEXT NOT NULL,
+    confidence REAL,
+    olbg_confidence REAL,
+    oddspedia_confidence REAL,
+    odds REAL,
+    xg REAL,
+    goals_pick REAL,
+    result TEXT,
+    won INTEGER,
+    total_goals REAL,
+    under INTEGER,
+    competition TEXT,
+    kickoff TEXT,
+    win_info TEXT,
+    file TEXT NOT NULL,
+    PRIMARY KEY (day, source, fixture, pick)
+);
+CREATE INDEX IF NOT EXISTS idx_tips_day ON tips(day);
+CREATE INDEX IF NOT EXISTS idx_tips_source_day ON tips(source, day);
+CREATE INDEX IF NOT EXISTS idx_tips_home ON tips(home);
+CREATE INDEX IF NOT EXISTS idx_tips_away ON tips(away);
+CREATE INDEX IF NOT EXISTS idx_tips_pick ON tips(pick);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ["day", "source", "fixture", "home", "away", "pick", "confidence", "olbg_confidence",
+           "oddspedia_confidence", "odds", "xg", "goals_pick", "result", "won", "total_goals", "under",
+           "competition", "kickoff", "win_info", "file"]
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    aggregates.create(conn)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _migrate(conn)
+    return conn
+
+def _migrate(conn):
+    """
+    Re-derives Total / Under from each fixture's final score (older ingests stored kick-off
+    times as goals and dropped two-digit away scores), then re-aggregates.
+    """
+    conn.create_function("final_total", 1, lambda fixture: final_total(fixture or ""))
+    with conn:
+        changed = conn.execute("""
+            UPDATE tips SET total_goals = final_total(fixture),
+                            under = CASE WHEN final_total(fixture) IS NULL OR goals_pick IS NULL THEN NULL
+                                         ELSE goals_pick > final_total(fixture) END
+            WHERE total_goals IS NOT final_total(fixture)""").rowcount
+    if changed:
+        aggregates.rebuild(conn)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+# ----------------- Cleaning -----------------
+def _blank(value):
+    return value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == ""
+
+def _number(value):
+    """79, '79%', 1.44 -> float; anything else -> None."""
+    if _blank(value):
+        return None
+    try:
+        return float(str(value).replace("%", "").strip())
+    except ValueError:
+        return None
+
+def _text(value):
+    return None if _blank(value) else str(value).strip()
+
+def _won(result):
+    result = _text(result)
+    if result in WON_MARKS:
+        return 1
+    if result in LOST_MARKS:
+        return 0
+    return None
+
+def final_total(fixture):
+    """Goals scored in a finished fixture ("Home - Away: 2:1" -> 3), else None."""
+    match = re.search(FINAL_SCORE, fixture)
+    return None if match is None else int(match.group(1)) + int(match.group(2))
+
+# ----------------- File Discovery -----------------
+def classify(path):
+    """(source, day number, month or None) for a data file, or None for files the warehouse skips."""
+    match = FILE_NAME.match(Path(path).name)
+    if not match:
+        return None
+    source = FILE_SOURCES.get(match.group(3))
+    if source is None:
+        return None
+    return source, int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+def folder_day(path):
+    """Date from the nearest YYYY-MM-DD (or unpadded YYYY-MM-D) parent folder, or None."""
+    for parent in Path(path).parents:
+        if DAY_FOLDER.match(parent.name):
+            return folder_date(parent.name)
+    return None
+
+def infer_day(path, df, day_num, month):
+    """
+    Date of the run that produced `path`: the day number of its DD_ prefix, with the
+    year and month of its dated folder. misc/ files only have a day number, so the
+    month comes from the name or the sheet's own dates.
+    """
+    found = folder_day(path)
+    if found is not None:
+        try:
+            return found.replace(day=day_num)
+        except ValueError:
+            return None
+    if month is None:
+        column = "Date" if "Date" in df.columns else "Time" if "Time" in df.columns else None
+        months = Counter(d.month for d in (parse_match_date(v, ARCHIVE_YEAR) for v in df[column])
+                         if d is not None and d.day == day_num) if column else Counter()
+        if not months:
+            return None
+        month = months.most_common(1)[0][0]
+    try:
+        return date(ARCHIVE_YEAR, month, day_num)
+    except ValueError:
+        return None
+
+def find_files(roots):
+    """Every data file under `roots`. The columnar copy is used instead of the .xlsx when both exist."""
+    # Lower wins: the STORAGE_FORMAT copy load_frame() reads, then the other columnar one, then Excel
+    rank = lambda path: 0 if path == data_path(path.with_suffix(".xlsx")) else 2 if path.suffix == ".xlsx" else 1
+    found = {}
+    for root in map(Path, roots):
+        candidates = [root] if root.is_file() else root.rglob("*")
+        for path in candidates:
+            if path.suffix not in (".xlsx", ".parquet", ".feather") or classify(path) is None:
+                continue
+            key = path.with_suffix(".xlsx")
+            if key not in found or rank(path) < rank(found[key]):
+                found[key] = path
+    # Oldest first, so when a day exists twice (top-level and 2025/MM/) the newer copy wins
+    return sorted(found.items(), key=lambda item: item[1].stat().st_mtime)
+
+# ----------------- Rows -----------------
+def tip_rows(df, day, source, file):
+    """
+    Warehouse rows for one data file (summary-formula rows without a fixture are dropped).
+    Total and Under come from the fixture's final score, and stay empty until it has one.
+    """
+    get = lambda name: df[name] if name in df.columns else [None] * len(df)
+    day_text = day.isoformat()
+    if source == "combined":
+        confidence = get("AI_Confidence")
+    elif source in ("olbg", "oddspedia"):
+        confidence = get("Confidence %")
+    else:
+        confidence = get("Win %")
+    kickoff = get("Time") if "Time" in df.columns else get("Date")
+
+    rows = []
+    for values in zip(get("Fixture"), get("Pick"), confidence, get("OLBG_Confidence"),
+                      get("Oddspedia_Confidence"), get("Odds"), get("XG"), get("Goals_Pick"),
+                      get("Result"), get("Competition"), kickoff, get("Win Info")):
+        (fixture, pick, conf, olbg_conf, odds_conf, odds, xg, goals_pick,
+         result, competition, when, win_info) = values
+        fixture, pick = _text(fixture), _text(pick)
+        if fixture is None or pick is None:
+            continue
+        teams = split_fixture(fixture) or (None, None)
+        total = final_total(fixture)
+        goals_pick = _number(goals_pick)
+        under = None if total is None or goals_pick is None else int(goals_pick > total)
+        rows.append((day_text, source, fixture, teams[0], teams[1], pick, _number(conf),
+                     _number(olbg_conf), _number(odds_conf), _number(odds), _number(xg),
+                     goals_pick, _text(result), _won(result), total, under,
+                     _text(competition), _text(when), _text(win_info), file))
+    return rows
+
+# ----------------- Ingest -----------------
+def upsert_rows(conn, day, source, rows):
+    """Replaces the (day, source) slice with `rows`, and its day/week/month stats, in one transaction."""
+    placeholders = ", ".join("?" * len(COLUMNS))
+    with conn:
+        conn.execute("DELETE FROM tips WHERE day = ? AND source = ?", (day, source))
+        conn.executemany(f"INSERT OR REPLACE INTO tips ({', '.join(COLUMNS)}) VALUES ({placeholders})", rows)
+        aggregates.update_day(conn, day, source)
+
+def ingest_file(conn, path, force=False):
+    """Loads one data file. Returns the rows written, or None if it was unchanged or skipped."""
+    path = Path(path)
+    source, day_num, month = classify(path)
+    stat = path.stat()
+    rel = str(path.relative_to(SCRIPT_DIR)) if path.is_relative_to(SCRIPT_DIR) else str(path)
+    if not force:
+        known = conn.execute("SELECT mtime, size FROM files WHERE path = ?", (rel,)).fetchone()
+        if known == (stat.st_mtime, stat.st_size):
+            return None
+    try:
+        df = load_frame(path.with_suffix(".xlsx"))
+    except Exception as e:
+        print(f"⚠️ Could not read {rel}: {e}")
+        return None
+    if df.empty:
+        return None
+    folder = folder_day(path)
+    if folder is not None and (folder.day, folder.month) != (day_num, month or folder.month):
+        # A stray copy of another day ("14_fixtures.xlsx" in 2025-10-15/) must not
+        # replace the folder's own picks for that day
+        print(f"⚠️ {rel} does not belong to its folder's day ({folder}); skipped.")
+        return None
+    day = infer_day(path, df, day_num, month)
+    if day is None:
+        print(f"⚠️ Could not tell which day {rel} belongs to; skipped.")
+        return None
+    rows = tip_rows(df, day, source, rel)
+    upsert_rows(conn, day.isoformat(), source, rows)
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                     (rel, stat.st_mtime, stat.st_size, day.isoformat(), source, len(rows)))
+    return len(rows)
+
+def ingest(roots=(SCRIPT_DIR,), db_path=DB_PATH, force=False):
+    """Loads every day folder, the 2025/MM/ archive and misc/ into the warehouse."""
+    start = perf_counter()
+    conn = connect(db_path)
+    loaded = skipped = rows = 0
+    for _, path in find_files(roots):
+        written = ingest_file(conn, path, force)
+        if written is None:
+            skipped += 1
+        else:
+            loaded += 1
+            rows += written
+    conn.close()
+    print(f"🗄️ Warehouse: {loaded} files loaded ({rows} rows), {skipped} unchanged/skipped "
+          f"in {perf_counter() - start:.2f}s -> {db_path}")
+
+def ingest_day(day_folder, db_path=DB_PATH):
+    """Upserts one day folder; called by get_whole_day after each run."""
+    ingest([Path(day_folder)], db_path)
+
+# ----------------- Queries -----------------
+def hit_rate(conn, source="ai_goalie", start=None, end=None, period="month", min_confidence=None):
+    """
+    [(period, settled tips, won, hit rate %)] for `source` between two ISO dates.
+    period: "day", "month" or "all".
+    """
+    bucket = {"day": "day", "month": "substr(day, 1, 7)", "all": "'all'"}[period]
+    sql = (f"SELECT {bucket} AS period, COUNT(won), SUM(won), ROUND(100.0 * AVG(won), 1) "
+           f"FROM tips WHERE source = ? AND won IS NOT NULL")
+    params = [source]
+    if start:
+        sql += " AND day >= ?"
+        params.append(start)
+    if end:
+        sql += " AND day <= ?"
+        params.append(end)
+    if min_confidence is not None:
+        sql += " AND confidence >= ?"
+        params.append(min_confidence)
+    sql += " GROUP BY period ORDER BY period"
+    return conn.execute(sql, params).fetchall()
+
+# ----------------- CLI -----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Historical tips warehouse (SQLite).")
+    parser.add_argument("--db", default=str(DB_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("ingest", help="load all existing outputs")
+    load.add_argument("roots", nargs="*", default=[str(SCRIPT_DIR)])
+    load.add_argument("--force", action="store_true", help="reload files even if unchanged")
+
+    stats = commands.add_parser("hit-rate", help="hit rate per period")
+    stats.add_argument("--source", default="ai_goalie")
+    stats.add_argument("--since")
+    stats.add_argument("--until")
+    stats.add_argument("--period", choices=["day", "month", "all"], default="month")
+    stats.add_argument("--min-confidence", type=float)
+
+    summary = commands.add_parser("stats", help="precomputed stats per day, week or month")
+    summary.add_argument("--period", choices=aggregates.PERIODS, default="month")
+    summary.add_argument("--key", help="e.g. 2025-10-21, 2025-W43 or 2025-10 (default: all)")
+    summary.add_argument("--source")
+    summary.add_argument("--rebuild", action="store_true", help="recompute every period from the tips first")
+
+    args = parser.parse_args(argv)
+    if args.command == "ingest":
+        ingest(args.roots, args.db, args.force)
+        return 0
+    if args.command == "stats":
+        conn = connect(args.db)
+        if args.rebuild:
+            aggregates.rebuild(conn)
+        start = perf_counter()
+        rows = aggregates.summaries(conn, args.period, args.key, args.source)
+        elapsed = perf_counter() - start
+        show = lambda value, unit="": "-" if value is None else f"{value}{unit}"
+        for s in rows:
+            print(f"{s['key']:<11} {s['source']:<15} {s['tips']:>5} tips  hit {show(s['hit_rate'], '%'):>6} "
+                  f"of {s['settled']:<4} conf {show(s['mean_confidence']):>6}  "
+                  f"xG bias {show(s['xg_bias']):>5} mae {show(s['xg_mae']):>5}  "
+                  f"under {show(s['under_accuracy'], '%'):>6} of {s['under_settled']}")
+        print(f"({elapsed * 1000:.1f}ms)")
+        conn.close()
+        return 0
+
+    conn = connect(args.db)
+    start = perf_counter()
+    result = hit_rate(conn, args.source, args.since, args.until, args.period, args.min_confidence)
+    elapsed = perf_counter() - start
+    for period, settled, won, rate in result:
+        print(f"{period:<12} {won or 0:>5}/{settled:<5} {rate if rate is not None else '-':>6}%")
+    print(f"({elapsed * 1000:.1f}ms)")
+    conn.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())